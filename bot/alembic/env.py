@@ -18,7 +18,8 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
-config.set_main_option("sqlalchemy.url", settings.postgres.url.get_secret_value())
+# Тесты передают адрес тестовой БД через config.attributes, иначе используется БД из настроек бота
+config.set_main_option("sqlalchemy.url", config.attributes.get("url") or settings.postgres.url.get_secret_value())
 
 
 def run_migrations_offline() -> None:
@@ -57,6 +58,7 @@ async def run_async_migrations() -> None:
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        connect_args=settings.postgres.connect_args,
     )
 
     async with connectable.connect() as connection:
@@ -0,0 +1,58 @@
+"""Add hot path indexes
+
+Revision ID: 9b2f4c1d7e3a
+Revises: 18a5a030af58
+Create Date: 2025-07-20 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b2f4c1d7e3a"
+down_revision: str | None = "18a5a030af58"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_index(op.f("ix_donors_phone_number"), "donors", ["phone_number"], unique=False)
+    op.create_index(
+        op.f("ix_donors_telegram_id"),
+        "donors",
+        ["telegram_id"],
+        unique=False,
+        postgresql_where=sa.text("telegram_id IS NOT NULL"),
+    )
+    op.create_index(
+        op.f("ix_donors_full_name_trgm"),
+        "donors",
+        ["full_name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"full_name": "gin_trgm_ops"},
+    )
+    op.create_index(op.f("ix_donations_donor_id_donor_day_id"), "donations", ["donor_id", "donor_day_id"], unique=False)
+    op.create_index(op.f("ix_donations_donor_day_id"), "donations", ["donor_day_id"], unique=False)
+    op.create_index(
+        op.f("ix_donor_days_organizer_id_event_datetime"),
+        "donor_days",
+        ["organizer_id", "event_datetime"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_donor_days_organizer_id_event_datetime"), table_name="donor_days")
+    op.drop_index(op.f("ix_donations_donor_day_id"), table_name="donations")
+    op.drop_index(op.f("ix_donations_donor_id_donor_day_id"), table_name="donations")
+    op.drop_index(op.f("ix_donors_full_name_trgm"), table_name="donors")
+    op.drop_index(op.f("ix_donors_telegram_id"), table_name="donors")
+    op.drop_index(op.f("ix_donors_phone_number"), table_name="donors")
+    # Расширение pg_trgm не удаляется: им могут пользоваться другие объекты БД
@@ -0,0 +1,116 @@
+"""Add donor day stats
+
+Revision ID: 3d7a9e51c2b8
+Revises: 9b2f4c1d7e3a
+Create Date: 2025-07-20 13:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3d7a9e51c2b8"
+down_revision: str | None = "9b2f4c1d7e3a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "donor_day_stats",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("donor_day_id", sa.Integer(), nullable=False),
+        sa.Column("total_registrations", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("confirmed_donations", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["donor_day_id"],
+            ["donor_days.id"],
+            name=op.f("fk_donor_day_stats_donor_day_id_donor_days"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_donor_day_stats")),
+        sa.UniqueConstraint("donor_day_id", name=op.f("uq_donor_day_stats_donor_day_id")),
+    )
+    op.create_index(op.f("ix_donor_day_stats_id"), "donor_day_stats", ["id"], unique=False)
+
+    # Заполняем счетчики для уже существующих ДД
+    op.execute(
+        """
+        INSERT INTO donor_day_stats (donor_day_id, total_registrations, confirmed_donations, created_at, updated_at)
+        SELECT donor_days.id,
+               count(donations.id),
+               count(donations.id) FILTER (WHERE donations.is_confirmed),
+               now(),
+               now()
+        FROM donor_days
+        LEFT JOIN donations ON donations.donor_day_id = donor_days.id
+        GROUP BY donor_days.id
+        """
+    )
+
+    # Строка счетчиков появляется вместе с ДД
+    op.execute(
+        """
+        CREATE FUNCTION donor_day_stats_on_donor_day_insert() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO donor_day_stats (donor_day_id, created_at, updated_at) VALUES (NEW.id, now(), now());
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER donor_day_stats_on_donor_day_insert
+        AFTER INSERT ON donor_days
+        FOR EACH ROW EXECUTE FUNCTION donor_day_stats_on_donor_day_insert()
+        """
+    )
+
+    # Счетчики меняются на разницу, которую вносит каждая вставка, изменение или удаление донации.
+    # Строка ДД уже может быть удалена каскадом, поэтому используется UPDATE без вставки
+    op.execute(
+        """
+        CREATE FUNCTION donor_day_stats_on_donation_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE donor_day_stats
+                SET total_registrations = total_registrations - 1,
+                    confirmed_donations = confirmed_donations - OLD.is_confirmed::int,
+                    updated_at = now()
+                WHERE donor_day_id = OLD.donor_day_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE donor_day_stats
+                SET total_registrations = total_registrations + 1,
+                    confirmed_donations = confirmed_donations + NEW.is_confirmed::int,
+                    updated_at = now()
+                WHERE donor_day_id = NEW.donor_day_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER donor_day_stats_on_donation_change
+        AFTER INSERT OR DELETE OR UPDATE OF donor_day_id, is_confirmed ON donations
+        FOR EACH ROW EXECUTE FUNCTION donor_day_stats_on_donation_change()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER donor_day_stats_on_donation_change ON donations")
+    op.execute("DROP FUNCTION donor_day_stats_on_donation_change()")
+    op.execute("DROP TRIGGER donor_day_stats_on_donor_day_insert ON donor_days")
+    op.execute("DROP FUNCTION donor_day_stats_on_donor_day_insert()")
+    op.drop_index(op.f("ix_donor_day_stats_id"), table_name="donor_day_stats")
+    op.drop_table("donor_day_stats")
@@ -0,0 +1,28 @@
+"""Make donor phone number unique
+
+Revision ID: c81f0a6d4e27
+Revises: 3d7a9e51c2b8
+Create Date: 2025-07-20 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c81f0a6d4e27"
+down_revision: str | None = "3d7a9e51c2b8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Миграция упадет, если в базе уже есть доноры с одинаковым номером: их нужно объединить вручную
+    op.drop_index(op.f("ix_donors_phone_number"), table_name="donors")
+    op.create_index(op.f("ix_donors_phone_number"), "donors", ["phone_number"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_donors_phone_number"), table_name="donors")
+    op.create_index(op.f("ix_donors_phone_number"), "donors", ["phone_number"], unique=False)
@@ -0,0 +1,120 @@
+"""Замер выборки получателей рассылок по категориям на синтетических данных.
+
+Запуск из каталога bot с переменными окружения бота (как для alembic):
+
+    PYTHONPATH=. python scripts/bench_audience.py --donors 100000 --donations 1000000
+
+Данные создаются в одной транзакции, которая откатывается в конце, поэтому базу можно использовать повторно.
+Схема должна быть применена заранее: alembic upgrade head.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from src.core.config import settings
+from src.enums.mailing_category import MailingCategory
+from src.repositories.mailing_audience import MailingAudienceRepository
+
+# Синтетические доноры отличаются от настоящих префиксом телефона и диапазоном telegram_id
+PHONE_PREFIX = "bench-"
+TELEGRAM_ID_OFFSET = 10**9
+
+
+async def seed(connection: AsyncConnection, donors: int, donations: int, donor_days: int) -> int:
+    """Создать организатора, дни донора (половина в прошлом), доноров и донации; вернуть id организатора"""
+    organizer_id = (
+        await connection.execute(text("INSERT INTO organizers (name) VALUES ('bench') RETURNING id"))
+    ).scalar_one()
+    await connection.execute(
+        text(
+            "INSERT INTO donor_days (event_datetime, organizer_id) "
+            "SELECT localtimestamp + (g - :half) * interval '1 day', :organizer_id "
+            "FROM generate_series(1, :donor_days) g"
+        ),
+        {"organizer_id": organizer_id, "donor_days": donor_days, "half": donor_days // 2},
+    )
+    # Каждый десятый донор не привязан к Telegram, каждый седьмой — донор костного мозга
+    await connection.execute(
+        text(
+            "INSERT INTO donors (full_name, phone_number, donor_type, telegram_id, is_bone_marrow_donor) "
+            "SELECT 'Донор ' || g, :phone_prefix || g, 'STUDENT', "
+            "CASE WHEN g % 10 <> 0 THEN :telegram_id_offset + g END, g % 7 = 0 "
+            "FROM generate_series(1, :donors) g"
+        ),
+        {"phone_prefix": PHONE_PREFIX, "telegram_id_offset": TELEGRAM_ID_OFFSET, "donors": donors},
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO donations (donor_id, organizer_id, donor_day_id, is_confirmed) "
+            "SELECT donor.first_id + (g * 7919) % :donors, :organizer_id, day.first_id + (g * 104729) % :donor_days, "
+            "g % 3 = 0 "
+            "FROM generate_series(1, :donations) g, "
+            "(SELECT min(id) AS first_id FROM donors WHERE phone_number LIKE :phone_prefix || '%') donor, "
+            "(SELECT min(id) AS first_id FROM donor_days WHERE organizer_id = :organizer_id) day"
+        ),
+        {
+            "organizer_id": organizer_id,
+            "donors": donors,
+            "donor_days": donor_days,
+            "donations": donations,
+            "phone_prefix": PHONE_PREFIX,
+        },
+    )
+    await connection.execute(text("ANALYZE donors, donations, donor_days"))
+    return organizer_id
+
+
+async def measure(
+    repository: MailingAudienceRepository, category: MailingCategory, organizer_id: int, repeat: int
+) -> tuple[int, list[float]]:
+    """Полностью прочитать получателей категории repeat раз; вернуть их число и время каждого прогона в мс"""
+    timings = []
+    recipients = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        recipients = 0
+        async for batch in repository.stream_recipients(category, organizer_id):
+            recipients += len(batch)
+        timings.append((time.perf_counter() - started) * 1000)
+    return recipients, timings
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(settings.postgres.url.get_secret_value())
+    try:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            try:
+                started = time.perf_counter()
+                organizer_id = await seed(connection, args.donors, args.donations, args.donor_days)
+                print(
+                    f"Данные: {args.donors} доноров, {args.donations} донаций, {args.donor_days} ДД "
+                    f"({time.perf_counter() - started:.1f} с)"
+                )
+
+                repository = MailingAudienceRepository(AsyncSession(bind=connection))
+                print(f"{'Категория':<28}{'Получателей':>12}{'Медиана, мс':>14}{'Мин, мс':>10}{'Макс, мс':>10}")
+                for category in MailingCategory:
+                    recipients, timings = await measure(repository, category, organizer_id, args.repeat)
+                    print(
+                        f"{category:<28}{recipients:>12}{statistics.median(timings):>14.1f}"
+                        f"{min(timings):>10.1f}{max(timings):>10.1f}"
+                    )
+            finally:
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--donors", type=int, default=100_000)
+    parser.add_argument("--donations", type=int, default=1_000_000)
+    parser.add_argument("--donor-days", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,152 @@
+"""Замер выгрузки отчета в Excel: время и пиковый RSS на 10k/100k/1M строк, потоковая выгрузка против прежней.
+
+Строки генерируются синтетически пачками по EXPORT_BATCH_SIZE, как их отдает серверный курсор;
+--fetch-latency-ms имитирует время получения пачки из БД. Каждый замер идет в отдельном процессе,
+чтобы пиковый RSS (ru_maxrss, включая буферы lxml и временного файла) не наследовался от прошлых прогонов.
+Запуск из каталога bot:
+
+    PYTHONPATH=. python scripts/bench_export.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from io import BytesIO
+from typing import Any
+
+import openpyxl
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from src.services.excel_generation_service import ExcelGenerationService
+
+# Как EXPORT_BATCH_SIZE в DonationRepository; модуль репозитория не импортируется, чтобы не требовать настроек БД
+EXPORT_BATCH_SIZE = 1000
+
+HEADERS = ["ФИО", "ДАТА", "ОРГАНИЗАТОР (ЦК)"]
+ENGINES = ("in-memory", "streaming")
+
+
+async def donations(rows: int, fetch_latency: float) -> AsyncIterator[list[dict[str, Any]]]:
+    """Пачки строк в формате stream_confirmed_donations_by_organizer"""
+    started = datetime(2025, 1, 1, tzinfo=UTC)
+    for start in range(0, rows, EXPORT_BATCH_SIZE):
+        await asyncio.sleep(fetch_latency)
+        yield [
+            {
+                "donor_name": f"Иванов Иван Иванович {number}",
+                "donation_date": started + timedelta(days=number % 365),
+                "organizer_name": "Центр крови",
+            }
+            for number in range(start, min(start + EXPORT_BATCH_SIZE, rows))
+        ]
+
+
+async def export_streaming(rows: int, fetch_latency: float) -> int:
+    """Текущая выгрузка: книга write-only во временный файл; вернуть размер файла в байтах"""
+    # Бот нужен сервису только для отправки файла, при выгрузке он не используется
+    service = ExcelGenerationService(bot=None)  # type: ignore[arg-type]
+    file_content, _ = await service._export(  # noqa: SLF001
+        "Статистика доноров",
+        HEADERS,
+        20,
+        donations(rows, fetch_latency),
+        service._donor_row,  # noqa: SLF001
+    )
+    with file_content:
+        file_content.seek(0, 2)
+        return file_content.tell()
+
+
+def _in_memory_workbook(items: list[dict[str, Any]]) -> BytesIO:
+    """Прежняя генерация: обычная книга openpyxl целиком в памяти и сохранение в BytesIO"""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Статистика доноров"
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    for col_num, header in enumerate(HEADERS, 1):
+        cell = sheet.cell(row=1, column=col_num, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+
+    for row_num, item in enumerate(items, 2):
+        for col_num, value in enumerate(ExcelGenerationService._donor_row(item), 1):  # noqa: SLF001
+            sheet.cell(row=row_num, column=col_num, value=value)
+
+    for col_num in range(1, len(HEADERS) + 1):
+        sheet.column_dimensions[get_column_letter(col_num)].width = 20
+
+    file_content = BytesIO()
+    workbook.save(file_content)
+    file_content.seek(0)
+    return file_content
+
+
+async def export_in_memory(rows: int, fetch_latency: float) -> int:
+    """Прежняя выгрузка: все строки списком из БД, затем книга в памяти; вернуть размер файла в байтах"""
+    items = [item async for batch in donations(rows, fetch_latency) for item in batch]
+    file_content = await asyncio.to_thread(_in_memory_workbook, items)
+    return file_content.getbuffer().nbytes
+
+
+def _max_rss_mb() -> float:
+    # В Linux ru_maxrss в килобайтах
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run_once(engine: str, rows: int, fetch_latency: float) -> dict[str, float]:
+    """Один замер в текущем процессе"""
+    export = export_streaming if engine == "streaming" else export_in_memory
+    baseline_rss = _max_rss_mb()
+    started = time.perf_counter()
+    size = await export(rows, fetch_latency)
+    elapsed = time.perf_counter() - started
+    return {"elapsed": elapsed, "baseline_rss": baseline_rss, "peak_rss": _max_rss_mb(), "size": size}
+
+
+def measure(engine: str, rows: int, fetch_latency_ms: float) -> dict[str, float]:
+    """Запустить замер в отдельном процессе и прочитать его результат"""
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, __file__, "--run", engine, str(rows), "--fetch-latency-ms", str(fetch_latency_ms)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main(args: argparse.Namespace) -> None:
+    print(
+        f"{'Выгрузка':<12}{'Строк':>10}{'Время, с':>10}{'Строк/с':>10}"
+        f"{'RSS до, МБ':>12}{'Пик RSS, МБ':>13}{'Файл, МБ':>10}"
+    )
+    for rows in args.sizes:
+        for engine in args.engines:
+            result = measure(engine, rows, args.fetch_latency_ms)
+            print(
+                f"{engine:<12}{rows:>10}{result['elapsed']:>10.2f}{rows / result['elapsed']:>10.0f}"
+                f"{result['baseline_rss']:>12.1f}{result['peak_rss']:>13.1f}{result['size'] / 2**20:>10.1f}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--fetch-latency-ms", type=float, default=0)
+    parser.add_argument("--run", nargs=2, metavar=("ENGINE", "ROWS"), help=argparse.SUPPRESS)
+    parsed = parser.parse_args()
+    if parsed.run:
+        engine, rows = parsed.run
+        print(json.dumps(asyncio.run(run_once(engine, int(rows), parsed.fetch_latency_ms / 1000))))
+    else:
+        main(parsed)
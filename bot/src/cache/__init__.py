@@ -0,0 +1,14 @@
+from src.cache.donor_identity import DonorIdentity, DonorIdentityCache
+from src.cache.read_through import ReadThroughCache
+from src.cache.report_cache import CachedReport, ReportCache
+from src.cache.snapshots import DonorDaySnapshot, OrganizerSnapshot
+
+__all__ = [
+    "CachedReport",
+    "DonorDaySnapshot",
+    "DonorIdentity",
+    "DonorIdentityCache",
+    "OrganizerSnapshot",
+    "ReadThroughCache",
+    "ReportCache",
+]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, ConfigDict
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+# Личность донора меняется редко и сбрасывается явно при изменении, TTL лишь страхует от рассинхронизации
+IDENTITY_TTL_SECONDS = 60 * 60
+
+
+class DonorIdentity(BaseModel):
+    """Данные донора, достаточные большинству обработчиков без обращения к БД"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    full_name: str
+    phone_number: str
+    telegram_id: int
+    is_bone_marrow_donor: bool
+
+
+class DonorIdentityCache:
+    """Кэш соответствия telegram_id → донор в Redis"""
+
+    def __init__(self, redis: Redis, ttl: int = IDENTITY_TTL_SECONDS) -> None:
+        self.redis = redis
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(telegram_id: int) -> str:
+        return f"donor_identity:{telegram_id}"
+
+    async def get(self, telegram_id: int) -> DonorIdentity | None:
+        raw = await self.redis.get(self._key(telegram_id))
+        return DonorIdentity.model_validate_json(raw) if raw else None
+
+    async def set(self, identity: DonorIdentity) -> None:
+        await self.redis.set(self._key(identity.telegram_id), identity.model_dump_json(), ex=self.ttl)
+
+    async def invalidate(self, *telegram_ids: int | None) -> None:
+        keys = [self._key(telegram_id) for telegram_id in telegram_ids if telegram_id]
+        if keys:
+            await self.redis.delete(*keys)
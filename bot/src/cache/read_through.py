@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, TypeVar
+
+from src.core.metrics import cache_requests
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from pydantic import TypeAdapter
+    from redis.asyncio import Redis
+
+READ_THROUGH_TTL_SECONDS = 5 * 60
+# Сколько ждать, пока другой процесс заполнит кэш, прежде чем загрузить данные самостоятельно
+LOAD_LOCK_TIMEOUT_SECONDS = 5.0
+LOAD_WAIT_INTERVAL_SECONDS = 0.05
+
+T = TypeVar("T")
+
+
+class ReadThroughCache:
+    """Версионированный read-through кэш в Redis с защитой от одновременной загрузки одних и тех же данных"""
+
+    def __init__(self, redis: Redis, ttl: int = READ_THROUGH_TTL_SECONDS) -> None:
+        self.redis = redis
+        self.ttl = ttl
+        self._inflight: dict[str, asyncio.Future[bytes]] = {}
+
+    @staticmethod
+    def _version_key(namespace: str) -> str:
+        return f"cache:{namespace}:version"
+
+    async def _data_key(self, namespace: str, key: str) -> str:
+        version = await self.redis.get(self._version_key(namespace))
+        return f"cache:{namespace}:v{int(version or 0)}:{key}"
+
+    async def get_or_load(
+        self, namespace: str, key: str, loader: Callable[[], Awaitable[T]], adapter: TypeAdapter[T]
+    ) -> T:
+        """Вернуть значение из кэша или загрузить его, сохранив под текущей версией пространства имен"""
+        data_key = await self._data_key(namespace, key)
+        raw = await self.redis.get(data_key)
+        if raw is not None:
+            cache_requests.inc(namespace, "hit")
+            return adapter.validate_json(raw)
+
+        cache_requests.inc(namespace, "miss")
+        # Внутри процесса одновременные промахи по одному ключу ждут единственную загрузку
+        if inflight := self._inflight.get(data_key):
+            return adapter.validate_json(await asyncio.shield(inflight))
+
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._inflight[data_key] = future
+        try:
+            raw = await self._load(data_key, loader, adapter)
+            future.set_result(raw)
+        except BaseException as e:
+            future.set_exception(e)
+            # Исключение получат ожидающие загрузку, если их нет — не оставляем его необработанным
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(data_key, None)
+        return adapter.validate_json(raw)
+
+    async def _load(self, data_key: str, loader: Callable[[], Awaitable[T]], adapter: TypeAdapter[T]) -> bytes:
+        lock_key = f"{data_key}:lock"
+        # Между процессами данные загружает только владелец блокировки, остальные ждут его результата
+        locked = await self.redis.set(lock_key, 1, nx=True, px=int(LOAD_LOCK_TIMEOUT_SECONDS * 1000))
+        if not locked:
+            for _ in range(int(LOAD_LOCK_TIMEOUT_SECONDS / LOAD_WAIT_INTERVAL_SECONDS)):
+                await asyncio.sleep(LOAD_WAIT_INTERVAL_SECONDS)
+                if (raw := await self.redis.get(data_key)) is not None:
+                    return raw
+
+        try:
+            raw = adapter.dump_json(await loader())
+            await self.redis.set(data_key, raw, ex=self.ttl)
+        finally:
+            if locked:
+                await self.redis.delete(lock_key)
+        return raw
+
+    async def invalidate(self, namespace: str) -> None:
+        """Сбросить все значения пространства имен, увеличив его версию"""
+        await self.redis.incr(self._version_key(namespace))
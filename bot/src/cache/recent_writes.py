@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+
+class RecentWritesTracker:
+    """Недавние записи пользователя в БД: пока реплика их догоняет, его чтения идут в основную БД"""
+
+    def __init__(self, redis: Redis, window_seconds: float) -> None:
+        self.redis = redis
+        self.window_seconds = window_seconds
+        # Задается middleware для апдейтов от пользователей; у фоновых задач пользователя нет
+        self.user_id: int | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.user_id is not None and self.window_seconds > 0
+
+    def _key(self) -> str:
+        return f"recent_writes:{self.user_id}"
+
+    async def remember(self) -> None:
+        """Отметить, что пользователь только что зафиксировал изменения"""
+        if self.enabled:
+            await self.redis.set(self._key(), 1, px=int(self.window_seconds * 1000))
+
+    async def is_recent(self) -> bool:
+        return self.enabled and bool(await self.redis.exists(self._key()))
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+# Отправленный отчет можно переслать по file_id, пока данные организатора не изменились
+REPORT_TTL_SECONDS = 30 * 24 * 60 * 60
+
+
+class CachedReport(BaseModel):
+    """Ранее отправленный отчет, который можно переслать по file_id без повторной загрузки"""
+
+    file_id: str
+    filename: str
+    records_count: int
+
+
+class ReportCache:
+    """Кэш отчетов организаторов, привязанный к версии их данных"""
+
+    def __init__(self, redis: Redis, ttl: int = REPORT_TTL_SECONDS) -> None:
+        self.redis = redis
+        self.ttl = ttl
+
+    @staticmethod
+    def _version_key(organizer_id: int) -> str:
+        return f"report:{organizer_id}:version"
+
+    @staticmethod
+    def _report_key(organizer_id: int, kind: str, version: int) -> str:
+        return f"report:{organizer_id}:{kind}:v{version}"
+
+    async def get_version(self, organizer_id: int) -> int:
+        return int(await self.redis.get(self._version_key(organizer_id)) or 0)
+
+    async def bump(self, *organizer_ids: int) -> None:
+        """Отметить изменение данных организаторов: их закэшированные отчеты больше не используются"""
+        if not organizer_ids:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for organizer_id in set(organizer_ids):
+                pipe.incr(self._version_key(organizer_id))
+            await pipe.execute()
+
+    async def get(self, organizer_id: int, kind: str, version: int) -> CachedReport | None:
+        raw = await self.redis.get(self._report_key(organizer_id, kind, version))
+        return CachedReport.model_validate_json(raw) if raw else None
+
+    async def set(self, organizer_id: int, kind: str, version: int, report: CachedReport) -> None:
+        await self.redis.set(self._report_key(organizer_id, kind, version), report.model_dump_json(), ex=self.ttl)
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DonorDaySnapshot(BaseModel):
+    """Снимок дня донора для хранения в кэше"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    event_datetime: datetime
+    organizer_id: int
+
+
+class OrganizerSnapshot(BaseModel):
+    """Снимок организатора для хранения в кэше"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
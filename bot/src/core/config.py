@@ -1,5 +1,6 @@
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
+from uuid import uuid4
 
 from pydantic import BaseModel, SecretStr, ValidationInfo, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -14,6 +15,24 @@ class PostgresConfig(BaseModel):
     port: int
     db: str
     echo: bool = False
+    pool_size: int = 10
+    max_overflow: int = 20
+    # Сколько секунд ждать свободного соединения, прежде чем запрос завершится ошибкой
+    pool_timeout: float = 30
+    # Через сколько секунд переоткрывать соединение, чтобы не упираться в таймауты простоя на стороне сети и БД
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    # Ограничение времени выполнения запроса в миллисекундах (0 — без ограничения)
+    statement_timeout: int = 30000
+    # Размер кэша подготовленных выражений на соединение (0 — без кэша)
+    statement_cache_size: int = 100
+    # Соединения выдает внешний пулер (PgBouncer в режиме transaction): собственный пул бота не используется
+    external_pooler: bool = False
+    # Реплика только для чтения для тяжелых запросов (статистика, рассылки, поиск доноров)
+    replica_host: str | None = None
+    replica_port: int | None = None
+    # Сколько секунд после записи пользователя его тяжелые чтения идут в основную БД, пока реплика догоняет
+    read_your_writes_seconds: float = 5
     naming_convention: dict = {
         "ix": "ix_%(column_0_label)s",
         "uq": "uq_%(table_name)s_%(column_0_name)s",
@@ -22,11 +41,37 @@ class PostgresConfig(BaseModel):
         "pk": "pk_%(table_name)s",
     }
 
+    def _build_url(self, host: str, port: int) -> SecretStr:
+        return SecretStr(f"postgresql+asyncpg://{self.user}:{self.password.get_secret_value()}@{host}:{port}/{self.db}")
+
     @property
     def url(self) -> SecretStr:
-        return SecretStr(
-            f"postgresql+asyncpg://{self.user}:{self.password.get_secret_value()}@{self.host}:{self.port}/{self.db}"
-        )
+        return self._build_url(self.host, self.port)
+
+    @property
+    def replica_url(self) -> SecretStr | None:
+        if not self.replica_host:
+            return None
+        return self._build_url(self.replica_host, self.replica_port or self.port)
+
+    @property
+    def connect_args(self) -> dict[str, Any]:
+        """Параметры подключения asyncpg с учетом режима внешнего пулера"""
+        if self.external_pooler:
+            # Пулер отдает одно серверное соединение разным клиентам, поэтому подготовленные выражения не кэшируются
+            # и получают уникальные имена. Стартовый параметр statement_timeout PgBouncer не пропускает:
+            # в этом режиме таймаут задается на роли или базе (ALTER ROLE ... SET statement_timeout)
+            return {
+                "prepared_statement_cache_size": 0,
+                "statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return {
+            # Кэш подготовленных выражений SQLAlchemy и собственный кэш asyncpg
+            "prepared_statement_cache_size": self.statement_cache_size,
+            "statement_cache_size": self.statement_cache_size,
+            "server_settings": {"statement_timeout": str(self.statement_timeout)},
+        }
 
 
 class RedisConfig(BaseModel):
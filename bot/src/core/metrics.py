@@ -0,0 +1,142 @@
+from collections import defaultdict
+from typing import TypeVar
+
+from aiohttp import web
+
+
+class Metric:
+    """Метрика с метками в формате Prometheus"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        """Строки вывода: имя, пары (метка, значение) и значение"""
+        raise NotImplementedError
+
+    def _labels(self, labelvalues: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+        return tuple(zip(self.labelnames, labelvalues, strict=True))
+
+
+class Counter(Metric):
+    """Монотонный счетчик с метками в формате Prometheus"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: defaultdict[tuple[str, ...], float] = defaultdict(float)
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self._values[labelvalues] += amount
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        return [(self.name, self._labels(labelvalues), value) for labelvalues, value in self._values.items()]
+
+
+class Gauge(Metric):
+    """Текущее значение с метками, которое может расти и уменьшаться"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        self._values[labelvalues] = value
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        return [(self.name, self._labels(labelvalues), value) for labelvalues, value in self._values.items()]
+
+
+class Histogram(Metric):
+    """Распределение значений по накопительным корзинам с суммой и количеством наблюдений"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: defaultdict[tuple[str, ...], list[int]] = defaultdict(lambda: [0] * len(self.buckets))
+        self._sums: defaultdict[tuple[str, ...], float] = defaultdict(float)
+        self._totals: defaultdict[tuple[str, ...], int] = defaultdict(int)
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        counts = self._counts[labelvalues]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+        self._sums[labelvalues] += value
+        self._totals[labelvalues] += 1
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        samples = []
+        for labelvalues, total in self._totals.items():
+            labels = self._labels(labelvalues)
+            for bound, count in zip(self.buckets, self._counts[labelvalues], strict=True):
+                samples.append((f"{self.name}_bucket", (*labels, ("le", str(bound))), count))
+            samples.append((f"{self.name}_bucket", (*labels, ("le", "+Inf")), total))
+            samples.append((f"{self.name}_sum", labels, self._sums[labelvalues]))
+            samples.append((f"{self.name}_count", labels, total))
+        return samples
+
+
+MetricT = TypeVar("MetricT", bound=Metric)
+
+
+class MetricsRegistry:
+    """Реестр метрик процесса с выводом в текстовом формате Prometheus"""
+
+    def __init__(self) -> None:
+        self._metrics: list[Metric] = []
+
+    def register(self, metric: MetricT) -> MetricT:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in metric.samples():
+                rendered_labels = ",".join(f'{label}="{label_value}"' for label, label_value in labels)
+                lines.append(f"{name}{{{rendered_labels}}} {value}" if rendered_labels else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+cache_requests = registry.register(
+    Counter("donorbot_cache_requests_total", "Обращения к read-through кэшу", ("namespace", "result"))
+)
+db_pool_checkout_seconds = registry.register(
+    Histogram(
+        "donorbot_db_pool_checkout_seconds",
+        "Время получения соединения из пула БД, включая ожидание свободного",
+        ("pool",),
+        buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+    )
+)
+db_pool_connections_in_use = registry.register(
+    Gauge("donorbot_db_pool_connections_in_use", "Соединения пула БД, выданные сессиям", ("pool",))
+)
+db_pool_overflow = registry.register(
+    Gauge("donorbot_db_pool_overflow", "Соединения пула БД, открытые сверх pool_size", ("pool",))
+)
+db_replica_fallbacks = registry.register(
+    Counter(
+        "donorbot_db_replica_fallbacks_total", "Тяжелые чтения, отправленные в основную БД вместо реплики", ("reason",)
+    )
+)
+
+
+async def metrics_handler(_: web.Request) -> web.Response:
+    return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8")
@@ -1,3 +1,3 @@
-from src.db.uow import SQLAlchemyUnitOfWork
+from src.db.uow import SQLAlchemyUnitOfWork, run_after_commit
 
-__all__ = ["SQLAlchemyUnitOfWork"]
+__all__ = ["SQLAlchemyUnitOfWork", "run_after_commit"]
@@ -0,0 +1,38 @@
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
+
+from src.core.metrics import db_pool_checkout_seconds, db_pool_connections_in_use, db_pool_overflow
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Пул соединений asyncpg, измеряющий время выдачи соединения вместе с ожиданием свободного"""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        # У SQLAlchemy нет события начала ожидания соединения, поэтому время выдачи измеряется здесь
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_seconds.observe(perf_counter() - started, self.logging_name or "default")
+
+
+def instrument_pool(pool: QueuePool, pool_name: str) -> None:
+    """Публиковать число занятых и сверхлимитных соединений пула по событиям checkout и checkin"""
+
+    def on_checkout(*_: Any) -> None:
+        db_pool_connections_in_use.set(pool.checkedout(), pool_name)
+        # До заполнения pool_size счетчик переполнения QueuePool отрицательный
+        db_pool_overflow.set(max(pool.overflow(), 0), pool_name)
+
+    def on_checkin(*_: Any) -> None:
+        # Событие checkin приходит до возврата соединения в пул: оно еще считается выданным,
+        # а при заполненной очереди пул закроет его, уменьшив переполнение
+        returned_overflow = 1 if pool.checkedin() >= pool.size() else 0
+        db_pool_connections_in_use.set(pool.checkedout() - 1, pool_name)
+        db_pool_overflow.set(max(pool.overflow() - returned_overflow, 0), pool_name)
+
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "checkin", on_checkin)
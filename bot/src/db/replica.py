@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NewType
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.core.metrics import db_replica_fallbacks
+from src.db.uow import WRITES_KEY
+
+if TYPE_CHECKING:
+    from src.cache.recent_writes import RecentWritesTracker
+
+ReplicaEngine = NewType("ReplicaEngine", AsyncEngine)
+ReplicaSessionmaker = NewType("ReplicaSessionmaker", async_sessionmaker[AsyncSession])
+
+
+class ReadReplicaRouter:
+    """Выбор сессии для тяжелых чтений: реплика, если она настроена, доступна и не отстает от записей пользователя"""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        replica_sessionmaker: ReplicaSessionmaker | None,
+        recent_writes: RecentWritesTracker,
+    ) -> None:
+        self.session = session
+        self.replica_sessionmaker = replica_sessionmaker
+        self.recent_writes = recent_writes
+        self._replica_session: AsyncSession | None = None
+        self._use_primary = replica_sessionmaker is None
+
+    async def get_session(self) -> AsyncSession:
+        # Изменения текущего апдейта видны только в его собственной сессии основной БД
+        if self._use_primary or self.session.info.get(WRITES_KEY):
+            return self.session
+        if self._replica_session is not None:
+            return self._replica_session
+
+        if await self.recent_writes.is_recent():
+            db_replica_fallbacks.inc("recent_writes")
+            self._use_primary = True
+            return self.session
+
+        replica_session = self.replica_sessionmaker()
+        try:
+            await replica_session.connection()
+        except (OSError, TimeoutError, SQLAlchemyError):
+            # Недоступная реплика не ломает отчеты и рассылки: чтение уходит в основную БД
+            db_replica_fallbacks.inc("unavailable")
+            await replica_session.close()
+            self._use_primary = True
+            return self.session
+
+        self._replica_session = replica_session
+        return replica_session
+
+    async def close(self) -> None:
+        if self._replica_session is not None:
+            await self._replica_session.close()
+
+
+class ReplicaReadMixin:
+    """Репозиторий, который направляет тяжелые чтения через ReadReplicaRouter"""
+
+    session: AsyncSession
+    read_router: ReadReplicaRouter | None
+
+    async def _read_session(self) -> AsyncSession:
+        """Сессия для тяжелых чтений: реплика, если она настроена и не отстает от записей пользователя"""
+        return await self.read_router.get_session() if self.read_router else self.session
@@ -1,12 +1,44 @@
-from types import TracebackType
-from typing import Self
+from __future__ import annotations
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import TYPE_CHECKING, Self
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from types import TracebackType
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import ORMExecuteState, UOWTransaction
+
+    from src.cache.recent_writes import RecentWritesTracker
+
+AFTER_COMMIT_KEY = "after_commit"
+# Флаг в session.info: в текущей транзакции сессии были изменения
+WRITES_KEY = "has_writes"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_writes(session: Session, flush_context: UOWTransaction) -> None:
+    session.info[WRITES_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[WRITES_KEY] = True
+
+
+def run_after_commit(session: AsyncSession, callback: Callable[[], Awaitable[object]]) -> None:
+    """Отложить действие (сброс кэша, запуск задачи) до фиксации текущей транзакции сессии"""
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
 
 
 class SQLAlchemyUnitOfWork:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, recent_writes: RecentWritesTracker | None = None) -> None:
         self.session = session
+        self.recent_writes = recent_writes
 
     async def __aenter__(self) -> Self:
         return self
@@ -22,6 +54,12 @@ class SQLAlchemyUnitOfWork:
 
     async def commit(self) -> None:
         await self.session.commit()
+        if self.session.info.pop(WRITES_KEY, False) and self.recent_writes:
+            await self.recent_writes.remember()
+        for callback in self.session.info.pop(AFTER_COMMIT_KEY, []):
+            await callback()
 
     async def rollback(self) -> None:
+        self.session.info.pop(AFTER_COMMIT_KEY, None)
+        self.session.info.pop(WRITES_KEY, None)
         await self.session.rollback()
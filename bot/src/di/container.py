@@ -1,5 +1,6 @@
 from dishka import make_async_container
 from dishka.integrations.aiogram import AiogramProvider
+from dishka.integrations.taskiq import TaskiqProvider
 
 from src.di.providers import (
     ConfigProvider,
@@ -18,6 +19,7 @@ container = make_async_container(
     RepositoryProvider(),
     ServicesProvider(),
     AiogramProvider(),
+    TaskiqProvider(),
     TelegramBotProvider(),
     WebhookProvider(),
 )
@@ -1,31 +1,93 @@
+import logging
 from collections.abc import AsyncIterator
 
 from dishka import Provider, Scope, provide
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
-from src.core.config import Settings
+from src.cache.recent_writes import RecentWritesTracker
+from src.core.config import PostgresConfig, Settings
+from src.db.pool import InstrumentedAsyncPool, instrument_pool
+from src.db.replica import ReadReplicaRouter, ReplicaEngine, ReplicaSessionmaker
 from src.db.uow import SQLAlchemyUnitOfWork
 
+logger = logging.getLogger(__name__)
+
+
+def _create_engine(postgres: PostgresConfig, url: str, pool_name: str) -> AsyncEngine:
+    if postgres.external_pooler:
+        if postgres.statement_timeout:
+            logger.warning(
+                "Пул %s: PgBouncer не передает statement_timeout=%s мс из настроек бота, "
+                "задайте его на роли или базе (ALTER ROLE ... SET statement_timeout)",
+                pool_name,
+                postgres.statement_timeout,
+            )
+        # Соединения держит пулер, бот открывает их только на время сессии
+        return create_async_engine(url, echo=postgres.echo, poolclass=NullPool, connect_args=postgres.connect_args)
+    engine = create_async_engine(
+        url,
+        echo=postgres.echo,
+        poolclass=InstrumentedAsyncPool,
+        pool_logging_name=pool_name,
+        pool_size=postgres.pool_size,
+        max_overflow=postgres.max_overflow,
+        pool_timeout=postgres.pool_timeout,
+        pool_recycle=postgres.pool_recycle,
+        pool_pre_ping=postgres.pool_pre_ping,
+        connect_args=postgres.connect_args,
+    )
+    instrument_pool(engine.pool, pool_name)
+    return engine
+
 
 class DatabaseProvider(Provider):
     @provide(scope=Scope.APP)
     def get_database_engine(self, settings: Settings) -> AsyncEngine:
-        return create_async_engine(
-            settings.postgres.url.get_secret_value(),
-            echo=settings.postgres.echo,
-            pool_size=10,
-            max_overflow=20,
-        )
+        return _create_engine(settings.postgres, settings.postgres.url.get_secret_value(), "primary")
 
     @provide(scope=Scope.APP)
     def get_database_sessionmaker(self, engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
         return async_sessionmaker(engine, expire_on_commit=False, autoflush=True)
 
+    @provide(scope=Scope.APP)
+    def get_replica_engine(self, settings: Settings) -> ReplicaEngine | None:
+        replica_url = settings.postgres.replica_url
+        if replica_url is None:
+            return None
+        return ReplicaEngine(_create_engine(settings.postgres, replica_url.get_secret_value(), "replica"))
+
+    @provide(scope=Scope.APP)
+    def get_replica_sessionmaker(self, engine: ReplicaEngine | None) -> ReplicaSessionmaker | None:
+        if engine is None:
+            return None
+        return ReplicaSessionmaker(async_sessionmaker(engine, expire_on_commit=False, autoflush=False))
+
     @provide(scope=Scope.REQUEST)
-    async def get_session(self, sessionmaker: async_sessionmaker[AsyncSession]) -> AsyncIterator[AsyncSession]:
+    async def get_session(
+        self, sessionmaker: async_sessionmaker[AsyncSession], recent_writes: RecentWritesTracker
+    ) -> AsyncIterator[AsyncSession]:
+        """Сессия на один апдейт: репозитории только сбрасывают изменения, фиксация одна в конце обработки"""
         async with sessionmaker() as session:
-            yield session
+            unit_of_work = SQLAlchemyUnitOfWork(session, recent_writes)
+            exception = yield session
+            # После ошибки БД, перехваченной обработчиком, сессия неактивна и фиксировать нечего
+            if exception is None and session.is_active:
+                await unit_of_work.commit()
+            else:
+                await unit_of_work.rollback()
+
+    @provide(scope=Scope.REQUEST)
+    def get_unit_of_work(self, session: AsyncSession, recent_writes: RecentWritesTracker) -> SQLAlchemyUnitOfWork:
+        return SQLAlchemyUnitOfWork(session=session, recent_writes=recent_writes)
 
     @provide(scope=Scope.REQUEST)
-    def get_unit_of_work(self, session: AsyncSession) -> SQLAlchemyUnitOfWork:
-        return SQLAlchemyUnitOfWork(session=session)
+    async def get_read_replica_router(
+        self,
+        session: AsyncSession,
+        replica_sessionmaker: ReplicaSessionmaker | None,
+        recent_writes: RecentWritesTracker,
+    ) -> AsyncIterator[ReadReplicaRouter]:
+        router = ReadReplicaRouter(session, replica_sessionmaker, recent_writes)
+        yield router
+        await router.close()
@@ -1,6 +1,10 @@
 from dishka import Provider, Scope, provide
 from redis.asyncio import Redis
 
+from src.cache.donor_identity import DonorIdentityCache
+from src.cache.read_through import ReadThroughCache
+from src.cache.recent_writes import RecentWritesTracker
+from src.cache.report_cache import ReportCache
 from src.core.config import settings
 
 
@@ -10,3 +14,21 @@ class RedisProvider(Provider):
     @provide
     def get_redis(self) -> Redis:
         return Redis.from_url(settings.redis.url.get_secret_value())
+
+    @provide
+    def get_donor_identity_cache(self, redis: Redis) -> DonorIdentityCache:
+        return DonorIdentityCache(redis)
+
+    @provide
+    def get_read_through_cache(self, redis: Redis) -> ReadThroughCache:
+        return ReadThroughCache(redis)
+
+    @provide
+    def get_report_cache(self, redis: Redis) -> ReportCache:
+        return ReportCache(redis)
+
+    @provide(scope=Scope.REQUEST)
+    def get_recent_writes_tracker(self, redis: Redis) -> RecentWritesTracker:
+        # Без реплики все чтения и так идут в основную БД, и записи учитывать не нужно
+        window_seconds = settings.postgres.read_your_writes_seconds if settings.postgres.replica_host else 0
+        return RecentWritesTracker(redis, window_seconds)
@@ -1,10 +1,15 @@
 from dishka import Provider, Scope, provide
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache.donor_identity import DonorIdentityCache
+from src.cache.read_through import ReadThroughCache
+from src.cache.report_cache import ReportCache
+from src.db.replica import ReadReplicaRouter
 from src.repositories.content import ContentRepository
 from src.repositories.donation import DonationRepository
 from src.repositories.donor import DonorRepository
 from src.repositories.donor_day import DonorDayRepository
+from src.repositories.mailing_audience import MailingAudienceRepository
 from src.repositories.organizer import OrganizerRepository
 
 
@@ -12,21 +17,37 @@ class RepositoryProvider(Provider):
     scope = Scope.REQUEST
 
     @provide
-    def get_donor_repository(self, session: AsyncSession) -> DonorRepository:
-        return DonorRepository(session)
+    def get_donor_repository(
+        self,
+        session: AsyncSession,
+        identity_cache: DonorIdentityCache,
+        report_cache: ReportCache,
+        read_router: ReadReplicaRouter,
+    ) -> DonorRepository:
+        return DonorRepository(session, identity_cache, report_cache, read_router)
 
     @provide
-    def get_organizer_repository(self, session: AsyncSession) -> OrganizerRepository:
-        return OrganizerRepository(session)
+    def get_organizer_repository(self, session: AsyncSession, cache: ReadThroughCache) -> OrganizerRepository:
+        return OrganizerRepository(session, cache)
 
     @provide
-    def get_donation_repository(self, session: AsyncSession) -> DonationRepository:
-        return DonationRepository(session)
+    def get_donation_repository(
+        self, session: AsyncSession, report_cache: ReportCache, read_router: ReadReplicaRouter, cache: ReadThroughCache
+    ) -> DonationRepository:
+        return DonationRepository(session, report_cache, read_router, cache)
 
     @provide
-    def get_donor_day_repository(self, session: AsyncSession) -> DonorDayRepository:
-        return DonorDayRepository(session)
+    def get_donor_day_repository(
+        self, session: AsyncSession, cache: ReadThroughCache, report_cache: ReportCache
+    ) -> DonorDayRepository:
+        return DonorDayRepository(session, cache, report_cache)
 
     @provide
     def get_content_repository(self, session: AsyncSession) -> ContentRepository:
         return ContentRepository(session)
+
+    @provide
+    def get_mailing_audience_repository(
+        self, session: AsyncSession, read_router: ReadReplicaRouter
+    ) -> MailingAudienceRepository:
+        return MailingAudienceRepository(session, read_router)
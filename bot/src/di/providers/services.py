@@ -1,8 +1,15 @@
 from aiogram import Bot
 from dishka import Provider, Scope, provide
+from redis.asyncio import Redis
 
+from src.cache.report_cache import ReportCache
+from src.services.attendance_service import AttendanceService
+from src.services.broadcast_progress_service import BroadcastProgressService
+from src.services.broadcast_service import BroadcastService, TokenBucket
+from src.services.donor_import_service import DonorImportService
 from src.services.excel_generation_service import ExcelGenerationService
 from src.services.notification_service import NotificationService
+from src.services.report_delivery_service import ReportDeliveryService
 
 
 class ServicesProvider(Provider):
@@ -10,6 +17,30 @@ class ServicesProvider(Provider):
     def get_excel_generation_service(self, bot: Bot) -> ExcelGenerationService:
         return ExcelGenerationService(bot)
 
+    @provide(scope=Scope.APP)
+    def get_attendance_service(self) -> AttendanceService:
+        return AttendanceService()
+
+    @provide(scope=Scope.APP)
+    def get_donor_import_service(self) -> DonorImportService:
+        return DonorImportService()
+
+    @provide(scope=Scope.REQUEST)
+    def get_report_delivery_service(self, bot: Bot, report_cache: ReportCache) -> ReportDeliveryService:
+        return ReportDeliveryService(bot, report_cache)
+
+    @provide(scope=Scope.APP)
+    def get_broadcast_token_bucket(self) -> TokenBucket:
+        return TokenBucket()
+
+    @provide(scope=Scope.REQUEST)
+    def get_broadcast_service(self, bot: Bot, bucket: TokenBucket) -> BroadcastService:
+        return BroadcastService(bot, bucket)
+
+    @provide(scope=Scope.REQUEST)
+    def get_notification_service(self, bot: Bot, broadcast_service: BroadcastService) -> NotificationService:
+        return NotificationService(bot, broadcast_service)
+
     @provide(scope=Scope.REQUEST)
-    def get_notification_service(self, bot: Bot) -> NotificationService:
-        return NotificationService(bot)
+    def get_broadcast_progress_service(self, redis: Redis) -> BroadcastProgressService:
+        return BroadcastProgressService(redis)
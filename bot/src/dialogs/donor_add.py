@@ -5,16 +5,10 @@ from aiogram_dialog.widgets.kbd import Button
 from dishka import FromDishka
 from dishka.integrations.aiogram_dialog import inject
 
+from src.db.uow import SQLAlchemyUnitOfWork
 from src.dialogs.states import OrganizerSG
-from src.dialogs.validators import (
-    normalize_full_name,
-    normalize_phone,
-    validate_full_name,
-    validate_phone,
-)
-from src.enums.donor_type import DonorType
-from src.models.donor import Donor
 from src.repositories.donor import DonorRepository
+from src.services.donor_import_service import DonorImportService, format_truncated
 
 
 async def add_donors_handler(
@@ -40,6 +34,8 @@ async def donor_add_input_handler(
     dialog_manager: DialogManager,
     data: str,
     donor_repository: FromDishka[DonorRepository],
+    donor_import_service: FromDishka[DonorImportService],
+    unit_of_work: FromDishka[SQLAlchemyUnitOfWork],
 ) -> None:
     input_text = data.strip()
 
@@ -56,25 +52,21 @@ async def donor_add_input_handler(
         await message.answer("Не найдено данных для добавления доноров.")
         return
 
-    results = []
-    errors = []
-
-    for i, block in enumerate(donor_blocks):
-        result = await process_single_donor_add(block, donor_repository, i + 1)
-        if result["success"]:
-            results.append(result["message"])
-        else:
-            errors.append(result["message"])
+    result = await donor_import_service.import_blocks(donor_blocks, donor_repository)
+    # Доноры фиксируются до ответа, чтобы организатор не увидел успех при неудачном коммите
+    await unit_of_work.commit()
+    results = result["added"]
+    errors = result["errors"]
 
     response_parts = []
 
     if results:
         response_parts.append(f"✅ Успешно добавлено доноров: {len(results)}")
-        response_parts.extend(results)
+        response_parts.extend(format_truncated(results, len(results)))
 
     if errors:
         response_parts.append(f"\n❌ Ошибки ({len(errors)}):")
-        response_parts.extend(errors)
+        response_parts.extend(format_truncated(errors, len(errors)))
 
     if not results and not errors:
         response_parts.append("❌ Не удалось обработать ни одного донора.")
@@ -83,81 +75,3 @@ async def donor_add_input_handler(
 
     if results:
         await dialog_manager.switch_to(OrganizerSG.donor_data_management)
-
-
-async def process_single_donor_add(block: str, donor_repository: DonorRepository, donor_num: int) -> dict:  # noqa: PLR0911 PLR0912
-    lines = [line.strip() for line in block.split("\n") if line.strip()]
-
-    parsed_data = {}
-    for line in lines:
-        if ":" in line:
-            key, value = line.split(":", 1)
-            key = key.strip().lower()
-            value = value.strip()
-
-            if key in ["фио", "ф.и.о."]:
-                parsed_data["full_name"] = value
-            elif key in ["телефон", "номер", "номер телефона"]:
-                parsed_data["phone"] = value
-            elif key in ["тип", "тип донора"]:
-                parsed_data["donor_type"] = value
-            elif key in ["группа", "студенческая группа"]:
-                parsed_data["student_group"] = value
-
-    if "full_name" not in parsed_data:
-        return {"success": False, "message": f"Донор {donor_num}: Не указано ФИО"}
-
-    if "phone" not in parsed_data:
-        return {"success": False, "message": f"Донор {donor_num}: Не указан номер телефона"}
-
-    if "donor_type" not in parsed_data:
-        return {"success": False, "message": f"Донор {donor_num}: Не указан тип донора"}
-
-    full_name_validation = validate_full_name(parsed_data["full_name"])
-    if not full_name_validation.is_valid:
-        return {"success": False, "message": f"Донор {donor_num}: {full_name_validation.error_message}"}
-
-    phone_validation = validate_phone(parsed_data["phone"])
-    if not phone_validation.is_valid:
-        return {"success": False, "message": f"Донор {donor_num}: {phone_validation.error_message}"}
-
-    donor_type_map = {"студент": DonorType.STUDENT, "сотрудник": DonorType.EMPLOYEE, "внешний": DonorType.EXTERNAL}
-
-    donor_type = donor_type_map.get(parsed_data["donor_type"].lower())
-    if not donor_type:
-        return {
-            "success": False,
-            "message": f"Донор {donor_num}: Неверный тип донора. Допустимые значения: студент, сотрудник, внешний",
-        }
-
-    student_group = None
-    if donor_type == DonorType.STUDENT:
-        if "student_group" not in parsed_data:
-            return {"success": False, "message": f"Донор {donor_num}: Для студентов обязательно указание группы"}
-        student_group = parsed_data["student_group"]
-
-    normalized_full_name = normalize_full_name(parsed_data["full_name"])
-    normalized_phone = normalize_phone(parsed_data["phone"])
-
-    existing_donor = await donor_repository.get_by_phone_number(normalized_phone)
-    if existing_donor:
-        return {
-            "success": False,
-            "message": f"Донор {donor_num}: Донор с номером телефона {normalized_phone} уже существует в базе данных",
-        }
-
-    new_donor = Donor(
-        phone_number=normalized_phone,
-        full_name=normalized_full_name,
-        donor_type=donor_type,
-        student_group=student_group,
-        is_bone_marrow_donor=False,
-    )
-    new_donor = await donor_repository.create(new_donor)
-
-    if new_donor:
-        return {
-            "success": True,
-            "message": f"Донор {donor_num}: {normalized_full_name} ({normalized_phone}) успешно добавлен",
-        }
-    return {"success": False, "message": f"Донор {donor_num}: Ошибка при добавлении в базу данных"}
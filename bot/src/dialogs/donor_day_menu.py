@@ -26,7 +26,10 @@ async def go_to_donor_day_registration(
         await callback.answer("Ошибка: не удалось получить данные пользователя")
         return
 
-    donor = await donor_repository.get_by_phone_number(phone)
+    donor_identity = dialog_manager.middleware_data.get("donor_identity")
+    donor = await donor_identity.get(phone) if donor_identity else None
+    if not donor:
+        donor = await donor_repository.get_by_phone_number(phone)
     if not donor:
         await callback.answer("Ошибка: пользователь не найден")
         return
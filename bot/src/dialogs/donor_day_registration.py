@@ -17,39 +17,28 @@ from src.repositories.donor_day import DonorDayRepository
 async def get_donor_days_data(
     dialog_manager: DialogManager,
     donor_day_repository: FromDishka[DonorDayRepository],
-    donation_repository: FromDishka[DonationRepository],
     **kwargs: Any,
 ) -> dict[str, Any]:
-    donor_days = await donor_day_repository.get_all_upcoming()
-
-    if not donor_days:
-        return {
-            "donor_days": [],
-            "message": "К сожалению, ближайших Дней донора не запланировано.",
-        }
-
     donor_id = None
     if dialog_manager.start_data and isinstance(dialog_manager.start_data, dict):
         donor_id = dialog_manager.start_data.get("donor_id")
 
-    available_donor_days = []
-    for donor_day in donor_days:
-        if donor_id:
-            existing_registration = await donation_repository.get_donor_registration(donor_id, donor_day.id)
-            if not existing_registration:
-                available_donor_days.append(donor_day)
-        else:
-            available_donor_days.append(donor_day)
+    available_donor_days = await donor_day_repository.get_upcoming_available_for_donor(donor_id)
 
     if not available_donor_days:
+        # Различаем "ничего не запланировано" и "донор уже записан на все дни" только в этом редком случае
+        if donor_id and await donor_day_repository.get_all_upcoming():
+            message = "Вы уже зарегистрированы на все доступные Дни донора."
+        else:
+            message = "К сожалению, ближайших Дней донора не запланировано."
         return {
             "donor_days": [],
-            "message": "Вы уже зарегистрированы на все доступные Дни донора.",
+            "message": message,
         }
 
     donor_days_list = [
-        (donor_day.id, f"📅 {donor_day.event_datetime.strftime('%d.%m.%Y %H:%M')}")
-        for donor_day in available_donor_days
+        (donor_day.id, f"📅 {donor_day.event_datetime.strftime('%d.%m.%Y %H:%M')} · 👥 {registrations_count}")
+        for donor_day, registrations_count in available_donor_days
     ]
 
     return {
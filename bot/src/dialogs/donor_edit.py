@@ -7,15 +7,17 @@ from aiogram_dialog.widgets.kbd import Button, Select
 from dishka import FromDishka
 from dishka.integrations.aiogram_dialog import inject
 
-from src.dialogs.states import OrganizerSG
-from src.dialogs.validators import (
+from src.core.validators import (
     normalize_full_name,
     normalize_phone,
     validate_full_name,
     validate_phone,
 )
+from src.dialogs.pagination import get_page_request, remember_page
+from src.dialogs.states import OrganizerSG
 from src.enums.donor_type import DonorType
 from src.repositories.donor import DonorRepository
+from src.repositories.pagination import encode_cursor
 
 
 async def edit_donor_data_handler(
@@ -50,24 +52,42 @@ async def donor_search_input_handler(
         else:
             await message.answer("Донор с таким номером телефона не найден среди зарегистрированных пользователей.")
     else:
-        donors = await donor_repository.get_registered_donors_by_full_name(search_query)
+        # Результаты поиска выбираются из БД постранично в окне выбора, здесь нужна только первая страница
+        page = await donor_repository.get_registered_donors_page(search_query)
 
-        if not donors:
+        if not page.rows:
             await message.answer("Доноры с таким ФИО не найдены среди зарегистрированных пользователей.")
-        elif len(donors) == 1:
-            dialog_manager.dialog_data["selected_donor_id"] = donors[0].id
+        elif len(page.rows) == 1:
+            dialog_manager.dialog_data["selected_donor_id"] = page.rows[0].id
             await dialog_manager.switch_to(OrganizerSG.donor_edit_template)
         else:
-            dialog_manager.dialog_data["found_donors"] = [
-                (donor.id, f"{donor.full_name} ({donor.phone_number})") for donor in donors
-            ]
+            dialog_manager.dialog_data["donor_search_query"] = search_query
             await dialog_manager.switch_to(OrganizerSG.donor_selection)
 
 
 @inject
-async def get_donor_selection_data(dialog_manager: DialogManager, **kwargs: Any) -> dict[str, Any]:
-    found_donors = dialog_manager.dialog_data.get("found_donors", [])
-    return {"donors": found_donors, "has_donors": len(found_donors) > 0}
+async def get_donor_selection_data(
+    dialog_manager: DialogManager, donor_repository: FromDishka[DonorRepository], **kwargs: Any
+) -> dict[str, Any]:
+    search_query = dialog_manager.dialog_data.get("donor_search_query")
+    if not search_query:
+        return {"donors": [], "has_donors": False, "show_pagination": False}
+
+    cursor, backward = get_page_request(dialog_manager, "donors", search_query)
+    page = await donor_repository.get_registered_donors_page(search_query, cursor, backward=backward)
+    if not page.rows:
+        return {"donors": [], "has_donors": False, "show_pagination": False}
+
+    pagination = remember_page(
+        dialog_manager,
+        "donors",
+        page,
+        encode_cursor(page.rows[0].full_name, page.rows[0].id),
+        encode_cursor(page.rows[-1].full_name, page.rows[-1].id),
+        await donor_repository.count_registered_by_full_name(search_query),
+    )
+    donors = [(donor.id, f"{donor.full_name} ({donor.phone_number})") for donor in page.rows]
+    return {"donors": donors, "has_donors": True, **pagination}
 
 
 @inject
@@ -203,14 +223,24 @@ async def donor_edit_input_handler(  # noqa: PLR0911 PLR0912 PLR0915
     normalized_full_name = normalize_full_name(parsed_data["full_name"])
     normalized_phone = normalize_phone(parsed_data["phone"])
 
-    updated_donor = await donor_repository.update_donor_data(
-        donor_id=donor_id,
-        full_name=normalized_full_name,
-        phone_number=normalized_phone,
-        donor_type=donor_type,
-        student_group=student_group,
-        is_bone_marrow_donor=is_bone_marrow_donor,
-    )
+    donor_with_phone = await donor_repository.get_by_phone_number(normalized_phone)
+    if donor_with_phone and donor_with_phone.id != donor_id:
+        await message.answer(f"❌ Донор с номером телефона {normalized_phone} уже существует.")
+        return
+
+    try:
+        updated_donor = await donor_repository.update_donor_data(
+            donor_id=donor_id,
+            full_name=normalized_full_name,
+            phone_number=normalized_phone,
+            donor_type=donor_type,
+            student_group=student_group,
+            is_bone_marrow_donor=is_bone_marrow_donor,
+        )
+    except ValueError as e:
+        # Номер успели занять между проверкой и обновлением
+        await message.answer(f"❌ {e}.")
+        return
 
     if updated_donor:
         await message.answer("✅ Данные донора успешно обновлены!")
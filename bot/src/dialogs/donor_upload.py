@@ -0,0 +1,138 @@
+from tempfile import TemporaryFile
+from typing import Any
+
+from aiogram.types import CallbackQuery, Message
+from aiogram_dialog import DialogManager
+from aiogram_dialog.widgets.input import MessageInput
+from aiogram_dialog.widgets.kbd import Button, Select
+from dishka import FromDishka
+from dishka.integrations.aiogram_dialog import inject
+
+from src.db.uow import SQLAlchemyUnitOfWork
+from src.dialogs.states import OrganizerSG
+from src.repositories.donation import DonationRepository
+from src.repositories.donor import DonorRepository
+from src.repositories.donor_day import DonorDayRepository
+from src.services.donor_import_service import (
+    FILE_READ_ERROR_MESSAGE,
+    FILE_READ_ERRORS,
+    SUPPORTED_FILE_EXTENSIONS,
+    DonorImportService,
+    format_truncated,
+)
+
+# Бот может скачать через Bot API файл размером не больше 20 МБ
+MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+
+
+async def upload_donors_handler(
+    callback: CallbackQuery,
+    button: Button,
+    dialog_manager: DialogManager,
+) -> None:
+    dialog_manager.dialog_data.pop("upload_donor_day_id", None)
+    await dialog_manager.switch_to(OrganizerSG.donor_upload_day_selection)
+
+
+async def upload_donor_day_selected(
+    callback: CallbackQuery,
+    widget: Select,
+    dialog_manager: DialogManager,
+    item_id: str,
+    **kwargs: Any,
+) -> None:
+    dialog_manager.dialog_data["upload_donor_day_id"] = int(item_id)
+    await dialog_manager.switch_to(OrganizerSG.donor_upload_file)
+
+
+async def upload_without_donor_day(
+    callback: CallbackQuery,
+    button: Button,
+    dialog_manager: DialogManager,
+) -> None:
+    dialog_manager.dialog_data.pop("upload_donor_day_id", None)
+    await dialog_manager.switch_to(OrganizerSG.donor_upload_file)
+
+
+@inject
+async def get_donor_upload_data(
+    dialog_manager: DialogManager,
+    donor_day_repository: FromDishka[DonorDayRepository],
+    **kwargs: Any,
+) -> dict[str, Any]:
+    donor_day_id = dialog_manager.dialog_data.get("upload_donor_day_id")
+    donor_day = await donor_day_repository.get_by_id(donor_day_id) if donor_day_id else None
+
+    if donor_day:
+        target_info = f"Доноры будут записаны на ДД {donor_day.event_datetime.strftime('%d.%m.%Y %H:%M')}."
+    else:
+        target_info = "Доноры будут только добавлены в базу, без записи на ДД."
+
+    return {"target_info": target_info}
+
+
+@inject
+async def donor_file_uploaded(
+    message: Message,
+    widget: MessageInput,
+    dialog_manager: DialogManager,
+    donor_repository: FromDishka[DonorRepository],
+    donation_repository: FromDishka[DonationRepository],
+    donor_day_repository: FromDishka[DonorDayRepository],
+    donor_import_service: FromDishka[DonorImportService],
+    unit_of_work: FromDishka[SQLAlchemyUnitOfWork],
+) -> None:
+    document = message.document
+    if not document:
+        await message.answer("Отправьте файл .xlsx или .csv документом.")
+        return
+
+    filename = document.file_name or ""
+    if not filename.lower().endswith(SUPPORTED_FILE_EXTENSIONS):
+        await message.answer("❌ Поддерживаются только файлы .xlsx и .csv.")
+        return
+
+    if document.file_size and document.file_size > MAX_UPLOAD_SIZE:
+        await message.answer("❌ Файл слишком большой: максимальный размер — 20 МБ.")
+        return
+
+    donor_day_id = dialog_manager.dialog_data.get("upload_donor_day_id")
+    donor_day = await donor_day_repository.get_by_id(donor_day_id) if donor_day_id else None
+    if donor_day_id and not donor_day:
+        await message.answer("❌ Выбранный день донора не найден.")
+        return
+
+    processing_msg = await message.answer("⏳ Импортирую доноров из файла...")
+
+    try:
+        # Файл скачивается во временный файл на диске, а не в память
+        with TemporaryFile() as file:
+            await message.bot.download(document, destination=file)
+            result = await donor_import_service.import_file(
+                file, filename, donor_repository, donation_repository, donor_day
+            )
+        # Импорт фиксируется до ответа, чтобы организатор не увидел успех при неудачном коммите
+        await unit_of_work.commit()
+    # UnicodeDecodeError — подкласс ValueError, поэтому ошибки чтения файла перехватываются первыми
+    except FILE_READ_ERRORS:
+        # Файл мог сломаться посреди чтения: уже записанные пачки не фиксируются
+        await unit_of_work.rollback()
+        await message.answer(f"❌ {FILE_READ_ERROR_MESSAGE}.")
+        return
+    except ValueError as e:
+        await unit_of_work.rollback()
+        await message.answer(f"❌ {e}")
+        return
+    finally:
+        await processing_msg.delete()
+
+    response_parts = [f"✅ Добавлено новых доноров: {result['added_count']}"]
+    if donor_day:
+        response_parts.append(f"📅 Записано на ДД: {result['registered_count']}")
+
+    if result["errors_count"]:
+        response_parts.append(f"\n❌ Ошибки ({result['errors_count']}), номер донора — строка файла:")
+        response_parts.extend(format_truncated(result["errors"], result["errors_count"]))
+
+    await message.answer("\n".join(response_parts))
+    await dialog_manager.switch_to(OrganizerSG.donor_data_management)
@@ -1,15 +1,22 @@
 from datetime import datetime
+from tempfile import TemporaryFile
 from typing import Any
+from uuid import uuid4
 from zoneinfo import ZoneInfo
 
-from aiogram.types import BufferedInputFile, CallbackQuery, Message
+from aiogram.enums import ContentType
+from aiogram.types import CallbackQuery, Message
 from aiogram_dialog import Dialog, DialogManager, Window
-from aiogram_dialog.widgets.input import ManagedTextInput, TextInput
-from aiogram_dialog.widgets.kbd import Button, Group, Row, ScrollingGroup, Select
+from aiogram_dialog.widgets.input import ManagedTextInput, MessageInput, TextInput
+from aiogram_dialog.widgets.kbd import Button, Column, Group, Row, ScrollingGroup, Select
 from aiogram_dialog.widgets.text import Const, Format
 from dishka import FromDishka
 from dishka.integrations.aiogram_dialog import inject
 
+from src.core.validators import (
+    validate_organizer_name,
+)
+from src.db.uow import SQLAlchemyUnitOfWork
 from src.dialogs.donor_add import (
     add_donors_handler,
     donor_add_input_handler,
@@ -26,10 +33,17 @@ from src.dialogs.donor_edit import (
     get_donor_selection_data,
     show_edit_help,
 )
-from src.dialogs.states import OrganizerSG
-from src.dialogs.validators import (
-    validate_organizer_name,
+from src.dialogs.donor_upload import (
+    MAX_UPLOAD_SIZE,
+    donor_file_uploaded,
+    get_donor_upload_data,
+    upload_donor_day_selected,
+    upload_donors_handler,
+    upload_without_donor_day,
 )
+from src.dialogs.pagination import get_page_request, pagination_row, remember_page
+from src.dialogs.states import OrganizerSG
+from src.enums.mailing_category import MailingCategory
 from src.models.donor_day import DonorDay
 from src.models.organizer import Organizer
 from src.repositories.content import ContentRepository
@@ -37,8 +51,19 @@ from src.repositories.donation import DonationRepository
 from src.repositories.donor import DonorRepository
 from src.repositories.donor_day import DonorDayRepository
 from src.repositories.organizer import OrganizerRepository
+from src.repositories.pagination import encode_cursor
+from src.scheduling.tasks import send_donor_day_cancelled_task, send_mailing_task
+from src.services.attendance_service import AttendanceService
+from src.services.broadcast_progress_service import BroadcastProgressService
+from src.services.broadcast_service import Recipient
+from src.services.donor_import_service import (
+    FILE_READ_ERROR_MESSAGE,
+    FILE_READ_ERRORS,
+    SUPPORTED_FILE_EXTENSIONS,
+    format_truncated,
+)
 from src.services.excel_generation_service import ExcelGenerationService
-from src.services.notification_service import NotificationService
+from src.services.report_delivery_service import ReportDeliveryService
 
 
 @inject
@@ -213,7 +238,8 @@ async def confirm_cancel_donor_day(
     button: Button,
     dialog_manager: DialogManager,
     donor_day_repository: FromDishka[DonorDayRepository],
-    donation_repository: FromDishka[DonationRepository],
+    progress_service: FromDishka[BroadcastProgressService],
+    unit_of_work: FromDishka[SQLAlchemyUnitOfWork],
 ) -> None:
     donor_day_id = dialog_manager.dialog_data.get("selected_donor_day_id")
 
@@ -221,44 +247,38 @@ async def confirm_cancel_donor_day(
         await callback.answer("Ошибка: не удалось получить данные дня донора")
         return
 
-    donor_day = await donor_day_repository.get_by_id(donor_day_id)
-    if not donor_day:
+    # Участники для уведомления возвращаются тем же запросом, которым удаляется ДД
+    deleted_rows = await donor_day_repository.delete_donor_day(donor_day_id)
+    if not deleted_rows:
         await callback.answer("❌ Ошибка: день донора не найден")
         return
 
-    donations_with_donors = await donation_repository.get_donations_with_donors_by_donor_day(donor_day_id)
-
-    success = await donor_day_repository.delete_donor_day(donor_day_id)
-
-    if success:
-        if donations_with_donors:
-            bot = dialog_manager.middleware_data.get("bot")
-            if bot:
-                notification_service = NotificationService(bot)
-
-                notifications_data = []
-                donor_day_date = donor_day.event_datetime.strftime("%d.%m.%Y %H:%M")
-
-                for _donation, donor in donations_with_donors:
-                    if donor.telegram_id:
-                        notifications_data.append((donor.telegram_id, donor.full_name, donor_day_date, donor_day_id))
-
-                if notifications_data:
-                    stats = await notification_service.send_donor_day_cancelled_bulk(notifications_data)
-                    await callback.answer(
-                        f"✅ День донора отменен! Уведомления отправлены: {stats['success']} успешно, "
-                        f"{stats['failed']} неудачно"
-                    )
-                else:
-                    await callback.answer(
-                        "✅ День донора отменен! Нет зарегистрированных пользователей для уведомления"
-                    )
-            else:
-                await callback.answer("✅ День донора отменен! (Ошибка отправки уведомлений)")
-        else:
-            await callback.answer("✅ День донора отменен! Нет зарегистрированных пользователей")
+    recipients = [Recipient(row.telegram_id, row.full_name) for row in deleted_rows if row.telegram_id]
+
+    # Рассылка регистрируется до коммита: если бот упадет после него, ее подхватит перезапуск зависших рассылок
+    job_id = uuid4().hex
+    if recipients:
+        await progress_service.create(
+            job_id,
+            kind="donor_day_cancelled",
+            recipients=recipients,
+            donor_day_id=donor_day_id,
+            donor_day_date=deleted_rows[0].event_datetime.strftime("%d.%m.%Y %H:%M"),
+        )
+
+    try:
+        # Задача проверяет, что ДД уже удален, поэтому удаление фиксируется до ее запуска
+        await unit_of_work.commit()
+    except Exception:
+        if recipients:
+            await progress_service.discard(job_id)
+        raise
+
+    if recipients:
+        await send_donor_day_cancelled_task.kiq(job_id)
+        await callback.answer(f"✅ День донора отменен! Уведомления отправляются {len(recipients)} участникам")
     else:
-        await callback.answer("❌ Ошибка при отмене дня донора")
+        await callback.answer("✅ День донора отменен! Нет зарегистрированных пользователей для уведомления")
 
     dialog_manager.dialog_data.pop("selected_donor_day_id", None)
     dialog_manager.dialog_data.pop("donor_day_info", None)
@@ -334,19 +354,29 @@ async def get_organizer_donor_days_data(
     organizer_id = dialog_manager.dialog_data.get("selected_organizer_id")
 
     if not organizer_id:
-        return {"donor_days": [], "has_donor_days": False, "use_scroll": False}
+        return {"donor_days": [], "has_donor_days": False, "show_pagination": False}
+
+    cursor, backward = get_page_request(dialog_manager, "donor_days", organizer_id)
+    page = await donor_day_repository.get_organizer_page(organizer_id, cursor, backward=backward)
 
-    donor_days = await donor_day_repository.get_by_organizer_id(organizer_id)
+    if not page.rows:
+        return {"donor_days": [], "has_donor_days": False, "show_pagination": False}
 
-    if not donor_days:
-        return {"donor_days": [], "has_donor_days": False, "use_scroll": False}
+    pagination = remember_page(
+        dialog_manager,
+        "donor_days",
+        page,
+        encode_cursor(page.rows[0].event_datetime, page.rows[0].id),
+        encode_cursor(page.rows[-1].event_datetime, page.rows[-1].id),
+        await donor_day_repository.count_by_organizer_id(organizer_id),
+    )
     donor_days_list = []
 
-    for i, donor_day in enumerate(donor_days, 1):
-        event_date = donor_day.event_datetime.strftime("%d.%m.%Y %H:%M")
+    moscow_tz = ZoneInfo("Europe/Moscow")
+    now_moscow = datetime.now(moscow_tz)
 
-        moscow_tz = ZoneInfo("Europe/Moscow")
-        now_moscow = datetime.now(moscow_tz)
+    for i, donor_day in enumerate(page.rows, pagination["page_offset"] + 1):
+        event_date = donor_day.event_datetime.strftime("%d.%m.%Y %H:%M")
 
         if donor_day.event_datetime.tzinfo is None:
             event_moscow = donor_day.event_datetime.replace(tzinfo=moscow_tz)
@@ -361,8 +391,8 @@ async def get_organizer_donor_days_data(
 
     return {
         "donor_days": donor_days_list,
-        "has_donor_days": len(donor_days_list) > 0,
-        "use_scroll": len(donor_days_list) > 10,
+        "has_donor_days": True,
+        **pagination,
     }
 
 
@@ -419,9 +449,8 @@ async def send_mailing_confirmed(
     callback: CallbackQuery,
     button: Button,
     dialog_manager: DialogManager,
-    donor_repository: FromDishka[DonorRepository],
     organizer_repository: FromDishka[OrganizerRepository],
-    notification_service: FromDishka[NotificationService],
+    progress_service: FromDishka[BroadcastProgressService],
 ) -> None:
     organizer_id = dialog_manager.dialog_data.get("selected_organizer_id")
     category = dialog_manager.dialog_data.get("selected_mailing_category")
@@ -436,19 +465,60 @@ async def send_mailing_confirmed(
         await callback.answer("Ошибка: организатор не найден")
         return
 
-    result = await notification_service.send_mailing_to_category(
+    # Рассылка выполняется воркером taskiq, диалог только опрашивает прогресс
+    job_id = uuid4().hex
+    await progress_service.create(
+        job_id,
+        kind="mailing",
         category=category,
         message_text=message_text,
         organizer_id=organizer_id,
         organizer_name=organizer.name,
-        donor_repository=donor_repository,
     )
+    await send_mailing_task.kiq(job_id)
 
-    success_count = result["success"]
-    failed_count = result["failed"]
+    dialog_manager.dialog_data["mailing_job_id"] = job_id
+    await callback.answer("✅ Рассылка поставлена в очередь")
+    await dialog_manager.switch_to(OrganizerSG.mailing_progress)
 
-    await callback.answer(f"✅ Рассылка завершена!\nОтправлено: {success_count}\nОшибок: {failed_count}")
 
+@inject
+async def get_mailing_progress_data(
+    dialog_manager: DialogManager,
+    progress_service: FromDishka[BroadcastProgressService],
+    **kwargs: Any,
+) -> dict[str, Any]:
+    job_id = dialog_manager.dialog_data.get("mailing_job_id")
+    progress = await progress_service.get(job_id) if job_id else None
+
+    if not progress:
+        return {"progress_text": "Информация о рассылке недоступна"}
+
+    status_names = {
+        "queued": "⏳ В очереди",
+        "running": "📤 Отправляется",
+        "done": "✅ Завершена",
+        "error": "❌ Прервана из-за ошибки",
+    }
+
+    return {
+        "progress_text": (
+            f"Статус: {status_names.get(progress['status'], progress['status'])}\n\n"
+            f"Всего получателей: {progress['total']}\n"
+            f"Отправлено: {progress['success']}\n"
+            f"Ошибок: {progress['failed']}\n"
+            f"Заблокировали бота: {progress['blocked']}\n"
+            f"Осталось: {progress['remaining']}"
+        ),
+    }
+
+
+async def back_from_mailing_progress(
+    callback: CallbackQuery,
+    button: Button,
+    dialog_manager: DialogManager,
+) -> None:
+    dialog_manager.dialog_data.pop("mailing_job_id", None)
     await dialog_manager.switch_to(OrganizerSG.communication_management)
 
 
@@ -462,10 +532,10 @@ async def cancel_mailing(
 
 async def get_mailing_categories_data(dialog_manager: DialogManager, **kwargs: Any) -> dict[str, Any]:
     categories = [
-        ("upcoming_registered", "📅 Зарегистрированные на ближайшую дату ДД"),
-        ("not_registered", "❌ Не зарегистрированные на ближайшие даты ДД"),
-        ("registered_not_confirmed", "⏳ Зарегистрированные, но не подтвержденные"),
-        ("bone_marrow", "🦴 Доноры костного мозга (ДКМ)"),
+        (MailingCategory.UPCOMING_REGISTERED, "📅 Зарегистрированные на ближайшую дату ДД"),
+        (MailingCategory.NOT_REGISTERED, "❌ Не зарегистрированные на ближайшие даты ДД"),
+        (MailingCategory.REGISTERED_NOT_CONFIRMED, "⏳ Зарегистрированные, но не подтвержденные"),
+        (MailingCategory.BONE_MARROW, "🦴 Доноры костного мозга (ДКМ)"),
     ]
 
     return {
@@ -479,10 +549,10 @@ async def get_mailing_confirmation_data(dialog_manager: DialogManager, **kwargs:
     message_text = dialog_manager.dialog_data.get("mailing_message", "")
 
     category_names = {
-        "upcoming_registered": "Зарегистрированные на ближайшую дату ДД",
-        "not_registered": "Не зарегистрированные на ближайшие даты ДД",
-        "registered_not_confirmed": "Зарегистрированные, но не подтвержденные",
-        "bone_marrow": "Доноры костного мозга (ДКМ)",
+        MailingCategory.UPCOMING_REGISTERED: "Зарегистрированные на ближайшую дату ДД",
+        MailingCategory.NOT_REGISTERED: "Не зарегистрированные на ближайшие даты ДД",
+        MailingCategory.REGISTERED_NOT_CONFIRMED: "Зарегистрированные, но не подтвержденные",
+        MailingCategory.BONE_MARROW: "Доноры костного мозга (ДКМ)",
     }
 
     category_name = category_names.get(category, "Неизвестная категория")
@@ -508,6 +578,7 @@ async def excel_generation_handler(
     button: Button,
     dialog_manager: DialogManager,
     excel_service: FromDishka[ExcelGenerationService],
+    report_delivery_service: FromDishka[ReportDeliveryService],
     donation_repository: FromDishka[DonationRepository],
     **kwargs: Any,
 ) -> None:
@@ -523,9 +594,15 @@ async def excel_generation_handler(
     processing_msg = await callback.message.answer("⏳ Генерирую Excel файл со статистикой...")
 
     try:
-        # Генерируем Excel файл асинхронно
-        result = await excel_service.generate_statistics_excel(
-            organizer_id=organizer_id, donation_repository=donation_repository
+        # Если данные организатора не менялись, отчет пересылается по file_id без повторной генерации
+        result = await report_delivery_service.send_organizer_report(
+            callback.message.chat.id,
+            organizer_id,
+            "statistics",
+            lambda: excel_service.generate_statistics_excel(
+                organizer_id=organizer_id, donation_repository=donation_repository
+            ),
+            lambda records_count: f"📊 Статистика донорских дней\n📋 Записей: {records_count}",
         )
 
         if not result["success"]:
@@ -535,16 +612,6 @@ async def excel_generation_handler(
                 "records_count": 0,
             }
         else:
-            # Отправляем файл пользователю
-            file_content = result["file_content"]
-            file_content.seek(0)  # Убеждаемся, что указатель в начале
-
-            input_file = BufferedInputFile(file=file_content.read(), filename=result["filename"])
-
-            await callback.message.answer_document(
-                document=input_file, caption=f"📊 Статистика донорских дней\n📋 Записей: {result['records_count']}"
-            )
-
             dialog_manager.dialog_data["excel_result"] = {
                 "success": True,
                 "records_count": result["records_count"],
@@ -570,6 +637,7 @@ async def donors_excel_generation_handler(
     button: Button,
     dialog_manager: DialogManager,
     excel_service: FromDishka[ExcelGenerationService],
+    report_delivery_service: FromDishka[ReportDeliveryService],
     donation_repository: FromDishka[DonationRepository],
     **kwargs: Any,
 ) -> None:
@@ -585,9 +653,15 @@ async def donors_excel_generation_handler(
     processing_msg = await callback.message.answer("⏳ Генерирую Excel файл со статистикой доноров...")
 
     try:
-        # Генерируем Excel файл асинхронно
-        result = await excel_service.generate_donors_excel(
-            organizer_id=organizer_id, donation_repository=donation_repository
+        # Если данные организатора не менялись, отчет пересылается по file_id без повторной генерации
+        result = await report_delivery_service.send_organizer_report(
+            callback.message.chat.id,
+            organizer_id,
+            "donors",
+            lambda: excel_service.generate_donors_excel(
+                organizer_id=organizer_id, donation_repository=donation_repository
+            ),
+            lambda records_count: f"📊 Статистика доноров\n📋 Записей: {records_count}",
         )
 
         if not result["success"]:
@@ -597,16 +671,6 @@ async def donors_excel_generation_handler(
                 "records_count": 0,
             }
         else:
-            # Отправляем файл пользователю
-            file_content = result["file_content"]
-            file_content.seek(0)  # Убеждаемся, что указатель в начале
-
-            input_file = BufferedInputFile(file=file_content.read(), filename=result["filename"])
-
-            await callback.message.answer_document(
-                document=input_file, caption=f"📊 Статистика доноров\n📋 Записей: {result['records_count']}"
-            )
-
             dialog_manager.dialog_data["donors_excel_result"] = {
                 "success": True,
                 "records_count": result["records_count"],
@@ -706,14 +770,26 @@ async def get_past_donor_days_data(
 ) -> dict[str, Any]:
     organizer_id = dialog_manager.dialog_data.get("selected_organizer_id")
     if not organizer_id:
-        return {"donor_days": []}
-
-    donor_days = await donor_day_repository.get_past_by_organizer_id(organizer_id)
+        return {"donor_days": [], "show_pagination": False}
+
+    cursor, backward = get_page_request(dialog_manager, "past_donor_days", organizer_id)
+    page = await donor_day_repository.get_past_organizer_page(organizer_id, cursor, backward=backward)
+    if not page.rows:
+        return {"donor_days": [], "show_pagination": False}
+
+    pagination = remember_page(
+        dialog_manager,
+        "past_donor_days",
+        page,
+        encode_cursor(page.rows[0].event_datetime, page.rows[0].id),
+        encode_cursor(page.rows[-1].event_datetime, page.rows[-1].id),
+        await donor_day_repository.count_past_by_organizer_id(organizer_id),
+    )
     donor_days_list = [
-        (donor_day.id, f"{donor_day.event_datetime.strftime('%d.%m.%Y %H:%M')}") for donor_day in donor_days
+        (donor_day.id, f"{donor_day.event_datetime.strftime('%d.%m.%Y %H:%M')}") for donor_day in page.rows
     ]
 
-    return {"donor_days": donor_days_list}
+    return {"donor_days": donor_days_list, **pagination}
 
 
 async def past_donor_day_selected(
@@ -736,17 +812,27 @@ async def get_participants_data(
 ) -> dict[str, Any]:
     donor_day_id = dialog_manager.dialog_data.get("selected_donor_day_id")
     if not donor_day_id:
-        return {"participants": [], "donor_day_info": ""}
+        return {"participants": [], "donor_day_info": "", "show_pagination": False}
 
     # Получаем информацию о донорском дне
     donor_day = await donor_day_repository.get_by_id(donor_day_id)
     donor_day_info = f"{donor_day.event_datetime.strftime('%d.%m.%Y %H:%M')}" if donor_day else ""
 
-    # Получаем участников
-    participants = await donation_repository.get_participants_by_donor_day(donor_day_id)
+    # Получаем только видимую страницу участников
+    cursor, backward = get_page_request(dialog_manager, "participants", donor_day_id)
+    page = await donation_repository.get_participants_page(donor_day_id, cursor, backward=backward)
+    statistics = await donation_repository.get_donor_day_statistics(donor_day_id)
+    pagination = remember_page(
+        dialog_manager,
+        "participants",
+        page,
+        encode_cursor(page.rows[0]["donor_name"], page.rows[0]["donation_id"]) if page.rows else None,
+        encode_cursor(page.rows[-1]["donor_name"], page.rows[-1]["donation_id"]) if page.rows else None,
+        statistics["total_registrations"],
+    )
 
     participants_list = []
-    for p in participants:
+    for p in page.rows:
         status_icons = []
         if p["is_confirmed"]:
             status_icons.append("✅")
@@ -760,6 +846,7 @@ async def get_participants_data(
     return {
         "participants": participants_list,
         "donor_day_info": donor_day_info,
+        **pagination,
     }
 
 
@@ -784,12 +871,7 @@ async def get_participant_status_data(
     if not donation_id:
         return {"participant_info": "", "is_confirmed": False, "is_bone_marrow_donor": False}
 
-    # Получаем информацию об участнике
-    participants = await donation_repository.get_participants_by_donor_day(
-        dialog_manager.dialog_data.get("selected_donor_day_id")
-    )
-
-    participant = next((p for p in participants if p["donation_id"] == donation_id), None)
+    participant = await donation_repository.get_participant(donation_id)
     if not participant:
         return {"participant_info": "", "is_confirmed": False, "is_bone_marrow_donor": False}
 
@@ -816,18 +898,11 @@ async def toggle_blood_donation_status(
     if not donation_id:
         return
 
-    # Получаем текущий статус
-    participants = await donation_repository.get_participants_by_donor_day(
-        dialog_manager.dialog_data.get("selected_donor_day_id")
-    )
-    participant = next((p for p in participants if p["donation_id"] == donation_id), None)
-    if not participant:
+    # Переключаем статус одним UPDATE, без повторного чтения участников
+    new_status = await donation_repository.toggle_donation_status(donation_id)
+    if new_status is None:
         return
 
-    # Переключаем статус
-    new_status = not participant["is_confirmed"]
-    await donation_repository.update_donation_status(donation_id, new_status)
-
     await callback.answer(f"Статус сдачи крови: {'✅ Сдал' if new_status else '❌ Не сдал'}")
 
 
@@ -844,11 +919,7 @@ async def toggle_bone_marrow_status(
     if not donation_id:
         return
 
-    # Получаем информацию об участнике
-    participants = await donation_repository.get_participants_by_donor_day(
-        dialog_manager.dialog_data.get("selected_donor_day_id")
-    )
-    participant = next((p for p in participants if p["donation_id"] == donation_id), None)
+    participant = await donation_repository.get_participant(donation_id)
     if not participant:
         return
 
@@ -897,6 +968,7 @@ async def create_participant_by_phone(
     dialog_manager: DialogManager,
     donor_repository: FromDishka[DonorRepository],
     donation_repository: FromDishka[DonationRepository],
+    unit_of_work: FromDishka[SQLAlchemyUnitOfWork],
     **kwargs: Any,
 ) -> None:
     phone = dialog_manager.dialog_data.get("new_participant_phone")
@@ -922,15 +994,16 @@ async def create_participant_by_phone(
 
         # Создаем регистрацию
         await donation_repository.create_donation(donor.id, donor_day_id)
+        await unit_of_work.commit()
+    except ValueError as e:
+        await callback.answer(f"❌ Ошибка: {e!s}")
+        return
 
-        await callback.answer(f"✅ Донор {donor.full_name} добавлен к участникам")
-
-        # Очищаем данные и возвращаемся к списку участников
-        dialog_manager.dialog_data.pop("new_participant_phone", None)
-        await dialog_manager.switch_to(OrganizerSG.donor_day_participants)
+    await callback.answer(f"✅ Донор {donor.full_name} добавлен к участникам")
 
-    except Exception as e:
-        await callback.answer(f"❌ Ошибка: {e!s}")
+    # Очищаем данные и возвращаемся к списку участников
+    dialog_manager.dialog_data.pop("new_participant_phone", None)
+    await dialog_manager.switch_to(OrganizerSG.donor_day_participants)
 
 
 async def cancel_add_participant(
@@ -942,6 +1015,91 @@ async def cancel_add_participant(
     await dialog_manager.switch_to(OrganizerSG.donor_day_participants)
 
 
+async def go_to_bulk_attendance(
+    callback: CallbackQuery,
+    button: Button,
+    dialog_manager: DialogManager,
+) -> None:
+    await dialog_manager.switch_to(OrganizerSG.bulk_attendance_input)
+
+
+async def send_attendance_summary(message: Message, summary: dict[str, Any]) -> None:
+    response_parts = [f"✅ Подтверждено донаций: {summary['confirmed_count']}"]
+
+    for key, title in (("unmatched", "❓ Не найдены среди участников"), ("invalid", "⚠️ Некорректные номера")):
+        if summary[f"{key}_count"]:
+            response_parts.append(f"\n{title} ({summary[f'{key}_count']}):")
+            response_parts.extend(format_truncated(summary[key], summary[f"{key}_count"]))
+
+    await message.answer("\n".join(response_parts))
+
+
+@inject
+async def bulk_attendance_text_handler(
+    message: Message,
+    widget: ManagedTextInput,
+    dialog_manager: DialogManager,
+    data: str,
+    donation_repository: FromDishka[DonationRepository],
+    attendance_service: FromDishka[AttendanceService],
+    unit_of_work: FromDishka[SQLAlchemyUnitOfWork],
+) -> None:
+    donor_day_id = dialog_manager.dialog_data.get("selected_donor_day_id")
+    if not donor_day_id:
+        await message.answer("❌ Ошибка: день донора не выбран")
+        return
+
+    summary = await attendance_service.confirm_from_text(data, donor_day_id, donation_repository)
+    # Отметки фиксируются до ответа, чтобы организатор не увидел успех при неудачном коммите
+    await unit_of_work.commit()
+    await send_attendance_summary(message, summary)
+    await dialog_manager.switch_to(OrganizerSG.donor_day_participants)
+
+
+@inject
+async def bulk_attendance_file_handler(
+    message: Message,
+    widget: MessageInput,
+    dialog_manager: DialogManager,
+    donation_repository: FromDishka[DonationRepository],
+    attendance_service: FromDishka[AttendanceService],
+    unit_of_work: FromDishka[SQLAlchemyUnitOfWork],
+) -> None:
+    donor_day_id = dialog_manager.dialog_data.get("selected_donor_day_id")
+    document = message.document
+    if not donor_day_id or not document:
+        await message.answer("❌ Ошибка: день донора не выбран")
+        return
+
+    filename = document.file_name or ""
+    if not filename.lower().endswith(SUPPORTED_FILE_EXTENSIONS):
+        await message.answer("❌ Поддерживаются только файлы .xlsx и .csv.")
+        return
+
+    if document.file_size and document.file_size > MAX_UPLOAD_SIZE:
+        await message.answer("❌ Файл слишком большой: максимальный размер — 20 МБ.")
+        return
+
+    try:
+        with TemporaryFile() as file:
+            await message.bot.download(document, destination=file)
+            summary = await attendance_service.confirm_from_file(file, filename, donor_day_id, donation_repository)
+    # UnicodeDecodeError — подкласс ValueError, поэтому ошибки чтения файла перехватываются первыми
+    except FILE_READ_ERRORS:
+        # Файл мог сломаться посреди чтения: уже сделанные отметки не фиксируются
+        await unit_of_work.rollback()
+        await message.answer(f"❌ {FILE_READ_ERROR_MESSAGE}.")
+        return
+    except ValueError as e:
+        await unit_of_work.rollback()
+        await message.answer(f"❌ {e}")
+        return
+
+    await unit_of_work.commit()
+    await send_attendance_summary(message, summary)
+    await dialog_manager.switch_to(OrganizerSG.donor_day_participants)
+
+
 # Обработчики для управления контентом
 @inject
 async def get_content_list_data(
@@ -1253,7 +1411,7 @@ organizer_dialog = Dialog(
     ),
     Window(
         Const("🩸 Дни донора организатора"),
-        ScrollingGroup(
+        Column(
             Select(
                 Format("{item[1]}"),
                 items="donor_days",
@@ -1261,11 +1419,9 @@ organizer_dialog = Dialog(
                 id="donor_day_select_scroll",
                 on_click=cancel_donor_day_selected,
             ),
-            id="donor_days_scroll",
-            width=1,
-            height=5,
             when="has_donor_days",
         ),
+        pagination_row("donor_days"),
         Const("У вас пока нет созданных дней донора.", when="!has_donor_days"),
         Group(
             Row(
@@ -1316,6 +1472,13 @@ organizer_dialog = Dialog(
                     on_click=add_donors_handler,
                 ),
             ),
+            Row(
+                Button(
+                    Const("📄 Загрузить из файла"),
+                    id="upload_donors",
+                    on_click=upload_donors_handler,
+                ),
+            ),
         ),
         Button(
             Const("🔙 Назад в меню"),
@@ -1364,7 +1527,7 @@ organizer_dialog = Dialog(
     ),
     Window(
         Const("👥 Выберите донора\n\nНайдено несколько доноров с похожими данными:"),
-        ScrollingGroup(
+        Column(
             Select(
                 Format("{item[1]}"),
                 items="donors",
@@ -1372,11 +1535,9 @@ organizer_dialog = Dialog(
                 id="donor_select",
                 on_click=donor_selected,
             ),
-            id="donors_scroll",
-            width=1,
-            height=5,
             when="has_donors",
         ),
+        pagination_row("donors"),
         Const("Доноры не найдены.", when="!has_donors"),
         Button(
             Const("🔙 Назад к поиску"),
@@ -1512,6 +1673,58 @@ organizer_dialog = Dialog(
         ),
         state=OrganizerSG.donor_add_input,
     ),
+    Window(
+        Const(
+            "📄 Загрузка доноров из файла\n\n"
+            "Выберите день донора, на который записать доноров из файла, "
+            "или загрузите их без записи:"
+        ),
+        Column(
+            Select(
+                Format("{item[1]}"),
+                items="donor_days",
+                item_id_getter=lambda item: str(item[0]),
+                id="upload_donor_day_select",
+                on_click=upload_donor_day_selected,
+            ),
+            when="has_donor_days",
+        ),
+        pagination_row("donor_days"),
+        Group(
+            Row(
+                Button(
+                    Const("➡️ Без записи на ДД"),
+                    id="upload_without_donor_day",
+                    on_click=upload_without_donor_day,
+                ),
+            ),
+            Row(
+                Button(
+                    Const("🔙 Назад к управлению"),
+                    id="back_to_management_from_upload",
+                    on_click=back_to_donor_data_management,
+                ),
+            ),
+        ),
+        state=OrganizerSG.donor_upload_day_selection,
+        getter=get_organizer_donor_days_data,
+    ),
+    Window(
+        Const(
+            "📄 Отправьте файл .xlsx или .csv со списком доноров.\n\n"
+            "Первая строка — заголовки столбцов: ФИО, Телефон, Тип, Группа.\n"
+            "Тип: студент, сотрудник или внешний; группа обязательна для студентов."
+        ),
+        Format("\n{target_info}"),
+        MessageInput(donor_file_uploaded, content_types=[ContentType.DOCUMENT]),
+        Button(
+            Const("🔙 Назад"),
+            id="back_to_upload_day_selection",
+            on_click=lambda c, b, dm: dm.switch_to(OrganizerSG.donor_upload_day_selection),
+        ),
+        state=OrganizerSG.donor_upload_file,
+        getter=get_donor_upload_data,
+    ),
     Window(
         Const(
             "❓ Помощь по добавлению доноров\n\n"
@@ -1663,6 +1876,26 @@ organizer_dialog = Dialog(
         state=OrganizerSG.mailing_confirmation,
         getter=get_mailing_confirmation_data,
     ),
+    Window(
+        Format("📤 Прогресс рассылки\n\n{progress_text}"),
+        Group(
+            Row(
+                Button(
+                    Const("🔄 Обновить"),
+                    id="refresh_mailing_progress",
+                ),
+            ),
+            Row(
+                Button(
+                    Const("🔙 К рассылкам"),
+                    id="back_to_communication_from_progress",
+                    on_click=back_from_mailing_progress,
+                ),
+            ),
+        ),
+        state=OrganizerSG.mailing_progress,
+        getter=get_mailing_progress_data,
+    ),
     Window(
         Const("⏳ Генерация Excel файла...\n\nПожалуйста, подождите."),
         state=OrganizerSG.excel_generation_processing,
@@ -1702,7 +1935,7 @@ organizer_dialog = Dialog(
     # Окна для редактирования прошедших ДД
     Window(
         Const("✏️ Редактирование прошедших донорских дней\n\nВыберите донорский день для редактирования:"),
-        ScrollingGroup(
+        Column(
             Select(
                 Format("{item[1]}"),
                 items="donor_days",
@@ -1710,10 +1943,8 @@ organizer_dialog = Dialog(
                 id="past_donor_day_select",
                 on_click=past_donor_day_selected,
             ),
-            id="past_donor_days_scroll",
-            width=1,
-            height=5,
         ),
+        pagination_row("past_donor_days"),
         Group(
             Row(
                 Button(
@@ -1728,7 +1959,7 @@ organizer_dialog = Dialog(
     ),
     Window(
         Format("👥 Участники донорского дня\n\n📅 {donor_day_info}\n\nСписок участников:"),
-        ScrollingGroup(
+        Column(
             Select(
                 Format("{item[1]}"),
                 items="participants",
@@ -1736,10 +1967,8 @@ organizer_dialog = Dialog(
                 id="participant_select",
                 on_click=participant_selected,
             ),
-            id="participants_scroll",
-            width=1,
-            height=5,
         ),
+        pagination_row("participants"),
         Group(
             Row(
                 Button(
@@ -1748,6 +1977,13 @@ organizer_dialog = Dialog(
                     on_click=go_to_add_participant,
                 ),
             ),
+            Row(
+                Button(
+                    Const("📋 Отметить явку списком"),
+                    id="bulk_attendance_btn",
+                    on_click=go_to_bulk_attendance,
+                ),
+            ),
             Row(
                 Button(
                     Const("🔙 К списку ДД"),
@@ -1776,6 +2012,25 @@ organizer_dialog = Dialog(
         ),
         state=OrganizerSG.participant_phone_input,
     ),
+    Window(
+        Const(
+            "📋 Отметка явки списком\n\n"
+            "Отправьте номера телефонов сдавших кровь — каждый с новой строки или через запятую, "
+            "либо файл .xlsx/.csv со столбцом «Телефон».\n\n"
+            "Донации найденных участников будут подтверждены."
+        ),
+        TextInput(
+            id="bulk_attendance_input",
+            on_success=bulk_attendance_text_handler,
+        ),
+        MessageInput(bulk_attendance_file_handler, content_types=[ContentType.DOCUMENT]),
+        Button(
+            Const("🔙 К участникам"),
+            id="back_to_participants_from_bulk",
+            on_click=lambda c, b, dm: dm.switch_to(OrganizerSG.donor_day_participants),
+        ),
+        state=OrganizerSG.bulk_attendance_input,
+    ),
     Window(
         Format("➕ Подтверждение добавления\n\nТелефон: {phone}\n\nДобавить участника?"),
         Group(
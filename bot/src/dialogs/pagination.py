@@ -0,0 +1,68 @@
+from math import ceil
+from typing import Any
+
+from aiogram.types import CallbackQuery
+from aiogram_dialog import DialogManager
+from aiogram_dialog.widgets.kbd import Button, Row
+from aiogram_dialog.widgets.text import Const, Format
+
+from src.repositories.pagination import COUNT_LIMIT, PAGE_SIZE, Page
+
+
+def _page_state(dialog_manager: DialogManager, list_id: str) -> dict[str, Any]:
+    return dialog_manager.dialog_data.setdefault(f"{list_id}_page", {})
+
+
+def get_page_request(dialog_manager: DialogManager, list_id: str, scope: Any) -> tuple[list[Any] | None, bool]:
+    """Курсор и направление запрошенной страницы; при смене содержимого списка (scope) — первая страница"""
+    state = _page_state(dialog_manager, list_id)
+    if state.get("scope") != scope:
+        state.clear()
+        state["scope"] = scope
+    return state.get("cursor"), state.get("backward", False)
+
+
+def remember_page(
+    dialog_manager: DialogManager,
+    list_id: str,
+    page: Page,
+    first_key: list[Any] | None,
+    last_key: list[Any] | None,
+    total_count: int,
+) -> dict[str, Any]:
+    """Запомнить границы показанной страницы для кнопок навигации и вернуть данные для окна"""
+    state = _page_state(dialog_manager, list_id)
+    state.update(first=first_key, last=last_key, has_prev=page.has_prev, has_next=page.has_next)
+    page_number = state.setdefault("number", 1)
+    pages_count = max(ceil(total_count / PAGE_SIZE), page_number)
+    return {
+        "page_number": page_number,
+        # Число строк считается только до COUNT_LIMIT, дальше количество страниц показывается как «N+»
+        "pages_count": f"{pages_count}+" if total_count >= COUNT_LIMIT else str(pages_count),
+        "page_offset": (page_number - 1) * PAGE_SIZE,
+        "has_prev_page": page.has_prev,
+        "has_next_page": page.has_next,
+        "show_pagination": page.has_prev or page.has_next,
+    }
+
+
+async def prev_page(callback: CallbackQuery, button: Button, dialog_manager: DialogManager) -> None:
+    state = _page_state(dialog_manager, button.widget_id.removesuffix("_prev_page"))
+    if state.get("has_prev"):
+        state.update(cursor=state.get("first"), backward=True, number=max(state.get("number", 1) - 1, 1))
+
+
+async def next_page(callback: CallbackQuery, button: Button, dialog_manager: DialogManager) -> None:
+    state = _page_state(dialog_manager, button.widget_id.removesuffix("_next_page"))
+    if state.get("has_next"):
+        state.update(cursor=state.get("last"), backward=False, number=state.get("number", 1) + 1)
+
+
+def pagination_row(list_id: str) -> Row:
+    """Кнопки перелистывания списка, постранично выбираемого из БД"""
+    return Row(
+        Button(Const("◀️"), id=f"{list_id}_prev_page", on_click=prev_page, when="has_prev_page"),
+        Button(Format("{page_number}/{pages_count}"), id=f"{list_id}_page_number"),
+        Button(Const("▶️"), id=f"{list_id}_next_page", on_click=next_page, when="has_next_page"),
+        when="show_pagination",
+    )
@@ -9,19 +9,17 @@ from dishka import FromDishka
 from dishka.integrations.aiogram_dialog import inject
 
 from src.dialogs.states import DonorDayMenuSG, ProfileSG
+from src.middlewares.donor_identity import DonorIdentityResolver
 from src.repositories.content import ContentRepository
 from src.repositories.donation import DonationRepository
 from src.repositories.donor import DonorRepository
 from src.repositories.donor_day import DonorDayRepository
-from src.repositories.organizer import OrganizerRepository
 
 
 @inject
 async def get_profile_data(
     dialog_manager: DialogManager,
     donor_repository: FromDishka[DonorRepository],
-    donation_repository: FromDishka[DonationRepository],
-    organizer_repository: FromDishka[OrganizerRepository],
     **kwargs: Any,
 ) -> dict[str, Any]:
     phone = None
@@ -41,9 +39,9 @@ async def get_profile_data(
             "bone_marrow_registry": "—",
         }
 
-    donor = await donor_repository.get_by_phone_number(phone)
+    summary = await donor_repository.get_profile_summary(phone)
 
-    if not donor:
+    if not summary:
         return {
             "full_name": "Пользователь не найден",
             "donations_count": 0,
@@ -52,24 +50,14 @@ async def get_profile_data(
             "bone_marrow_registry": "—",
         }
 
-    all_donations = await donation_repository.get_donor_registrations_with_details(donor.id)
-
-    confirmed_donations = [donation for donation, _ in all_donations if donation.is_confirmed]
-    donations_count = len(confirmed_donations)
-
+    donor, donations_count, last_donation_at, last_donation_center = summary
+    donations_count = donations_count or 0
     last_donation_date = "—"
-    last_donation_center = "—"
-
-    if confirmed_donations:
-        confirmed_with_dates = [(donation, donor_day) for donation, donor_day in all_donations if donation.is_confirmed]
-        confirmed_with_dates.sort(key=lambda x: x[1].event_datetime, reverse=True)
-
-        if confirmed_with_dates:
-            last_donation, last_donor_day = confirmed_with_dates[0]
-            last_donation_date = last_donor_day.event_datetime.strftime("%d.%m.%Y")
-
-            organizer = await organizer_repository.get_by_id(last_donation.organizer_id)
-            last_donation_center = organizer.name if organizer else "Неизвестный центр"
+    if last_donation_at:
+        last_donation_date = last_donation_at.strftime("%d.%m.%Y")
+        last_donation_center = last_donation_center or "Неизвестный центр"
+    else:
+        last_donation_center = "—"
 
     bone_marrow_registry = "Вступил" if donor.is_bone_marrow_donor else "Не вступил"
 
@@ -88,6 +76,7 @@ async def get_my_registrations_data(
     dialog_manager: DialogManager,
     donation_repository: FromDishka[DonationRepository],
     donor_repository: FromDishka[DonorRepository],
+    donor_identity: DonorIdentityResolver | None = None,
     **kwargs: Any,
 ) -> dict[str, Any]:
     phone = None
@@ -99,7 +88,9 @@ async def get_my_registrations_data(
     if not phone:
         return {"registrations": [], "has_registrations": False, "use_scroll": False}
 
-    donor = await donor_repository.get_by_phone_number(phone)
+    donor = await donor_identity.get(phone) if donor_identity else None
+    if not donor:
+        donor = await donor_repository.get_by_phone_number(phone)
 
     if not donor:
         return {"registrations": [], "has_registrations": False, "use_scroll": False}
@@ -253,7 +244,7 @@ async def get_donation_history_data(
     dialog_manager: DialogManager,
     donation_repository: FromDishka[DonationRepository],
     donor_repository: FromDishka[DonorRepository],
-    organizer_repository: FromDishka[OrganizerRepository],
+    donor_identity: DonorIdentityResolver | None = None,
     **kwargs: Any,
 ) -> dict[str, Any]:
     phone = None
@@ -265,7 +256,9 @@ async def get_donation_history_data(
     if not phone:
         return {"donations": [], "has_donations": False, "use_scroll": False}
 
-    donor = await donor_repository.get_by_phone_number(phone)
+    donor = await donor_identity.get(phone) if donor_identity else None
+    if not donor:
+        donor = await donor_repository.get_by_phone_number(phone)
 
     if not donor:
         return {"donations": [], "has_donations": False, "use_scroll": False}
@@ -276,12 +269,10 @@ async def get_donation_history_data(
         return {"donations": [], "has_donations": False, "use_scroll": False}
 
     donations_list = []
-    for i, (donation, donor_day) in enumerate(donor_donations, 1):
+    for i, (donation, donor_day, organizer_name) in enumerate(donor_donations, 1):
         date_str = donor_day.event_datetime.strftime("%d.%m.%Y")
         status = "✅ Подтверждена" if donation.is_confirmed else "⏳ Ожидает подтверждения"
-
-        organizer = await organizer_repository.get_by_id(donation.organizer_id)
-        center_name = organizer.name if organizer else "Неизвестный центр"
+        center_name = organizer_name or "Неизвестный центр"
 
         donations_list.append((donation.id, f"{i}. 📅 {date_str} - {center_name} - {status}"))
 
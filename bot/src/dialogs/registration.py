@@ -9,8 +9,8 @@ from aiogram_dialog.widgets.text import Const, Format
 from dishka import FromDishka
 from dishka.integrations.aiogram_dialog import inject
 
+from src.core.validators import normalize_phone, validate_full_name, validate_phone, validate_student_group
 from src.dialogs.states import OrganizerSG, ProfileSG, RegistrationSG
-from src.dialogs.validators import normalize_phone, validate_full_name, validate_phone, validate_student_group
 from src.enums.donor_type import DonorType
 from src.models.donor import Donor
 from src.repositories.donor import DonorRepository
@@ -32,11 +32,14 @@ class OrganizerSG(StatesGroup):
     donor_edit_help = State()
     donor_add_input = State()
     donor_add_help = State()
+    donor_upload_day_selection = State()
+    donor_upload_file = State()
     statistics_management = State()
     communication_management = State()
     mailing_category_selection = State()
     mailing_message_input = State()
     mailing_confirmation = State()
+    mailing_progress = State()
     excel_generation_processing = State()
     excel_generation_result = State()
 
@@ -50,6 +53,7 @@ class OrganizerSG(StatesGroup):
     participant_phone_input = State()
     participant_confirmation = State()
     edit_participant_status = State()
+    bulk_attendance_input = State()
 
     # Управление контентом (организатор) - дополнительные состояния
     content_list = State()
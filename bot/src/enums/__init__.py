@@ -1,3 +1,4 @@
 from src.enums.donor_type import DonorType
+from src.enums.mailing_category import MailingCategory
 
-__all__ = ["DonorType"]
+__all__ = ["DonorType", "MailingCategory"]
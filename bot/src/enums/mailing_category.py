@@ -0,0 +1,8 @@
+from enum import StrEnum, auto
+
+
+class MailingCategory(StrEnum):
+    UPCOMING_REGISTERED = auto()
+    NOT_REGISTERED = auto()
+    REGISTERED_NOT_CONFIRMED = auto()
+    BONE_MARROW = auto()
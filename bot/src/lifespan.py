@@ -4,18 +4,28 @@ from dishka.integrations.aiogram import setup_dishka
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncEngine
 
+from src.db.replica import ReplicaEngine
 from src.di.container import container
+from src.middlewares.donor_identity import DonorIdentityMiddleware
+from src.middlewares.recent_writes import RecentWritesMiddleware
+from src.scheduling.broker import broker
 from src.scheduling.source import redis_source
 
 
 async def on_startup() -> None:
     await redis_source.startup()
+    await broker.startup()
 
     redis: Redis = await container.get(Redis)
     await redis.ping()
 
     dp: Dispatcher = await container.get(Dispatcher)
     setup_dishka(container, dp, auto_inject=True)
+    # Внутренние middleware выполняются после ContainerMiddleware от dishka и видят контейнер запроса
+    dp.message.middleware(DonorIdentityMiddleware())
+    dp.callback_query.middleware(DonorIdentityMiddleware())
+    dp.message.middleware(RecentWritesMiddleware())
+    dp.callback_query.middleware(RecentWritesMiddleware())
     setup_dialogs(dp)
 
 
@@ -24,8 +34,14 @@ async def on_shutdown() -> None:
     await bot.delete_webhook()
     await bot.session.close()
 
+    await broker.shutdown()
+
     redis: Redis = await container.get(Redis)
     await redis.aclose()
 
     database_engine: AsyncEngine = await container.get(AsyncEngine)
     await database_engine.dispose()
+
+    replica_engine: ReplicaEngine | None = await container.get(ReplicaEngine | None)
+    if replica_engine:
+        await replica_engine.dispose()
@@ -7,6 +7,7 @@ from aiohttp.web_runner import TCPSite
 from dishka import AsyncContainer
 
 from src.core.config import Settings
+from src.core.metrics import metrics_handler
 from src.di.container import container
 from src.handlers import main_router
 from src.lifespan import on_shutdown, on_startup
@@ -35,6 +36,7 @@ async def setup_webhook(container: AsyncContainer) -> None:
     )
 
     webhook_requests_handler.register(app, path=settings.telegram_bot.webhook_path)
+    app.router.add_get("/metrics", metrics_handler)
     setup_application(app, dp, bot=bot)
 
     await runner.setup()
@@ -0,0 +1,10 @@
+from src.middlewares.dialog_error_handler import DialogErrorHandlerMiddleware
+from src.middlewares.donor_identity import DonorIdentityMiddleware, DonorIdentityResolver
+from src.middlewares.recent_writes import RecentWritesMiddleware
+
+__all__ = [
+    "DialogErrorHandlerMiddleware",
+    "DonorIdentityMiddleware",
+    "DonorIdentityResolver",
+    "RecentWritesMiddleware",
+]
@@ -0,0 +1,61 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, User
+from dishka import AsyncContainer
+from dishka.integrations.aiogram import CONTAINER_NAME
+
+from src.cache.donor_identity import DonorIdentity, DonorIdentityCache
+from src.repositories.donor import DonorRepository
+
+
+class DonorIdentityResolver:
+    """Ленивое определение текущего донора: не более одного обращения к кэшу и БД за апдейт"""
+
+    def __init__(self, telegram_id: int, container: AsyncContainer) -> None:
+        self.telegram_id = telegram_id
+        self.container = container
+        self._identity: DonorIdentity | None = None
+        self._resolved = False
+
+    async def get(self, phone_number: str | None = None) -> DonorIdentity | None:
+        """Получить текущего донора; если указан телефон, донор должен ему соответствовать"""
+        if not self._resolved:
+            self._identity = await self._resolve()
+            self._resolved = True
+
+        if self._identity and phone_number and self._identity.phone_number != phone_number:
+            return None
+        return self._identity
+
+    async def _resolve(self) -> DonorIdentity | None:
+        identity_cache = await self.container.get(DonorIdentityCache)
+        identity = await identity_cache.get(self.telegram_id)
+        if identity:
+            return identity
+
+        donor_repository = await self.container.get(DonorRepository)
+        donor = await donor_repository.get_by_telegram_id(self.telegram_id)
+        if not donor:
+            return None
+
+        identity = DonorIdentity.model_validate(donor)
+        await identity_cache.set(identity)
+        return identity
+
+
+class DonorIdentityMiddleware(BaseMiddleware):
+    """Middleware, передающая обработчикам и геттерам диалогов общий DonorIdentityResolver"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user: User | None = data.get("event_from_user")
+        container: AsyncContainer | None = data.get(CONTAINER_NAME)
+        if user and container:
+            data["donor_identity"] = DonorIdentityResolver(user.id, container)
+        return await handler(event, data)
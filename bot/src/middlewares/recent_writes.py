@@ -0,0 +1,28 @@
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, User
+from dishka.integrations.aiogram import CONTAINER_NAME
+
+from src.cache.recent_writes import RecentWritesTracker
+
+if TYPE_CHECKING:
+    from dishka import AsyncContainer
+
+
+class RecentWritesMiddleware(BaseMiddleware):
+    """Middleware, привязывающая учет недавних записей в БД к пользователю апдейта"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user: User | None = data.get("event_from_user")
+        container: AsyncContainer | None = data.get(CONTAINER_NAME)
+        if user and container:
+            recent_writes = await container.get(RecentWritesTracker)
+            recent_writes.user_id = user.id
+        return await handler(event, data)
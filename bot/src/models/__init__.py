@@ -3,6 +3,7 @@ from src.models.content import Content
 from src.models.donation import Donation
 from src.models.donor import Donor
 from src.models.donor_day import DonorDay
+from src.models.donor_day_stats import DonorDayStats
 from src.models.organizer import Organizer
 
-__all__ = ["Base", "Content", "Donation", "Donor", "DonorDay", "Organizer"]
+__all__ = ["Base", "Content", "Donation", "Donor", "DonorDay", "DonorDayStats", "Organizer"]
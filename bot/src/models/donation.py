@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import Boolean
 
@@ -7,6 +7,10 @@ from src.models.base import Base
 
 class Donation(Base):
     __tablename__ = "donations"
+    __table_args__ = (
+        Index("ix_donations_donor_id_donor_day_id", "donor_id", "donor_day_id"),
+        Index("ix_donations_donor_day_id", "donor_day_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     donor_id: Mapped[int] = mapped_column(ForeignKey("donors.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Enum
+from sqlalchemy import Boolean, Enum, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import String
 
@@ -8,6 +8,19 @@ from src.models.base import Base
 
 class Donor(Base):
     __tablename__ = "donors"
+    __table_args__ = (
+        # Уникальный индекс: номер телефона идентифицирует донора и служит ключом ON CONFLICT при импорте
+        Index("ix_donors_phone_number", "phone_number", unique=True),
+        # Частичный индекс: поиск по telegram_id и выборка получателей рассылок касаются только привязанных доноров
+        Index("ix_donors_telegram_id", "telegram_id", postgresql_where=text("telegram_id IS NOT NULL")),
+        # Триграммный индекс для поиска по подстроке ФИО (ilike '%...%')
+        Index(
+            "ix_donors_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     full_name: Mapped[str] = mapped_column(String(255), nullable=False)
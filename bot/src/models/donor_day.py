@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import DateTime
 
@@ -9,6 +9,7 @@ from src.models.base import Base
 
 class DonorDay(Base):
     __tablename__ = "donor_days"
+    __table_args__ = (Index("ix_donor_days_organizer_id_event_datetime", "organizer_id", "event_datetime"),)
 
     event_datetime: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     organizer_id: Mapped[int] = mapped_column(ForeignKey("organizers.id"), nullable=False)
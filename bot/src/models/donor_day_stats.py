@@ -0,0 +1,17 @@
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import Integer
+
+from src.models.base import Base
+
+
+class DonorDayStats(Base):
+    """Счетчики регистраций ДД; поддерживаются триггерами БД при изменении donations"""
+
+    __tablename__ = "donor_day_stats"
+
+    donor_day_id: Mapped[int] = mapped_column(
+        ForeignKey("donor_days.id", ondelete="CASCADE"), unique=True, nullable=False
+    )
+    total_registrations: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    confirmed_donations: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
@@ -19,8 +19,7 @@ class ContentRepository:
     async def create(self, content: Content) -> Content:
         """Создать новый контент"""
         self.session.add(content)
-        await self.session.commit()
-        await self.session.refresh(content)
+        await self.session.flush()
         return content
 
     async def get_by_id(self, content_id: int) -> Content | None:
@@ -41,8 +40,7 @@ class ContentRepository:
 
     async def update(self, content: Content) -> Content:
         """Обновить контент"""
-        await self.session.commit()
-        await self.session.refresh(content)
+        await self.session.flush()
         return content
 
     async def delete(self, content_id: int) -> bool:
@@ -50,6 +48,6 @@ class ContentRepository:
         content = await self.session.get(Content, content_id)
         if content:
             await self.session.delete(content)
-            await self.session.commit()
+            await self.session.flush()
             return True
         return False
@@ -1,30 +1,98 @@
 from __future__ import annotations
 
+from datetime import date, datetime, time, timedelta
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import Integer, func, select
+from sqlalchemy import String, any_, bindparam, delete, exists, false, func, insert, literal, select, true, update
+from sqlalchemy.dialects.postgresql import ARRAY
 
+from src.db.replica import ReplicaReadMixin
+from src.db.uow import run_after_commit
 from src.models.donation import Donation
 from src.models.donor import Donor
 from src.models.donor_day import DonorDay
+from src.models.donor_day_stats import DonorDayStats
+from src.models.organizer import Organizer
+from src.repositories.donor_day import DONOR_DAYS_CACHE_NAMESPACE
+from src.repositories.pagination import Page, fetch_keyset_page
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
-    from datetime import datetime
+    from collections.abc import AsyncIterator, Sequence
 
+    from sqlalchemy import Row, Select
     from sqlalchemy.ext.asyncio import AsyncSession
 
+    from src.cache.read_through import ReadThroughCache
+    from src.cache.report_cache import ReportCache
+    from src.db.replica import ReadReplicaRouter
 
-class DonationRepository:
-    def __init__(self, session: AsyncSession) -> None:
+# Размер пачки строк, выбираемой из серверного курсора при выгрузке отчетов
+EXPORT_BATCH_SIZE = 1000
+
+
+def _start_of_day(value: date | datetime) -> datetime:
+    """Начало суток (naive datetime, как event_datetime в БД) для даты или момента времени"""
+    return datetime.combine(value.date() if isinstance(value, datetime) else value, time.min)
+
+
+class DonationRepository(ReplicaReadMixin):
+    def __init__(
+        self,
+        session: AsyncSession,
+        report_cache: ReportCache | None = None,
+        read_router: ReadReplicaRouter | None = None,
+        cache: ReadThroughCache | None = None,
+    ) -> None:
         self.session = session
+        self.report_cache = report_cache
+        self.read_router = read_router
+        self.cache = cache
+
+    def _bump_report_version(self, organizer_id: int) -> None:
+        """Сбросить закэшированные отчеты организатора, когда изменения донаций будут зафиксированы"""
+        if self.report_cache:
+            run_after_commit(self.session, partial(self.report_cache.bump, organizer_id))
+
+    async def _registrations_changed(self, organizer_id: int) -> None:
+        """Сбросить отчеты организатора и кэш предстоящих ДД, в котором хранится число регистраций"""
+        self._bump_report_version(organizer_id)
+        if self.cache:
+            await self.cache.invalidate(DONOR_DAYS_CACHE_NAMESPACE)
+            run_after_commit(self.session, partial(self.cache.invalidate, DONOR_DAYS_CACHE_NAMESPACE))
 
     async def create(self, donation: Donation) -> Donation:
         self.session.add(donation)
-        await self.session.commit()
-        await self.session.refresh(donation)
+        await self.session.flush()
+        await self._registrations_changed(donation.organizer_id)
         return donation
 
+    async def bulk_register(self, donor_day_id: int, organizer_id: int, phone_numbers: Sequence[str]) -> int:
+        """Записать доноров с указанными номерами на ДД одним INSERT ... SELECT, пропуская уже записанных"""
+        if not phone_numbers:
+            return 0
+
+        donors = (
+            select(
+                Donor.id,
+                literal(donor_day_id),
+                literal(organizer_id),
+                false(),
+                func.now(),
+                func.now(),
+            )
+            .where(Donor.phone_number.in_(phone_numbers))
+            .where(~exists().where(Donation.donor_id == Donor.id, Donation.donor_day_id == donor_day_id))
+        )
+        result = await self.session.execute(
+            insert(Donation).from_select(
+                ["donor_id", "donor_day_id", "organizer_id", "is_confirmed", "created_at", "updated_at"], donors
+            )
+        )
+        if result.rowcount:
+            await self._registrations_changed(organizer_id)
+        return result.rowcount
+
     async def get_by_donor_id(self, donor_id: int) -> Sequence[Donation]:
         result = await self.session.scalars(select(Donation).where(Donation.donor_id == donor_id))
         return result.all()
@@ -38,22 +106,16 @@ class DonationRepository:
         )
         return [(row[0], row[1]) for row in result.all()]
 
-    async def get_donor_donations_with_details(self, donor_id: int) -> Sequence[tuple[Donation, DonorDay]]:
+    async def get_donor_donations_with_details(self, donor_id: int) -> Sequence[tuple[Donation, DonorDay, str | None]]:
+        """Получить историю донаций донора вместе с названием центра"""
         result = await self.session.execute(
-            select(Donation, DonorDay)
+            select(Donation, DonorDay, Organizer.name)
             .join(DonorDay, Donation.donor_day_id == DonorDay.id)
+            .outerjoin(Organizer, Donation.organizer_id == Organizer.id)
             .where(Donation.donor_id == donor_id)
             .order_by(DonorDay.event_datetime.desc())
         )
-        return [(row[0], row[1]) for row in result.all()]
-
-    async def get_donations_with_donors_by_donor_day(self, donor_day_id: int) -> Sequence[tuple[Donation, Donor]]:
-        result = await self.session.execute(
-            select(Donation, Donor)
-            .join(Donor, Donation.donor_id == Donor.id)
-            .where(Donation.donor_day_id == donor_day_id)
-        )
-        return [(row[0], row[1]) for row in result.all()]
+        return [(row[0], row[1], row[2]) for row in result.all()]
 
     async def get_by_donor_day_id(self, donor_day_id: int) -> Sequence[Donation]:
         result = await self.session.scalars(select(Donation).where(Donation.donor_day_id == donor_day_id))
@@ -66,12 +128,11 @@ class DonationRepository:
         return result.first()
 
     async def confirm_donation(self, donation_id: int) -> Donation | None:
-        result = await self.session.scalars(select(Donation).where(Donation.id == donation_id))
-        donation = result.first()
+        donation = await self.session.scalar(
+            update(Donation).where(Donation.id == donation_id).values(is_confirmed=True).returning(Donation)
+        )
         if donation:
-            donation.is_confirmed = True
-            await self.session.commit()
-            await self.session.refresh(donation)
+            self._bump_report_version(donation.organizer_id)
         return donation
 
     async def get_by_id(self, donation_id: int) -> Donation | None:
@@ -79,62 +140,47 @@ class DonationRepository:
         return result.first()
 
     async def delete_donation(self, donation_id: int) -> bool:
-        result = await self.session.scalars(select(Donation).where(Donation.id == donation_id))
-        donation = result.first()
-        if donation:
-            await self.session.delete(donation)
-            await self.session.commit()
-            return True
-        return False
+        organizer_id = await self.session.scalar(
+            delete(Donation).where(Donation.id == donation_id).returning(Donation.organizer_id)
+        )
+        if organizer_id is None:
+            return False
+        await self._registrations_changed(organizer_id)
+        return True
 
     async def get_donor_day_statistics(self, donor_day_id: int) -> dict[str, int]:
         """Получить статистику по конкретному донорскому дню"""
-        from sqlalchemy import func
-
-        # Общее количество регистраций
-        total_query = select(func.count(Donation.id)).where(Donation.donor_day_id == donor_day_id)
-        total_result = await self.session.scalar(total_query)
-        total_registrations = total_result or 0
-
-        # Количество подтвержденных донаций
-        confirmed_query = select(func.count(Donation.id)).where(
-            Donation.donor_day_id == donor_day_id, Donation.is_confirmed
-        )
-        confirmed_result = await self.session.scalar(confirmed_query)
-        confirmed_donations = confirmed_result or 0
+        stats = await self.session.scalar(select(DonorDayStats).where(DonorDayStats.donor_day_id == donor_day_id))
 
         return {
-            "total_registrations": total_registrations,
-            "confirmed_donations": confirmed_donations,
+            "total_registrations": stats.total_registrations if stats else 0,
+            "confirmed_donations": stats.confirmed_donations if stats else 0,
         }
 
     async def get_organizer_statistics_by_date_range(
-        self, organizer_id: int, start_date, end_date
+        self, organizer_id: int, start_date: date | datetime, end_date: date | datetime
     ) -> list[dict[str, Any]]:
         """Получить статистику организатора за период по всем донорским дням"""
-        from sqlalchemy import func
-
-        from src.models.donor_day import DonorDay
-
         query = (
             select(
                 DonorDay.id.label("donor_day_id"),
                 DonorDay.event_datetime.label("event_date"),
-                func.count(Donation.id).label("total_registrations"),
-                func.sum(func.cast(Donation.is_confirmed, Integer)).label("confirmed_donations"),
+                DonorDayStats.total_registrations,
+                DonorDayStats.confirmed_donations,
             )
             .select_from(DonorDay)
-            .outerjoin(Donation, DonorDay.id == Donation.donor_day_id)
+            .outerjoin(DonorDayStats, DonorDay.id == DonorDayStats.donor_day_id)
+            # Полуоткрытый диапазон по самой колонке позволяет использовать индекс (organizer_id, event_datetime)
             .where(
                 DonorDay.organizer_id == organizer_id,
-                func.date(DonorDay.event_datetime) >= start_date.date() if hasattr(start_date, "date") else start_date,
-                func.date(DonorDay.event_datetime) <= end_date.date() if hasattr(end_date, "date") else end_date,
+                DonorDay.event_datetime >= _start_of_day(start_date),
+                DonorDay.event_datetime < _start_of_day(end_date) + timedelta(days=1),
             )
-            .group_by(DonorDay.id, DonorDay.event_datetime)
             .order_by(DonorDay.event_datetime)
         )
 
-        result = await self.session.execute(query)
+        session = await self._read_session()
+        result = await session.execute(query)
         statistics = []
 
         for row in result:
@@ -149,34 +195,30 @@ class DonationRepository:
 
         return statistics
 
-    async def get_all_organizer_donor_days(self, organizer_id: int) -> list[dict[str, Any]]:
-        """Получить все донорские дни организатора"""
-        from sqlalchemy import func
-
-        from src.models.donor_day import DonorDay
-        from src.models.organizer import Organizer
-
+    async def stream_organizer_donor_days(
+        self, organizer_id: int, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Потоково получить все донорские дни организатора со статистикой пачками"""
         query = (
             select(
                 DonorDay.id.label("donor_day_id"),
                 DonorDay.event_datetime.label("event_date"),
                 Organizer.name.label("organizer_name"),
-                func.count(Donation.id).label("total_registrations"),
-                func.sum(func.cast(Donation.is_confirmed, Integer)).label("confirmed_donations"),
+                DonorDayStats.total_registrations,
+                DonorDayStats.confirmed_donations,
             )
             .select_from(DonorDay)
             .join(Organizer, DonorDay.organizer_id == Organizer.id)
-            .outerjoin(Donation, DonorDay.id == Donation.donor_day_id)
+            .outerjoin(DonorDayStats, DonorDay.id == DonorDayStats.donor_day_id)
             .where(DonorDay.organizer_id == organizer_id)
-            .group_by(DonorDay.id, DonorDay.event_datetime, Organizer.name)
             .order_by(DonorDay.event_datetime.desc())
         )
 
-        result = await self.session.execute(query)
-        statistics = []
-
-        for row in result:
-            statistics.append(
+        # Отчет кэшируется под текущей версией, поэтому читается из основной БД: отстающая реплика
+        # могла бы сохранить под новой версией данные, которые были до ее изменения
+        result = await self.session.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield [
                 {
                     "donor_day_id": row.donor_day_id,
                     "event_date": row.event_date,
@@ -184,26 +226,24 @@ class DonationRepository:
                     "total_registrations": row.total_registrations or 0,
                     "confirmed_donations": row.confirmed_donations or 0,
                 }
-            )
-
-        return statistics
+                for row in partition
+            ]
 
     async def find_donor_day_by_date_and_organizer(self, event_date: datetime, organizer_id: int) -> int | None:
         """Найти ID донорского дня по дате и организатору"""
-        from src.models.donor_day import DonorDay
-
+        day_start = _start_of_day(event_date)
         query = select(DonorDay.id).where(
-            DonorDay.organizer_id == organizer_id, func.date(DonorDay.event_datetime) == event_date.date()
+            DonorDay.organizer_id == organizer_id,
+            DonorDay.event_datetime >= day_start,
+            DonorDay.event_datetime < day_start + timedelta(days=1),
         )
 
         return await self.session.scalar(query)
 
-    async def get_confirmed_donations_by_organizer(self, organizer_id: int) -> list[dict[str, Any]]:
-        """Получить все подтвержденные донации организатора с данными доноров"""
-        from src.models.donor import Donor
-        from src.models.donor_day import DonorDay
-        from src.models.organizer import Organizer
-
+    async def stream_confirmed_donations_by_organizer(
+        self, organizer_id: int, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Потоково получить подтвержденные донации организатора с данными доноров пачками"""
         query = (
             select(
                 Donor.full_name.label("donor_name"),
@@ -218,25 +258,21 @@ class DonationRepository:
             .order_by(DonorDay.event_datetime.desc(), Donor.full_name)
         )
 
-        result = await self.session.execute(query)
-        donations = []
-
-        for row in result:
-            donations.append(
+        # Кэшируемый отчет, как и stream_organizer_donor_days, читается только из основной БД
+        result = await self.session.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield [
                 {
                     "donor_name": row.donor_name,
                     "donation_date": row.donation_date,
                     "organizer_name": row.organizer_name,
                 }
-            )
+                for row in partition
+            ]
 
-        return donations
-
-    async def get_participants_by_donor_day(self, donor_day_id: int) -> list[dict[str, Any]]:
-        """Получить всех участников конкретного донорского дня"""
-        from src.models.donor import Donor
-
-        query = (
+    @staticmethod
+    def _participants_query() -> Select:
+        return (
             select(
                 Donation.id.label("donation_id"),
                 Donation.is_confirmed.label("is_confirmed"),
@@ -247,35 +283,71 @@ class DonationRepository:
             )
             .select_from(Donation)
             .join(Donor, Donation.donor_id == Donor.id)
-            .where(Donation.donor_day_id == donor_day_id)
-            .order_by(Donor.full_name)
         )
 
-        result = await self.session.execute(query)
-        participants = []
+    @staticmethod
+    def _participant_row(row: Row) -> dict[str, Any]:
+        return {
+            "donation_id": row.donation_id,
+            "donor_id": row.donor_id,
+            "donor_name": row.donor_name,
+            "phone_number": row.phone_number,
+            "is_confirmed": row.is_confirmed,
+            "is_bone_marrow_donor": row.is_bone_marrow_donor,
+        }
 
-        for row in result:
-            participants.append(
-                {
-                    "donation_id": row.donation_id,
-                    "donor_id": row.donor_id,
-                    "donor_name": row.donor_name,
-                    "phone_number": row.phone_number,
-                    "is_confirmed": row.is_confirmed,
-                    "is_bone_marrow_donor": row.is_bone_marrow_donor,
-                }
-            )
+    async def get_participants_page(
+        self, donor_day_id: int, cursor: Sequence[Any] | None = None, *, backward: bool = False
+    ) -> Page:
+        """Получить страницу участников ДД по ключу (ФИО, ID донации)"""
+        page = await fetch_keyset_page(
+            self.session,
+            self._participants_query().where(Donation.donor_day_id == donor_day_id),
+            (Donor.full_name, Donation.id),
+            cursor,
+            backward=backward,
+        )
+        return page._replace(rows=[self._participant_row(row) for row in page.rows])
 
-        return participants
+    async def get_participant(self, donation_id: int) -> dict[str, Any] | None:
+        """Получить одного участника ДД по ID донации вместе с данными донора"""
+        result = await self.session.execute(self._participants_query().where(Donation.id == donation_id))
+        row = result.first()
+        return self._participant_row(row) if row else None
 
-    async def update_donation_status(self, donation_id: int, is_confirmed: bool) -> bool:
-        """Обновить статус подтверждения донации"""
-        donation = await self.session.get(Donation, donation_id)
-        if donation:
-            donation.is_confirmed = is_confirmed
-            await self.session.commit()
-            return True
-        return False
+    async def toggle_donation_status(self, donation_id: int) -> bool | None:
+        """Атомарно переключить подтверждение донации; вернуть новый статус или None, если донации нет"""
+        result = await self.session.execute(
+            update(Donation)
+            .where(Donation.id == donation_id)
+            .values(is_confirmed=~Donation.is_confirmed, updated_at=func.now())
+            .returning(Donation.is_confirmed, Donation.organizer_id)
+        )
+        row = result.first()
+        if not row:
+            return None
+        self._bump_report_version(row.organizer_id)
+        return row.is_confirmed
+
+    async def confirm_by_phone_numbers(self, donor_day_id: int, phone_numbers: Sequence[str]) -> set[str]:
+        """Подтвердить донации участников ДД с указанными номерами одним UPDATE; вернуть найденные номера"""
+        if not phone_numbers:
+            return set()
+
+        result = await self.session.execute(
+            update(Donation)
+            .where(
+                Donation.donor_day_id == donor_day_id,
+                Donation.donor_id == Donor.id,
+                Donor.phone_number == any_(bindparam("phone_numbers", list(phone_numbers), type_=ARRAY(String))),
+            )
+            .values(is_confirmed=true(), updated_at=func.now())
+            .returning(Donor.phone_number, Donation.organizer_id)
+        )
+        rows = result.all()
+        if rows:
+            self._bump_report_version(rows[0].organizer_id)
+        return {row.phone_number for row in rows}
 
     async def get_by_donor_and_donor_day(self, donor_id: int, donor_day_id: int) -> Donation | None:
         """Найти донацию по донору и донорскому дню"""
@@ -297,6 +369,6 @@ class DonationRepository:
         )
 
         self.session.add(donation)
-        await self.session.commit()
-        await self.session.refresh(donation)
+        await self.session.flush()
+        await self._registrations_changed(donation.organizer_id)
         return donation
@@ -1,33 +1,125 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import TYPE_CHECKING
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 
+from src.db.replica import ReplicaReadMixin
+from src.db.uow import run_after_commit
 from src.enums.donor_type import DonorType
 from src.models.donation import Donation
 from src.models.donor import Donor
 from src.models.donor_day import DonorDay
+from src.models.organizer import Organizer
+from src.repositories.pagination import Page, count_capped, fetch_keyset_page
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import datetime
+
+    from sqlalchemy import Row, Select
     from sqlalchemy.ext.asyncio import AsyncSession
 
+    from src.cache.donor_identity import DonorIdentityCache
+    from src.cache.report_cache import ReportCache
+    from src.db.replica import ReadReplicaRouter
+
+# Размер пачки для массовых запросов: держит число параметров запроса в пределах лимита PostgreSQL
+BULK_BATCH_SIZE = 1000
 
-class DonorRepository:
-    def __init__(self, session: AsyncSession) -> None:
+
+class DonorRepository(ReplicaReadMixin):
+    def __init__(
+        self,
+        session: AsyncSession,
+        identity_cache: DonorIdentityCache | None = None,
+        report_cache: ReportCache | None = None,
+        read_router: ReadReplicaRouter | None = None,
+    ) -> None:
         self.session = session
+        self.identity_cache = identity_cache
+        self.report_cache = report_cache
+        self.read_router = read_router
+
+    async def _invalidate_identity(self, *telegram_ids: int | None) -> None:
+        """Сбросить закэшированную личность донора сейчас и еще раз после фиксации изменений"""
+        if self.identity_cache:
+            # Повторный сброс убирает запись, которую параллельный апдейт мог закэшировать до фиксации
+            await self.identity_cache.invalidate(*telegram_ids)
+            run_after_commit(self.session, partial(self.identity_cache.invalidate, *telegram_ids))
 
     async def create(self, donor: Donor) -> Donor:
         self.session.add(donor)
-        await self.session.commit()
+        await self.session.flush()
         return donor
 
+    async def get_existing_phone_numbers(self, phone_numbers: Sequence[str]) -> set[str]:
+        """Найти, какие из номеров телефонов уже есть в базе"""
+        existing = set()
+        for start in range(0, len(phone_numbers), BULK_BATCH_SIZE):
+            result = await self.session.scalars(
+                select(Donor.phone_number).where(Donor.phone_number.in_(phone_numbers[start : start + BULK_BATCH_SIZE]))
+            )
+            existing.update(result.all())
+        return existing
+
+    async def bulk_create(self, donors: Sequence[dict[str, Any]]) -> set[str]:
+        """Вставить доноров пачками, пропуская уже существующие номера; вернуть номера добавленных"""
+        inserted = set()
+        for start in range(0, len(donors), BULK_BATCH_SIZE):
+            result = await self.session.scalars(
+                insert(Donor)
+                .values(donors[start : start + BULK_BATCH_SIZE])
+                .on_conflict_do_nothing(index_elements=[Donor.phone_number])
+                .returning(Donor.phone_number)
+            )
+            inserted.update(result.all())
+        return inserted
+
     async def get_by_phone_number(self, phone_number: str) -> Donor | None:
         query = select(Donor).where(Donor.phone_number == phone_number)
         result = await self.session.scalars(query)
         return result.first()
 
+    async def get_profile_summary(
+        self, phone_number: str
+    ) -> Row[tuple[Donor, int | None, datetime | None, str | None]] | None:
+        """Получить донора вместе с числом подтвержденных донаций, датой и центром последней одним запросом"""
+        confirmed_donations = (
+            select(
+                Donation.donor_id,
+                func.count().over(partition_by=Donation.donor_id).label("donations_count"),
+                func.row_number()
+                .over(partition_by=Donation.donor_id, order_by=DonorDay.event_datetime.desc())
+                .label("position"),
+                DonorDay.event_datetime.label("last_donation_at"),
+                Organizer.name.label("last_donation_center"),
+            )
+            .join(DonorDay, Donation.donor_day_id == DonorDay.id)
+            .join(Donor, Donation.donor_id == Donor.id)
+            .outerjoin(Organizer, Donation.organizer_id == Organizer.id)
+            .where(Donor.phone_number == phone_number, Donation.is_confirmed)
+            .subquery()
+        )
+        query = (
+            select(
+                Donor,
+                confirmed_donations.c.donations_count,
+                confirmed_donations.c.last_donation_at,
+                confirmed_donations.c.last_donation_center,
+            )
+            .outerjoin(
+                confirmed_donations,
+                and_(confirmed_donations.c.donor_id == Donor.id, confirmed_donations.c.position == 1),
+            )
+            .where(Donor.phone_number == phone_number)
+        )
+        result = await self.session.execute(query)
+        return result.first()
+
     async def get_by_id(self, donor_id: int) -> Donor | None:
         query = select(Donor).where(Donor.id == donor_id)
         result = await self.session.scalars(query)
@@ -41,20 +133,39 @@ class DonorRepository:
     async def update_telegram_id(self, donor_id: int, telegram_id: int) -> Donor | None:
         donor = await self.get_by_id(donor_id)
         if donor:
+            old_telegram_id = donor.telegram_id
             donor.telegram_id = telegram_id
-            await self.session.commit()
-            await self.session.refresh(donor)
+            await self.session.flush()
+            await self._invalidate_identity(old_telegram_id, telegram_id)
         return donor
 
     async def search_by_full_name(self, full_name: str) -> list[Donor]:
         query = select(Donor).where(Donor.full_name.ilike(f"%{full_name}%"))
-        result = await self.session.scalars(query)
+        session = await self._read_session()
+        result = await session.scalars(query)
         return list(result.all())
 
-    async def get_registered_donors_by_full_name(self, full_name: str) -> list[Donor]:
-        query = select(Donor).where(Donor.full_name.ilike(f"%{full_name}%"), Donor.telegram_id.is_not(None))
-        result = await self.session.scalars(query)
-        return list(result.all())
+    @staticmethod
+    def _registered_by_full_name_query(full_name: str) -> Select:
+        return select(Donor).where(Donor.full_name.ilike(f"%{full_name}%"), Donor.telegram_id.is_not(None))
+
+    async def get_registered_donors_page(
+        self, full_name: str, cursor: Sequence[Any] | None = None, *, backward: bool = False
+    ) -> Page:
+        """Получить страницу зарегистрированных доноров с подходящим ФИО по ключу (ФИО, ID)"""
+        page = await fetch_keyset_page(
+            await self._read_session(),
+            self._registered_by_full_name_query(full_name),
+            (Donor.full_name, Donor.id),
+            cursor,
+            backward=backward,
+        )
+        return page._replace(rows=[row[0] for row in page.rows])
+
+    async def count_registered_by_full_name(self, full_name: str) -> int:
+        return await count_capped(
+            await self._read_session(), self._registered_by_full_name_query(full_name).with_only_columns(Donor.id)
+        )
 
     async def get_registered_donor_by_phone(self, phone_number: str) -> Donor | None:
         query = select(Donor).where(Donor.phone_number == phone_number, Donor.telegram_id.is_not(None))
@@ -71,15 +182,28 @@ class DonorRepository:
         *,
         is_bone_marrow_donor: bool = False,
     ) -> Donor | None:
+        """Обновить данные донора; ValueError, если номер телефона уже занят другим донором"""
         donor = await self.get_by_id(donor_id)
         if donor:
-            donor.full_name = full_name
-            donor.phone_number = phone_number
-            donor.donor_type = donor_type
-            donor.student_group = student_group if donor_type == DonorType.STUDENT else None
-            donor.is_bone_marrow_donor = is_bone_marrow_donor
-            await self.session.commit()
-            await self.session.refresh(donor)
+            name_changed = donor.full_name != full_name
+            try:
+                # Точка сохранения: конфликт по уникальному номеру не обрывает транзакцию всего апдейта
+                async with self.session.begin_nested():
+                    donor.full_name = full_name
+                    donor.phone_number = phone_number
+                    donor.donor_type = donor_type
+                    donor.student_group = student_group if donor_type == DonorType.STUDENT else None
+                    donor.is_bone_marrow_donor = is_bone_marrow_donor
+            except IntegrityError as e:
+                msg = f"Донор с номером телефона {phone_number} уже существует"
+                raise ValueError(msg) from e
+            await self._invalidate_identity(donor.telegram_id)
+            if name_changed and self.report_cache:
+                # ФИО донора попадает в отчеты всех организаторов, у которых он сдавал кровь
+                organizer_ids = await self.session.scalars(
+                    select(Donation.organizer_id).where(Donation.donor_id == donor.id).distinct()
+                )
+                run_after_commit(self.session, partial(self.report_cache.bump, *organizer_ids))
         return donor
 
     async def check_user_exists_by_phone(self, phone_number: str) -> bool:
@@ -88,8 +212,7 @@ class DonorRepository:
         return result.first() is not None
 
     async def check_user_exists_by_full_name(self, full_name: str) -> list[Donor]:
-        query = select(Donor).where(Donor.full_name.ilike(f"%{full_name}%"), Donor.telegram_id.is_not(None))
-        result = await self.session.scalars(query)
+        result = await self.session.scalars(self._registered_by_full_name_query(full_name))
         return list(result.all())
 
     async def get_user_by_phone_not_donor(self, phone_number: str) -> Donor | None:
@@ -112,8 +235,8 @@ class DonorRepository:
             user.donor_type = donor_type
             user.student_group = student_group if donor_type == DonorType.STUDENT else None
             user.is_bone_marrow_donor = is_bone_marrow_donor
-            await self.session.commit()
-            await self.session.refresh(user)
+            await self.session.flush()
+            await self._invalidate_identity(user.telegram_id)
         return user
 
     async def create_donor_from_existing_user(
@@ -131,73 +254,17 @@ class DonorRepository:
             existing_user.donor_type = donor_type
             existing_user.student_group = student_group if donor_type == DonorType.STUDENT else None
             existing_user.is_bone_marrow_donor = is_bone_marrow_donor
-            await self.session.commit()
-            await self.session.refresh(existing_user)
+            await self.session.flush()
+            await self._invalidate_identity(existing_user.telegram_id)
             return existing_user
         return None
 
-    async def get_bone_marrow_donors(self) -> list[Donor]:
-        query = select(Donor).where(Donor.is_bone_marrow_donor)
-        result = await self.session.scalars(query)
-        return list(result.all())
-
-    async def get_donors_registered_for_upcoming_donor_day(self, organizer_id: int) -> list[Donor]:
-        """Получить доноров, зарегистрированных на ближайшую дату ДД конкретного организатора"""
-        # Используем naive datetime для сравнения с БД
-        now_naive = datetime.now()
-        query = (
-            select(Donor)
-            .join(Donation, Donor.id == Donation.donor_id)
-            .join(DonorDay, Donation.donor_day_id == DonorDay.id)
-            .where(
-                DonorDay.organizer_id == organizer_id,
-                DonorDay.event_datetime >= now_naive,
-                Donor.telegram_id.is_not(None),
-            )
-            .distinct()
-        )
-        result = await self.session.scalars(query)
-        return list(result.all())
-
-    async def get_donors_not_registered_for_upcoming_dates(self, organizer_id: int) -> list[Donor]:
-        organizer_donors_query = (
-            select(Donor.id)
-            .join(Donation, Donor.id == Donation.donor_id)
-            .join(DonorDay, Donation.donor_day_id == DonorDay.id)
-            .where(DonorDay.organizer_id == organizer_id, Donor.telegram_id.is_not(None))
-            .distinct()
-        )
-
-        # Используем naive datetime для сравнения с БД
-        now_naive = datetime.now()
-        registered_for_upcoming_query = (
-            select(Donor.id)
-            .join(Donation, Donor.id == Donation.donor_id)
-            .join(DonorDay, Donation.donor_day_id == DonorDay.id)
-            .where(DonorDay.organizer_id == organizer_id, DonorDay.event_datetime >= now_naive)
-            .distinct()
-        )
-
-        query = select(Donor).where(Donor.id.in_(organizer_donors_query), ~Donor.id.in_(registered_for_upcoming_query))
-        result = await self.session.scalars(query)
-        return list(result.all())
-
-    async def get_donors_registered_but_not_confirmed(self, organizer_id: int) -> list[Donor]:
-        query = (
-            select(Donor)
-            .join(Donation, Donor.id == Donation.donor_id)
-            .join(DonorDay, Donation.donor_day_id == DonorDay.id)
-            .where(DonorDay.organizer_id == organizer_id, not Donation.is_confirmed, Donor.telegram_id.is_not(None))
-            .distinct()
-        )
-        result = await self.session.scalars(query)
-        return list(result.all())
-
     async def update_bone_marrow_status(self, donor_id: int, is_bone_marrow_donor: bool) -> bool:
         """Обновить статус донора костного мозга"""
         donor = await self.session.get(Donor, donor_id)
         if donor:
             donor.is_bone_marrow_donor = is_bone_marrow_donor
-            await self.session.commit()
+            await self.session.flush()
+            await self._invalidate_identity(donor.telegram_id)
             return True
         return False
@@ -1,63 +1,161 @@
 from collections.abc import Sequence
 from datetime import datetime
+from functools import partial
+from typing import Any
 
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import Row, delete, func, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache.read_through import ReadThroughCache
+from src.cache.report_cache import ReportCache
+from src.cache.snapshots import DonorDaySnapshot
+from src.db.uow import WRITES_KEY, run_after_commit
+from src.models.donation import Donation
+from src.models.donor import Donor
 from src.models.donor_day import DonorDay
-from src.repositories.donation import DonationRepository
+from src.models.donor_day_stats import DonorDayStats
+from src.repositories.pagination import Page, count_capped, decode_datetime_cursor, fetch_keyset_page
+
+DONOR_DAYS_CACHE_NAMESPACE = "donor_days"
+# Предстоящие ДД кэшируются вместе с числом регистраций: список для записи строится из них без запроса к БД
+_upcoming_donor_days = TypeAdapter(list[tuple[DonorDaySnapshot, int]])
 
 
 class DonorDayRepository:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self, session: AsyncSession, cache: ReadThroughCache | None = None, report_cache: ReportCache | None = None
+    ) -> None:
         self.session = session
+        self.cache = cache
+        self.report_cache = report_cache
+
+    async def _invalidate_cache(self, organizer_id: int) -> None:
+        if self.cache:
+            # Второй сброс после фиксации убирает список, перечитанный параллельным апдейтом до нее
+            await self.cache.invalidate(DONOR_DAYS_CACHE_NAMESPACE)
+            run_after_commit(self.session, partial(self.cache.invalidate, DONOR_DAYS_CACHE_NAMESPACE))
+        if self.report_cache:
+            run_after_commit(self.session, partial(self.report_cache.bump, organizer_id))
 
     async def create(self, donor_day: DonorDay) -> DonorDay:
         self.session.add(donor_day)
-        await self.session.commit()
-        await self.session.refresh(donor_day)
+        await self.session.flush()
+        await self._invalidate_cache(donor_day.organizer_id)
         return donor_day
 
-    async def get_all_upcoming(self) -> Sequence[DonorDay]:
+    async def _load_upcoming(self) -> list[tuple[DonorDaySnapshot, int]]:
         # Используем naive datetime для сравнения с БД
         now_naive = datetime.now()
-        result = await self.session.scalars(
-            select(DonorDay).where(DonorDay.event_datetime >= now_naive).order_by(DonorDay.event_datetime.asc())
+        result = await self.session.execute(
+            select(DonorDay, func.coalesce(DonorDayStats.total_registrations, 0))
+            .outerjoin(DonorDayStats, DonorDayStats.donor_day_id == DonorDay.id)
+            .where(DonorDay.event_datetime >= now_naive)
+            .order_by(DonorDay.event_datetime.asc())
+        )
+        return [(DonorDaySnapshot.model_validate(donor_day), count) for donor_day, count in result.all()]
+
+    async def _get_upcoming_with_counts(self) -> list[tuple[DonorDaySnapshot, int]]:
+        if not self.cache:
+            return await self._load_upcoming()
+
+        donor_days = await self.cache.get_or_load(
+            DONOR_DAYS_CACHE_NAMESPACE, "upcoming_with_counts", self._load_upcoming, _upcoming_donor_days
+        )
+        # Закэшированные дни могли пройти за время жизни кэша
+        now_naive = datetime.now()
+        return [(donor_day, count) for donor_day, count in donor_days if donor_day.event_datetime >= now_naive]
+
+    async def get_all_upcoming(self) -> Sequence[DonorDaySnapshot]:
+        return [donor_day for donor_day, _ in await self._get_upcoming_with_counts()]
+
+    async def get_upcoming_available_for_donor(self, donor_id: int | None) -> list[tuple[DonorDaySnapshot, int]]:
+        """Получить предстоящие ДД, на которые донор еще не записан, вместе с количеством регистраций"""
+        upcoming = await self._get_upcoming_with_counts()
+        if donor_id is None or not upcoming:
+            return upcoming
+
+        # Из БД читаются только записи донора на предстоящие ДД (индекс donor_id, donor_day_id)
+        registered = set(
+            await self.session.scalars(
+                select(Donation.donor_day_id).where(
+                    Donation.donor_id == donor_id,
+                    Donation.donor_day_id.in_([donor_day.id for donor_day, _ in upcoming]),
+                )
+            )
         )
-        return result.all()
+        return [(donor_day, count) for donor_day, count in upcoming if donor_day.id not in registered]
 
     async def get_by_id(self, donor_day_id: int) -> DonorDay | None:
         result = await self.session.scalars(select(DonorDay).where(DonorDay.id == donor_day_id))
         return result.first()
 
-    async def get_by_organizer_id(self, organizer_id: int) -> Sequence[DonorDay]:
-        result = await self.session.scalars(
-            select(DonorDay).where(DonorDay.organizer_id == organizer_id).order_by(DonorDay.event_datetime.asc())
+    async def get_organizer_page(
+        self, organizer_id: int, cursor: Sequence[Any] | None = None, *, backward: bool = False
+    ) -> Page:
+        """Получить страницу ДД организатора по ключу (дата, ID) с помощью индекса (organizer_id, event_datetime)"""
+        page = await fetch_keyset_page(
+            self.session,
+            select(DonorDay).where(DonorDay.organizer_id == organizer_id),
+            (DonorDay.event_datetime, DonorDay.id),
+            decode_datetime_cursor(cursor),
+            backward=backward,
         )
-        return result.all()
+        return page._replace(rows=[row[0] for row in page.rows])
 
-    async def get_past_by_organizer_id(self, organizer_id: int) -> Sequence[DonorDay]:
-        """Получить прошедшие донорские дни организатора"""
+    async def count_by_organizer_id(self, organizer_id: int) -> int:
+        return await count_capped(self.session, select(DonorDay.id).where(DonorDay.organizer_id == organizer_id))
+
+    async def get_past_organizer_page(
+        self, organizer_id: int, cursor: Sequence[Any] | None = None, *, backward: bool = False
+    ) -> Page:
+        """Получить страницу прошедших ДД организатора, начиная с последних"""
         now_naive = datetime.now()
-        result = await self.session.scalars(
-            select(DonorDay)
-            .where(DonorDay.organizer_id == organizer_id, DonorDay.event_datetime < now_naive)
-            .order_by(DonorDay.event_datetime.desc())
+        page = await fetch_keyset_page(
+            self.session,
+            select(DonorDay).where(DonorDay.organizer_id == organizer_id, DonorDay.event_datetime < now_naive),
+            (DonorDay.event_datetime, DonorDay.id),
+            decode_datetime_cursor(cursor),
+            backward=backward,
+            descending=True,
         )
-        return result.all()
-
-    async def delete_donor_day(self, donor_day_id: int) -> bool:
-        result = await self.session.scalars(select(DonorDay).where(DonorDay.id == donor_day_id))
-        donor_day = result.first()
-        if donor_day:
-            donation_repository = DonationRepository(self.session)
+        return page._replace(rows=[row[0] for row in page.rows])
 
-            donations = await donation_repository.get_by_donor_day_id(donor_day_id)
-
-            for donation in donations:
-                await self.session.delete(donation)
+    async def count_past_by_organizer_id(self, organizer_id: int) -> int:
+        now_naive = datetime.now()
+        return await count_capped(
+            self.session,
+            select(DonorDay.id).where(DonorDay.organizer_id == organizer_id, DonorDay.event_datetime < now_naive),
+        )
 
-            await self.session.delete(donor_day)
-            await self.session.commit()
-            return True
-        return False
+    async def delete_donor_day(self, donor_day_id: int) -> Sequence[Row[tuple[int, datetime, int | None, str | None]]]:
+        """Удалить ДД одним DELETE ... RETURNING (донации удаляет каскад FK) и вернуть его участников с Telegram"""
+        # Строки (organizer_id, event_datetime, telegram_id, full_name); без участников — одна строка с пустыми
+        # telegram_id и full_name, пустой список — если ДД не найден
+        participants = (
+            select(Donor.telegram_id, Donor.full_name)
+            .join(Donation, Donation.donor_id == Donor.id)
+            .where(Donation.donor_day_id == donor_day_id, Donor.telegram_id.is_not(None))
+            .cte("participants")
+        )
+        # Все части запроса видят один снимок данных, поэтому участники выбираются до каскадного удаления
+        deleted_donor_day = (
+            delete(DonorDay)
+            .where(DonorDay.id == donor_day_id)
+            .returning(DonorDay.organizer_id, DonorDay.event_datetime)
+            .cte("deleted_donor_day")
+        )
+        result = await self.session.execute(
+            select(
+                deleted_donor_day.c.organizer_id,
+                deleted_donor_day.c.event_datetime,
+                participants.c.telegram_id,
+                participants.c.full_name,
+            ).outerjoin(participants, true())
+        )
+        # Снаружи запрос — SELECT, поэтому запись в нем отмечается явно, а не событиями сессии
+        self.session.info[WRITES_KEY] = True
+        rows = result.all()
+        if rows:
+            await self._invalidate_cache(rows[0].organizer_id)
+        return rows
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import ColumnElement, and_, exists, func, select
+
+from src.db.replica import ReplicaReadMixin
+from src.enums.mailing_category import MailingCategory
+from src.models.donation import Donation
+from src.models.donor import Donor
+from src.models.donor_day import DonorDay
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from sqlalchemy import Select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from src.db.replica import ReadReplicaRouter
+
+# Размер пачки получателей рассылки, выбираемой из серверного курсора за один раз
+RECIPIENTS_BATCH_SIZE = 100
+
+
+class MailingAudienceRepository(ReplicaReadMixin):
+    """Выборка получателей рассылок: каждая категория — один запрос с EXISTS/NOT EXISTS по donors"""
+
+    def __init__(self, session: AsyncSession, read_router: ReadReplicaRouter | None = None) -> None:
+        self.session = session
+        self.read_router = read_router
+
+    @staticmethod
+    def _has_donation(organizer_id: int, *criteria: ColumnElement[bool]) -> ColumnElement[bool]:
+        """Коррелированный EXISTS: у донора есть донация на ДД организатора, удовлетворяющая условиям"""
+        return exists(
+            select(Donation.id)
+            .join(DonorDay, Donation.donor_day_id == DonorDay.id)
+            .where(Donation.donor_id == Donor.id, DonorDay.organizer_id == organizer_id, *criteria)
+        )
+
+    def _audience_filter(self, category: MailingCategory, organizer_id: int) -> ColumnElement[bool] | None:
+        # Используем naive datetime для сравнения с БД
+        now_naive = datetime.now()
+
+        if category == MailingCategory.UPCOMING_REGISTERED:
+            return self._has_donation(organizer_id, DonorDay.event_datetime >= now_naive)
+        if category == MailingCategory.NOT_REGISTERED:
+            return and_(
+                self._has_donation(organizer_id),
+                ~self._has_donation(organizer_id, DonorDay.event_datetime >= now_naive),
+            )
+        if category == MailingCategory.REGISTERED_NOT_CONFIRMED:
+            return self._has_donation(organizer_id, Donation.is_confirmed.is_(False))
+        if category == MailingCategory.BONE_MARROW:
+            return Donor.is_bone_marrow_donor
+        return None
+
+    def _recipients_query(
+        self, category: MailingCategory, organizer_id: int, after_telegram_id: int | None
+    ) -> Select[tuple[int, str]] | None:
+        audience_filter = self._audience_filter(category, organizer_id)
+        if audience_filter is None:
+            return None
+
+        query = (
+            select(Donor.telegram_id, Donor.full_name)
+            .where(Donor.telegram_id.is_not(None), audience_filter)
+            .order_by(Donor.telegram_id)
+        )
+        if after_telegram_id is not None:
+            query = query.where(Donor.telegram_id > after_telegram_id)
+        return query
+
+    async def count_recipients(self, category: MailingCategory, organizer_id: int) -> int:
+        """Посчитать получателей категории одним COUNT(*) по тому же фильтру, что и выборка"""
+        audience_filter = self._audience_filter(category, organizer_id)
+        if audience_filter is None:
+            return 0
+
+        session = await self._read_session()
+        query = select(func.count()).select_from(Donor).where(Donor.telegram_id.is_not(None), audience_filter)
+        return await session.scalar(query) or 0
+
+    async def stream_recipients(
+        self,
+        category: MailingCategory,
+        organizer_id: int,
+        after_telegram_id: int | None = None,
+        batch_size: int = RECIPIENTS_BATCH_SIZE,
+    ) -> AsyncIterator[list[tuple[int, str]]]:
+        """Потоково выбрать (telegram_id, full_name) получателей категории пачками через серверный курсор"""
+        query = self._recipients_query(category, organizer_id, after_telegram_id)
+        if query is None:
+            return
+
+        session = await self._read_session()
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield [(row.telegram_id, row.full_name) for row in partition]
@@ -1,32 +1,58 @@
-from sqlalchemy import func, select
+from collections.abc import Sequence
+from functools import partial
+from typing import Any
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache.read_through import ReadThroughCache
+from src.cache.snapshots import OrganizerSnapshot
+from src.db.uow import run_after_commit
 from src.models.organizer import Organizer
+from src.repositories.pagination import PAGE_SIZE, Page, count_capped, fetch_keyset_page
+
+ORGANIZERS_CACHE_NAMESPACE = "organizers"
+_organizer_snapshots = TypeAdapter(list[OrganizerSnapshot])
 
 
 class OrganizerRepository:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, cache: ReadThroughCache | None = None) -> None:
         self.session = session
+        self.cache = cache
 
     async def create(self, organizer: Organizer) -> Organizer:
         self.session.add(organizer)
-        await self.session.commit()
+        await self.session.flush()
+        if self.cache:
+            await self.cache.invalidate(ORGANIZERS_CACHE_NAMESPACE)
+            run_after_commit(self.session, partial(self.cache.invalidate, ORGANIZERS_CACHE_NAMESPACE))
         return organizer
 
-    async def get_all(self) -> list[Organizer]:
+    async def _load_all(self) -> list[OrganizerSnapshot]:
         query = select(Organizer).order_by(Organizer.name)
         result = await self.session.scalars(query)
-        return list(result.all())
+        return [OrganizerSnapshot.model_validate(organizer) for organizer in result.all()]
 
-    async def get_paginated(self, page: int, page_size: int) -> tuple[list[Organizer], int]:
-        count_query = select(func.count(Organizer.id))
-        total_count = await self.session.scalar(count_query) or 0
-
-        query = select(Organizer).order_by(Organizer.name).offset(page * page_size).limit(page_size)
-        result = await self.session.scalars(query)
-        organizers = list(result.all())
+    async def get_all(self) -> list[OrganizerSnapshot]:
+        if not self.cache:
+            return await self._load_all()
+        return await self.cache.get_or_load(ORGANIZERS_CACHE_NAMESPACE, "all", self._load_all, _organizer_snapshots)
 
-        return organizers, total_count
+    async def get_paginated(
+        self, cursor: Sequence[Any] | None = None, *, backward: bool = False, page_size: int = PAGE_SIZE
+    ) -> tuple[Page, int]:
+        """Получить страницу организаторов по ключу (название, ID) и их число, ограниченное сверху"""
+        total_count = await count_capped(self.session, select(Organizer.id))
+        page = await fetch_keyset_page(
+            self.session,
+            select(Organizer),
+            (Organizer.name, Organizer.id),
+            cursor,
+            backward=backward,
+            page_size=page_size,
+        )
+        return page._replace(rows=[row[0] for row in page.rows]), total_count
 
     async def get_by_id(self, organizer_id: int) -> Organizer | None:
         query = select(Organizer).where(Organizer.id == organizer_id)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from sqlalchemy import func, select, tuple_
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy import ColumnElement, Select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Сколько элементов показывать на одной странице списков в диалогах
+PAGE_SIZE = 5
+# Дальше этого числа строки не считаются: для навигации достаточно знать, что их «больше N»
+COUNT_LIMIT = 1000
+
+
+class Page(NamedTuple):
+    rows: Sequence[Any]
+    has_prev: bool
+    has_next: bool
+
+
+def encode_cursor(*values: Any) -> list[Any]:
+    """Ключ строки в виде, пригодном для хранения в dialog_data"""
+    return [value.isoformat() if isinstance(value, datetime) else value for value in values]
+
+
+def decode_datetime_cursor(cursor: Sequence[Any] | None) -> tuple[datetime, int] | None:
+    """Восстановить ключ (event_datetime, id), сохраненный через encode_cursor"""
+    return (datetime.fromisoformat(cursor[0]), cursor[1]) if cursor else None
+
+
+async def fetch_keyset_page(
+    session: AsyncSession,
+    query: Select,
+    keys: Sequence[ColumnElement[Any]],
+    cursor: Sequence[Any] | None = None,
+    *,
+    backward: bool = False,
+    descending: bool = False,
+    page_size: int = PAGE_SIZE,
+) -> Page:
+    """Выбрать страницу после (или перед, если backward) ключа cursor поиском по индексу вместо OFFSET"""
+    ascending = descending == backward
+    if cursor is not None:
+        key, bound = tuple_(*keys), tuple_(*cursor)
+        query = query.where(key > bound if ascending else key < bound)
+
+    result = await session.execute(
+        query.order_by(*(column.asc() if ascending else column.desc() for column in keys)).limit(page_size + 1)
+    )
+    rows = list(result.all())
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backward:
+        rows.reverse()
+        return Page(rows, has_prev=has_more, has_next=cursor is not None)
+    return Page(rows, has_prev=cursor is not None, has_next=has_more)
+
+
+async def count_capped(session: AsyncSession, query: Select, limit: int = COUNT_LIMIT) -> int:
+    """Посчитать строки запроса, но не больше limit"""
+    return await session.scalar(select(func.count()).select_from(query.limit(limit).subquery())) or 0
@@ -1,3 +1,5 @@
 from taskiq_redis import ListQueueBroker
 
-broker = ListQueueBroker("redis://localhost:6380/0")
+from src.core.config import settings
+
+broker = ListQueueBroker(settings.redis.url.get_secret_value())
@@ -1,6 +1,9 @@
 from taskiq import TaskiqScheduler
+from taskiq.schedule_sources import LabelScheduleSource
 
+# Задачи с расписанием в метках должны быть зарегистрированы в брокере до старта планировщика
+import src.scheduling.tasks  # noqa: F401
 from src.scheduling.broker import broker
 from src.scheduling.source import redis_source
 
-scheduler = TaskiqScheduler(broker, sources=[redis_source])
+scheduler = TaskiqScheduler(broker, sources=[redis_source, LabelScheduleSource(broker)])
@@ -0,0 +1,135 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from uuid import uuid4
+
+from dishka import FromDishka
+from dishka.integrations.taskiq import inject
+
+from src.enums.mailing_category import MailingCategory
+from src.repositories.donor_day import DonorDayRepository
+from src.repositories.mailing_audience import RECIPIENTS_BATCH_SIZE, MailingAudienceRepository
+from src.scheduling.broker import broker
+from src.services.broadcast_progress_service import BroadcastProgressService, BroadcastTracker, LeaseLostError
+from src.services.broadcast_service import Recipient
+from src.services.notification_service import NotificationService
+
+SendBatch = Callable[[list[Recipient], BroadcastTracker], Awaitable[dict[str, int]]]
+IterBatches = Callable[[int | None], AsyncIterator[list[Recipient]]]
+CountRecipients = Callable[[], Awaitable[int]]
+
+
+async def run_broadcast(
+    job_id: str,
+    progress_service: BroadcastProgressService,
+    count_recipients: CountRecipients,
+    iter_batches: IterBatches,
+    send_batch: SendBatch,
+) -> dict[str, int] | None:
+    """Выполнить рассылку пачками с чекпоинтами, продолжая с места остановки прошлого воркера"""
+    if await progress_service.is_finished(job_id):
+        return None
+    owner = uuid4().hex
+    if not await progress_service.acquire_lease(job_id, owner):
+        # Рассылку уже выполняет другой воркер
+        return None
+
+    stats = {"success": 0, "failed": 0, "blocked": 0}
+    try:
+        # Аренда продлевается в фоне, в том числе во время пауз; потеря аренды останавливает рассылку
+        async with asyncio.TaskGroup() as group:
+            heartbeat = group.create_task(progress_service.keep_lease(job_id, owner))
+            await progress_service.start(job_id, await count_recipients())
+            tracker = progress_service.tracker(job_id)
+            # Пачки приходят упорядоченными по telegram_id, поэтому курсор — последний обработанный telegram_id
+            async for batch in iter_batches(await progress_service.get_cursor(job_id)):
+                for status, count in (await send_batch(batch, tracker)).items():
+                    stats[status] += count
+                await progress_service.checkpoint(job_id, batch[-1].telegram_id)
+            heartbeat.cancel()
+    except ExceptionGroup as group:
+        if group.subgroup(LeaseLostError):
+            # Рассылку подхватил другой воркер, он же ее и завершит
+            return None
+        await progress_service.finish(job_id, owner, error=True)
+        raise group.exceptions[0] from group
+
+    await progress_service.finish(job_id, owner)
+    return stats
+
+
+@broker.task
+@inject(patch_module=True)
+async def send_mailing_task(
+    job_id: str,
+    mailing_audience_repository: FromDishka[MailingAudienceRepository],
+    notification_service: FromDishka[NotificationService],
+    progress_service: FromDishka[BroadcastProgressService],
+) -> dict[str, int] | None:
+    """Фоновая рассылка сообщения выбранной категории доноров"""
+    params = await progress_service.get_params(job_id)
+
+    category = MailingCategory(params["category"])
+
+    async def count_recipients() -> int:
+        return await mailing_audience_repository.count_recipients(category, params["organizer_id"])
+
+    def iter_batches(after_telegram_id: int | None) -> AsyncIterator[list[Recipient]]:
+        return notification_service.iter_mailing_recipients(
+            category, params["organizer_id"], mailing_audience_repository, after_telegram_id
+        )
+
+    async def send_batch(batch: list[Recipient], tracker: BroadcastTracker) -> dict[str, int]:
+        return await notification_service.send_bulk_message(
+            batch, params["message_text"], params["organizer_name"], tracker
+        )
+
+    return await run_broadcast(job_id, progress_service, count_recipients, iter_batches, send_batch)
+
+
+@broker.task
+@inject(patch_module=True)
+async def send_donor_day_cancelled_task(
+    job_id: str,
+    donor_day_repository: FromDishka[DonorDayRepository],
+    notification_service: FromDishka[NotificationService],
+    progress_service: FromDishka[BroadcastProgressService],
+) -> dict[str, int] | None:
+    """Фоновая рассылка уведомлений об отмене дня донора"""
+    params = await progress_service.get_params(job_id)
+
+    if await donor_day_repository.get_by_id(params["donor_day_id"]):
+        # День донора не был удален (например, транзакция откатилась), уведомлять некого
+        await progress_service.finish(job_id, error=True)
+        return None
+
+    async def count_recipients() -> int:
+        return len(await progress_service.get_recipients(job_id))
+
+    async def iter_batches(after_telegram_id: int | None) -> AsyncIterator[list[Recipient]]:
+        recipients = sorted(Recipient(*recipient) for recipient in await progress_service.get_recipients(job_id))
+        if after_telegram_id is not None:
+            recipients = [recipient for recipient in recipients if recipient.telegram_id > after_telegram_id]
+        for start in range(0, len(recipients), RECIPIENTS_BATCH_SIZE):
+            yield recipients[start : start + RECIPIENTS_BATCH_SIZE]
+
+    async def send_batch(batch: list[Recipient], tracker: BroadcastTracker) -> dict[str, int]:
+        return await notification_service.send_donor_day_cancelled_bulk(batch, params["donor_day_date"], tracker)
+
+    return await run_broadcast(job_id, progress_service, count_recipients, iter_batches, send_batch)
+
+
+BROADCAST_TASKS = {
+    "mailing": send_mailing_task,
+    "donor_day_cancelled": send_donor_day_cancelled_task,
+}
+
+
+@broker.task(schedule=[{"cron": "* * * * *"}])
+@inject(patch_module=True)
+async def resume_stalled_broadcasts_task(progress_service: FromDishka[BroadcastProgressService]) -> int:
+    """Перезапустить рассылки, воркер которых упал, не завершив их"""
+    stalled = await progress_service.get_stalled_jobs()
+    for job_id, kind in stalled:
+        if task := BROADCAST_TASKS.get(kind):
+            await task.kiq(job_id)
+    return len(stalled)
@@ -0,0 +1,26 @@
+from aiogram import Bot
+from dishka.integrations.taskiq import setup_dishka
+from sqlalchemy.ext.asyncio import AsyncEngine
+from taskiq import TaskiqEvents, TaskiqState
+
+from src.db.replica import ReplicaEngine
+from src.di.container import container
+from src.scheduling import tasks  # noqa: F401
+from src.scheduling.broker import broker
+
+setup_dishka(container, broker)
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def on_worker_shutdown(state: TaskiqState) -> None:
+    bot: Bot = await container.get(Bot)
+    await bot.session.close()
+
+    database_engine: AsyncEngine = await container.get(AsyncEngine)
+    await database_engine.dispose()
+
+    replica_engine: ReplicaEngine | None = await container.get(ReplicaEngine | None)
+    if replica_engine:
+        await replica_engine.dispose()
+
+    await container.close()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import IO, TYPE_CHECKING, Any
+
+from src.core.validators import normalize_phone, validate_phone
+from src.services.donor_import_service import FILE_ERRORS_LIMIT, read_sheet_batches
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from src.repositories.donation import DonationRepository
+
+PHONE_SEPARATORS = re.compile(r"[\n,;]+")
+
+
+class AttendanceService:
+    """Массовая отметка явки: подтверждение донаций участников ДД по списку номеров телефонов"""
+
+    @staticmethod
+    def _new_summary() -> dict[str, Any]:
+        return {"confirmed_count": 0, "unmatched": [], "unmatched_count": 0, "invalid": [], "invalid_count": 0}
+
+    @staticmethod
+    def _add_to_summary(summary: dict[str, Any], key: str, values: list[str]) -> None:
+        summary[f"{key}_count"] += len(values)
+        summary[key].extend(values[: FILE_ERRORS_LIMIT - len(summary[key])])
+
+    async def _confirm_batch(
+        self,
+        entries: Sequence[tuple[str, str | None]],
+        donor_day_id: int,
+        donation_repository: DonationRepository,
+        summary: dict[str, Any],
+    ) -> None:
+        """Подтвердить пачку пар (подпись строки, номер телефона) и дописать итоги в сводку"""
+        phones: dict[str, str] = {}
+        invalid = []
+        for label, raw_phone in entries:
+            if not raw_phone or not validate_phone(raw_phone).is_valid:
+                invalid.append(f"{label}: некорректный номер «{raw_phone or ''}»")
+                continue
+            phones.setdefault(normalize_phone(raw_phone), label)
+
+        confirmed = await donation_repository.confirm_by_phone_numbers(donor_day_id, list(phones))
+
+        summary["confirmed_count"] += len(confirmed)
+        self._add_to_summary(summary, "invalid", invalid)
+        self._add_to_summary(
+            summary, "unmatched", [f"{label}: {phone}" for phone, label in phones.items() if phone not in confirmed]
+        )
+
+    async def confirm_from_text(
+        self, text: str, donor_day_id: int, donation_repository: DonationRepository
+    ) -> dict[str, Any]:
+        """Подтвердить донации по номерам, перечисленным через перевод строки, запятую или точку с запятой"""
+        phones = [phone.strip() for phone in PHONE_SEPARATORS.split(text) if phone.strip()]
+        summary = self._new_summary()
+        await self._confirm_batch([(phone, phone) for phone in phones], donor_day_id, donation_repository, summary)
+        return summary
+
+    async def confirm_from_file(
+        self, file: IO[bytes], filename: str, donor_day_id: int, donation_repository: DonationRepository
+    ) -> dict[str, Any]:
+        """Подтвердить донации по столбцу «Телефон» таблицы; ValueError, если такого столбца нет"""
+        batches = read_sheet_batches(file, filename, {"phone": "Телефон"})
+        summary = self._new_summary()
+        # Файл читается в отдельном потоке по пачке за раз, каждая пачка подтверждается одним UPDATE
+        while batch := await asyncio.to_thread(next, batches, None):
+            entries = [(f"Строка {row_number}", fields.get("phone")) for row_number, fields in batch]
+            await self._confirm_batch(entries, donor_day_id, donation_repository, summary)
+        return summary
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+    from src.services.broadcast_service import DeliveryStatus, Recipient
+
+# Прогресс рассылки хранится неделю, после чего ключи удаляются автоматически
+PROGRESS_TTL_SECONDS = 7 * 24 * 60 * 60
+# Воркер продлевает аренду рассылки в фоне, пока работает; истекшая аренда означает, что воркер упал
+LEASE_TTL_SECONDS = 60
+LEASE_RENEW_INTERVAL_SECONDS = LEASE_TTL_SECONDS // 3
+# Рассылки моложе этого возраста не считаются зависшими: задача может быть еще в очереди
+STALL_GRACE_SECONDS = 60
+
+ACTIVE_JOBS_KEY = "broadcast:active"
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_ERROR = "error"
+
+COUNTER_FIELDS = ("total", "success", "failed", "blocked")
+
+# Аренду продлевает и снимает только ее владелец: иначе воркер мог бы снять аренду, перехваченную другим
+RENEW_LEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_LEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class LeaseLostError(Exception):
+    """Аренда рассылки истекла или перехвачена другим воркером"""
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class BroadcastTracker:
+    """Учет доставки в рамках одной рассылки: захват получателя перед отправкой и счетчики"""
+
+    def __init__(self, progress_service: BroadcastProgressService, job_id: str) -> None:
+        self.progress_service = progress_service
+        self.job_id = job_id
+
+    async def claim(self, recipient: Recipient) -> bool:
+        """Пометить получателя как обработанного; False, если ему уже отправляли"""
+        return await self.progress_service.claim(self.job_id, recipient.telegram_id)
+
+    async def record(self, recipient: Recipient, status: DeliveryStatus) -> None:  # noqa: ARG002
+        await self.progress_service.record(self.job_id, status)
+
+
+class BroadcastProgressService:
+    """Хранение прогресса и чекпоинтов фоновых рассылок в Redis"""
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self._renew_lease = redis.register_script(RENEW_LEASE_SCRIPT)
+        self._release_lease = redis.register_script(RELEASE_LEASE_SCRIPT)
+
+    @staticmethod
+    def _key(job_id: str, suffix: str | None = None) -> str:
+        return f"broadcast:{job_id}:{suffix}" if suffix else f"broadcast:{job_id}"
+
+    async def create(
+        self, job_id: str, kind: str, recipients: list[Recipient] | None = None, **params: str | int
+    ) -> None:
+        """Зарегистрировать рассылку вместе с параметрами, нужными для ее возобновления"""
+        key = self._key(job_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                key,
+                mapping={
+                    "kind": kind,
+                    "status": STATUS_QUEUED,
+                    "created_at": int(time.time()),
+                    "params": json.dumps(params),
+                    **dict.fromkeys(COUNTER_FIELDS, 0),
+                },
+            )
+            pipe.expire(key, PROGRESS_TTL_SECONDS)
+            if recipients is not None:
+                # Снимок получателей нужен, когда их нельзя выбрать из БД повторно (например, после удаления ДД)
+                pipe.set(self._key(job_id, "recipients"), json.dumps(recipients), ex=PROGRESS_TTL_SECONDS)
+            pipe.sadd(ACTIVE_JOBS_KEY, job_id)
+            await pipe.execute()
+
+    async def get_params(self, job_id: str) -> dict[str, Any]:
+        params = await self.redis.hget(self._key(job_id), "params")
+        return json.loads(params) if params else {}
+
+    async def get_recipients(self, job_id: str) -> list[tuple[int, str]]:
+        recipients = await self.redis.get(self._key(job_id, "recipients"))
+        return [tuple(recipient) for recipient in json.loads(recipients)] if recipients else []
+
+    async def acquire_lease(self, job_id: str, owner: str) -> bool:
+        """Захватить рассылку, чтобы ее не выполняли два воркера одновременно"""
+        return bool(await self.redis.set(self._key(job_id, "lease"), owner, nx=True, ex=LEASE_TTL_SECONDS))
+
+    async def renew_lease(self, job_id: str, owner: str) -> bool:
+        """Продлить аренду, если она все еще принадлежит владельцу"""
+        return bool(await self._renew_lease(keys=[self._key(job_id, "lease")], args=[owner, LEASE_TTL_SECONDS]))
+
+    async def release_lease(self, job_id: str, owner: str) -> None:
+        await self._release_lease(keys=[self._key(job_id, "lease")], args=[owner])
+
+    async def keep_lease(self, job_id: str, owner: str) -> None:
+        """Продлевать аренду, пока идет рассылка, в том числе во время пауз из-за RetryAfter"""
+        while True:
+            await asyncio.sleep(LEASE_RENEW_INTERVAL_SECONDS)
+            if not await self.renew_lease(job_id, owner):
+                raise LeaseLostError(job_id)
+
+    async def start(self, job_id: str, total: int) -> None:
+        """Отметить начало рассылки; при возобновлении общее количество не пересчитывается"""
+        key = self._key(job_id)
+        if _decode(await self.redis.hget(key, "status") or STATUS_QUEUED) == STATUS_QUEUED:
+            await self.redis.hset(key, "total", total)
+        await self.redis.hset(key, "status", STATUS_RUNNING)
+
+    async def is_finished(self, job_id: str) -> bool:
+        status = await self.redis.hget(self._key(job_id), "status")
+        return status is None or _decode(status) in {STATUS_DONE, STATUS_ERROR}
+
+    async def claim(self, job_id: str, telegram_id: int) -> bool:
+        key = self._key(job_id, "claimed")
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.sadd(key, telegram_id)
+            pipe.expire(key, PROGRESS_TTL_SECONDS)
+            added, _ = await pipe.execute()
+        return bool(added)
+
+    async def record(self, job_id: str, status: DeliveryStatus) -> None:
+        await self.redis.hincrby(self._key(job_id), status, 1)
+
+    def tracker(self, job_id: str) -> BroadcastTracker:
+        return BroadcastTracker(self, job_id)
+
+    async def get_cursor(self, job_id: str) -> int | None:
+        cursor = await self.redis.hget(self._key(job_id), "cursor")
+        return int(cursor) if cursor is not None else None
+
+    async def checkpoint(self, job_id: str, cursor: int) -> None:
+        """Сохранить позицию обработанной пачки получателей"""
+        await self.redis.hset(self._key(job_id), "cursor", cursor)
+
+    async def finish(self, job_id: str, owner: str | None = None, *, error: bool = False) -> None:
+        """Завершить рассылку; аренда снимается, только если ее держит owner"""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._key(job_id), "status", STATUS_ERROR if error else STATUS_DONE)
+            pipe.srem(ACTIVE_JOBS_KEY, job_id)
+            pipe.delete(self._key(job_id, "recipients"))
+            await pipe.execute()
+        if owner is not None:
+            await self.release_lease(job_id, owner)
+
+    async def discard(self, job_id: str) -> None:
+        """Удалить рассылку, которая так и не была запущена"""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.srem(ACTIVE_JOBS_KEY, job_id)
+            pipe.delete(
+                self._key(job_id),
+                self._key(job_id, "recipients"),
+                self._key(job_id, "claimed"),
+                self._key(job_id, "lease"),
+            )
+            await pipe.execute()
+
+    async def get_stalled_jobs(self) -> list[tuple[str, str]]:
+        """Найти незавершенные рассылки без живого воркера: пары (job_id, kind)"""
+        stalled = []
+        now = int(time.time())
+        for raw_job_id in await self.redis.smembers(ACTIVE_JOBS_KEY):
+            job_id = _decode(raw_job_id)
+            kind, created_at = await self.redis.hmget(self._key(job_id), ["kind", "created_at"])
+            if kind is None:
+                # Данные рассылки истекли, убираем ее из активных
+                await self.redis.srem(ACTIVE_JOBS_KEY, job_id)
+                continue
+            if now - int(created_at or 0) < STALL_GRACE_SECONDS:
+                continue
+            if await self.redis.exists(self._key(job_id, "lease")):
+                continue
+            stalled.append((job_id, _decode(kind)))
+        return stalled
+
+    async def get(self, job_id: str) -> dict[str, Any] | None:
+        """Получить прогресс рассылки: отправлено, ошибки, заблокировано и осталось"""
+        raw = await self.redis.hgetall(self._key(job_id))
+        if not raw:
+            return None
+
+        data = {_decode(key): _decode(value) for key, value in raw.items()}
+        progress: dict[str, Any] = {"kind": data.get("kind", ""), "status": data.get("status", STATUS_QUEUED)}
+        for field in COUNTER_FIELDS:
+            progress[field] = int(data.get(field, 0))
+        progress["remaining"] = max(
+            0, progress["total"] - progress["success"] - progress["failed"] - progress["blocked"]
+        )
+        return progress
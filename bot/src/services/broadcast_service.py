@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable, Callable, Iterable
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, Protocol
+
+from aiogram.exceptions import TelegramAPIError, TelegramForbiddenError, TelegramRetryAfter
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+# Глобальный лимит Telegram для массовых рассылок — около 30 сообщений в секунду
+GLOBAL_RATE_LIMIT = 30.0
+# В один чат можно отправлять не чаще одного сообщения в секунду
+PER_CHAT_INTERVAL = 1.0
+MAX_CONCURRENCY = 30
+MAX_RETRIES = 3
+
+DeliveryStatus = Literal["success", "failed", "blocked"]
+
+
+class Recipient(NamedTuple):
+    telegram_id: int
+    full_name: str
+
+
+class DeliveryTracker(Protocol):
+    """Учет доставки: захват получателя перед отправкой и запись результата"""
+
+    async def claim(self, recipient: Recipient) -> bool: ...
+
+    async def record(self, recipient: Recipient, status: DeliveryStatus) -> None: ...
+
+
+class TokenBucket:
+    """Ограничитель частоты отправки по алгоритму token bucket"""
+
+    def __init__(self, rate: float = GLOBAL_RATE_LIMIT, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated_at: float | None = None
+        self._paused_until = 0.0
+        # Номер паузы: резервы токенов, сделанные до новой паузы, больше не действуют
+        self._pauses = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Дождаться свободного токена"""
+        loop = asyncio.get_running_loop()
+        while True:
+            # Под блокировкой токен только резервируется, ожидание идет без нее, чтобы не выстраивать задачи в очередь
+            async with self._lock:
+                now = loop.time()
+                pauses = self._pauses
+                self._refill(now)
+                self._tokens -= 1
+                delay = max(self._paused_until - now, 0.0) + max(-self._tokens, 0.0) / self.rate
+
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+            if self._pauses == pauses:
+                return
+
+    def pause(self, seconds: float) -> None:
+        """Приостановить выдачу токенов (например, после ответа 429 от Telegram)"""
+        now = asyncio.get_running_loop().time()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0
+        self._updated_at = self._paused_until
+        self._pauses += 1
+
+    def _refill(self, now: float) -> None:
+        if self._updated_at is None:
+            self._updated_at = now
+        # Во время паузы токены не копятся: отсчет начинается с ее окончания
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = max(now, self._updated_at)
+
+
+class ChatRateLimiter:
+    """Ограничитель частоты отправки в один и тот же чат"""
+
+    def __init__(self, interval: float = PER_CHAT_INTERVAL) -> None:
+        self.interval = interval
+        self._ready_at: dict[int, float] = {}
+
+    async def wait(self, chat_id: int) -> None:
+        loop = asyncio.get_running_loop()
+        ready_at = self._ready_at.get(chat_id, 0.0)
+        now = loop.time()
+        self._ready_at[chat_id] = max(now, ready_at) + self.interval
+        if ready_at > now:
+            await asyncio.sleep(ready_at - now)
+
+
+class BroadcastService:
+    """Конкурентная рассылка сообщений с учетом лимитов Telegram"""
+
+    def __init__(
+        self,
+        bot: Bot,
+        bucket: TokenBucket | None = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_retries: int = MAX_RETRIES,
+        per_chat_interval: float = PER_CHAT_INTERVAL,
+    ) -> None:
+        self.bot = bot
+        self.bucket = bucket or TokenBucket()
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.per_chat_interval = per_chat_interval
+
+    async def broadcast(
+        self,
+        recipients: Iterable[Recipient] | AsyncIterable[Recipient],
+        build_text: Callable[[Recipient], str],
+        tracker: DeliveryTracker | None = None,
+        **send_kwargs: Any,
+    ) -> dict[str, int]:
+        """Отправить сообщения получателям и вернуть количество успешных, неудачных и заблокированных отправок"""
+        stats = {"success": 0, "failed": 0, "blocked": 0}
+        chat_limiter = ChatRateLimiter(self.per_chat_interval)
+        queue: asyncio.Queue[Recipient | None] = asyncio.Queue(maxsize=self.max_concurrency * 2)
+
+        async def worker() -> None:
+            while (recipient := await queue.get()) is not None:
+                # Захват перед отправкой: после падения воркера получатель не получит сообщение повторно
+                if tracker and not await tracker.claim(recipient):
+                    continue
+                status = await self.deliver(recipient, build_text(recipient), chat_limiter, **send_kwargs)
+                stats[status] += 1
+                if tracker:
+                    await tracker.record(recipient, status)
+
+        async def produce() -> None:
+            if isinstance(recipients, AsyncIterable):
+                async for recipient in recipients:
+                    await queue.put(recipient)
+            else:
+                for recipient in recipients:
+                    await queue.put(recipient)
+            for _ in range(self.max_concurrency):
+                await queue.put(None)
+
+        # Если воркер упадет (например, Redis недоступен), TaskGroup отменит остальные задачи, в том числе
+        # производителя, ожидающего места в очереди, и рассылка не зависнет
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for _ in range(self.max_concurrency):
+                    task_group.create_task(worker())
+                task_group.create_task(produce())
+        except ExceptionGroup as group:
+            raise group.exceptions[0] from group
+
+        return stats
+
+    async def deliver(
+        self,
+        recipient: Recipient,
+        text: str,
+        chat_limiter: ChatRateLimiter | None = None,
+        **send_kwargs: Any,
+    ) -> DeliveryStatus:
+        """Отправить одно сообщение, повторяя попытку после TelegramRetryAfter"""
+        for _ in range(self.max_retries + 1):
+            if chat_limiter:
+                await chat_limiter.wait(recipient.telegram_id)
+            await self.bucket.acquire()
+
+            try:
+                await self.bot.send_message(chat_id=recipient.telegram_id, text=text, **send_kwargs)
+            except TelegramRetryAfter as e:
+                # Останавливаем только выдачу токенов, остальные задачи дождутся окончания паузы
+                self.bucket.pause(e.retry_after)
+            except TelegramForbiddenError:
+                return "blocked"
+            except TelegramAPIError:
+                return "failed"
+            else:
+                return "success"
+
+        return "failed"
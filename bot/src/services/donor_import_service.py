@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+from typing import IO, TYPE_CHECKING, Any, NamedTuple
+from zipfile import BadZipFile
+
+import openpyxl
+from openpyxl.utils.exceptions import InvalidFileException
+
+from src.core.validators import normalize_full_name, normalize_phone, validate_full_name, validate_phone
+from src.enums.donor_type import DonorType
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from src.models.donor_day import DonorDay
+    from src.repositories.donation import DonationRepository
+    from src.repositories.donor import DonorRepository
+
+# Сколько строк файла читается и записывается в БД за один раз
+FILE_BATCH_SIZE = 1000
+# Сколько строк ошибок и результатов показывать организатору; остальные сворачиваются в счетчик
+FILE_ERRORS_LIMIT = 30
+SUPPORTED_FILE_EXTENSIONS = (".xlsx", ".csv")
+# Ошибки разбора файла, который не является корректной таблицей .xlsx или .csv
+FILE_READ_ERRORS = (BadZipFile, InvalidFileException, UnicodeDecodeError, csv.Error)
+FILE_READ_ERROR_MESSAGE = "Не удалось прочитать файл: проверьте, что это корректный .xlsx или .csv"
+REQUIRED_COLUMNS = {"full_name": "ФИО", "phone": "Телефон", "donor_type": "Тип"}
+
+DONOR_TYPE_MAP = {"студент": DonorType.STUDENT, "сотрудник": DonorType.EMPLOYEE, "внешний": DonorType.EXTERNAL}
+
+FIELD_ALIASES = {
+    "фио": "full_name",
+    "ф.и.о.": "full_name",
+    "телефон": "phone",
+    "номер": "phone",
+    "номер телефона": "phone",
+    "тип": "donor_type",
+    "тип донора": "donor_type",
+    "группа": "student_group",
+    "студенческая группа": "student_group",
+}
+
+
+def format_truncated(lines: list[str], total: int) -> list[str]:
+    """Не больше FILE_ERRORS_LIMIT строк отчета и счетчик остальных из total, чтобы ответ уместился в сообщение"""
+    shown = lines[:FILE_ERRORS_LIMIT]
+    if total > len(shown):
+        return [*shown, f"… и еще {total - len(shown)}"]
+    return shown
+
+
+def iter_sheet_rows(file: IO[bytes], filename: str) -> Iterator[Iterable[Any]]:
+    """Построчно читать таблицу, не загружая ее в память целиком"""
+    if filename.lower().endswith(".csv"):
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        sample = text.read(4096)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        try:
+            yield from csv.reader(text, dialect)
+        finally:
+            text.detach()
+        return
+
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_sheet_batches(
+    file: IO[bytes],
+    filename: str,
+    required_columns: dict[str, str] = REQUIRED_COLUMNS,
+    batch_size: int = FILE_BATCH_SIZE,
+) -> Iterator[list[tuple[int, dict[str, str | None]]]]:
+    """Читать строки файла пачками пар (номер строки, поля по заголовку); ValueError, если нет нужных столбцов"""
+    rows = iter_sheet_rows(file, filename)
+    columns: dict[str, int] = {}
+    header_row = 0
+    for header_row, header in enumerate(rows, start=1):  # noqa: B007
+        columns = {
+            field: index
+            for index, value in enumerate(header)
+            if value is not None and (field := FIELD_ALIASES.get(str(value).strip().lower()))
+        }
+        if columns:
+            break
+
+    if missing := [name for field, name in required_columns.items() if field not in columns]:
+        msg = f"В файле нет столбцов: {', '.join(missing)}"
+        raise ValueError(msg)
+
+    batch = []
+    # Номера строк совпадают с номерами в таблице, чтобы организатор мог найти строку с ошибкой
+    for row_number, row in enumerate(rows, start=header_row + 1):
+        values = list(row)
+        if not any(value not in {None, ""} for value in values):
+            continue
+        batch.append(
+            (
+                row_number,
+                {
+                    field: str(values[index]).strip() if index < len(values) and values[index] is not None else None
+                    for field, index in columns.items()
+                },
+            )
+        )
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class DonorImportRow(NamedTuple):
+    donor_num: int
+    full_name: str
+    phone_number: str
+    donor_type: DonorType
+    student_group: str | None
+
+
+class DonorImportService:
+    """Массовое добавление доноров: сначала проверка всех записей, затем одна вставка в БД"""
+
+    @staticmethod
+    def parse_donor_block(block: str, donor_num: int) -> DonorImportRow:
+        """Разобрать блок «ключ: значение» с данными донора; ValueError с текстом ошибки, если данные неверны"""
+        parsed_data = {}
+        for line in block.split("\n"):
+            if ":" in line:
+                key, value = line.split(":", 1)
+                if field := FIELD_ALIASES.get(key.strip().lower()):
+                    parsed_data[field] = value.strip()
+
+        return DonorImportService.build_row(
+            donor_num,
+            parsed_data.get("full_name"),
+            parsed_data.get("phone"),
+            parsed_data.get("donor_type"),
+            parsed_data.get("student_group"),
+        )
+
+    @staticmethod
+    def build_row(
+        donor_num: int,
+        full_name: str | None,
+        phone: str | None,
+        donor_type_name: str | None,
+        student_group: str | None,
+    ) -> DonorImportRow:
+        """Проверить и нормализовать данные одного донора"""
+        if not full_name:
+            msg = f"Донор {donor_num}: Не указано ФИО"
+            raise ValueError(msg)
+
+        if not phone:
+            msg = f"Донор {donor_num}: Не указан номер телефона"
+            raise ValueError(msg)
+
+        if not donor_type_name:
+            msg = f"Донор {donor_num}: Не указан тип донора"
+            raise ValueError(msg)
+
+        full_name_validation = validate_full_name(full_name)
+        if not full_name_validation.is_valid:
+            msg = f"Донор {donor_num}: {full_name_validation.error_message}"
+            raise ValueError(msg)
+
+        phone_validation = validate_phone(phone)
+        if not phone_validation.is_valid:
+            msg = f"Донор {donor_num}: {phone_validation.error_message}"
+            raise ValueError(msg)
+
+        donor_type = DONOR_TYPE_MAP.get(donor_type_name.lower())
+        if not donor_type:
+            msg = f"Донор {donor_num}: Неверный тип донора. Допустимые значения: студент, сотрудник, внешний"
+            raise ValueError(msg)
+
+        if donor_type == DonorType.STUDENT and not student_group:
+            msg = f"Донор {donor_num}: Для студентов обязательно указание группы"
+            raise ValueError(msg)
+
+        return DonorImportRow(
+            donor_num=donor_num,
+            full_name=normalize_full_name(full_name),
+            phone_number=normalize_phone(phone),
+            donor_type=donor_type,
+            student_group=student_group if donor_type == DonorType.STUDENT else None,
+        )
+
+    async def import_blocks(self, donor_blocks: Sequence[str], donor_repository: DonorRepository) -> dict[str, Any]:
+        """Добавить доноров из текстовых блоков"""
+        rows = []
+        errors: dict[int, str] = {}
+        for donor_num, block in enumerate(donor_blocks, start=1):
+            try:
+                rows.append(self.parse_donor_block(block, donor_num))
+            except ValueError as e:
+                errors[donor_num] = str(e)
+
+        return await self.import_rows(rows, donor_repository, errors)
+
+    async def import_rows(
+        self,
+        rows: Sequence[DonorImportRow],
+        donor_repository: DonorRepository,
+        errors: dict[int, str] | None = None,
+        *,
+        report_existing: bool = True,
+    ) -> dict[str, Any]:
+        """Добавить проверенных доноров: одна выборка существующих телефонов и одна вставка новых"""
+        errors = dict(errors or {})
+
+        unique_rows: dict[str, DonorImportRow] = {}
+        for row in rows:
+            if row.phone_number in unique_rows:
+                errors[row.donor_num] = (
+                    f"Донор {row.donor_num}: Номер телефона {row.phone_number} "
+                    f"уже указан у донора {unique_rows[row.phone_number].donor_num}"
+                )
+            else:
+                unique_rows[row.phone_number] = row
+
+        existing_phones = await donor_repository.get_existing_phone_numbers(list(unique_rows))
+        new_rows = [row for phone, row in unique_rows.items() if phone not in existing_phones]
+        inserted_phones = await donor_repository.bulk_create(
+            [
+                {
+                    "full_name": row.full_name,
+                    "phone_number": row.phone_number,
+                    "donor_type": row.donor_type,
+                    "student_group": row.student_group,
+                }
+                for row in new_rows
+            ]
+        )
+
+        added: dict[int, str] = {}
+        for row in unique_rows.values():
+            if row.phone_number in inserted_phones:
+                added[row.donor_num] = f"Донор {row.donor_num}: {row.full_name} ({row.phone_number}) успешно добавлен"
+            elif report_existing:
+                # Номер уже был в базе или его только что добавили параллельно
+                errors[row.donor_num] = (
+                    f"Донор {row.donor_num}: Донор с номером телефона {row.phone_number} уже существует в базе данных"
+                )
+
+        return {
+            "added": [added[donor_num] for donor_num in sorted(added)],
+            "errors": [errors[donor_num] for donor_num in sorted(errors)],
+            "phone_numbers": list(unique_rows),
+        }
+
+    async def import_file(
+        self,
+        file: IO[bytes],
+        filename: str,
+        donor_repository: DonorRepository,
+        donation_repository: DonationRepository,
+        donor_day: DonorDay | None = None,
+    ) -> dict[str, Any]:
+        """Импортировать доноров из .xlsx/.csv пачками и при необходимости записать их на ДД"""
+        batches = read_sheet_batches(file, filename)
+        added_count = 0
+        registered_count = 0
+        errors: list[str] = []
+        errors_count = 0
+
+        # Файл читается в отдельном потоке по пачке за раз, чтобы не блокировать event loop
+        while batch := await asyncio.to_thread(next, batches, None):
+            rows = []
+            batch_errors: dict[int, str] = {}
+            for row_number, fields in batch:
+                try:
+                    rows.append(
+                        self.build_row(
+                            row_number,
+                            fields.get("full_name"),
+                            fields.get("phone"),
+                            fields.get("donor_type"),
+                            fields.get("student_group"),
+                        )
+                    )
+                except ValueError as e:
+                    batch_errors[row_number] = str(e)
+
+            # При записи на ДД уже существующие доноры не ошибка: они просто записываются на день
+            result = await self.import_rows(rows, donor_repository, batch_errors, report_existing=donor_day is None)
+            added_count += len(result["added"])
+            if donor_day:
+                registered_count += await donation_repository.bulk_register(
+                    donor_day.id, donor_day.organizer_id, result["phone_numbers"]
+                )
+
+            errors_count += len(result["errors"])
+            errors.extend(result["errors"][: FILE_ERRORS_LIMIT - len(errors)])
+
+        return {
+            "added_count": added_count,
+            "registered_count": registered_count,
+            "errors": errors,
+            "errors_count": errors_count,
+        }
@@ -1,12 +1,17 @@
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+
 from aiogram import Bot
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
-from src.repositories.donor import DonorRepository
+from src.enums.mailing_category import MailingCategory
+from src.repositories.mailing_audience import MailingAudienceRepository
+from src.services.broadcast_service import BroadcastService, DeliveryTracker, Recipient
 
 
 class NotificationService:
-    def __init__(self, bot: Bot) -> None:
+    def __init__(self, bot: Bot, broadcast_service: BroadcastService | None = None) -> None:
         self.bot = bot
+        self.broadcast_service = broadcast_service or BroadcastService(bot)
 
     async def send_account_change_notification(
         self, old_telegram_id: int, full_name: str, new_telegram_id: int
@@ -55,13 +60,9 @@ class NotificationService:
         await self.bot.send_message(chat_id=new_telegram_id, text=message_text, parse_mode="Markdown")
         return True
 
-    async def send_donor_day_cancelled_notification(
-        self,
-        telegram_id: int,
-        donor_name: str,
-        donor_day_date: str,
-    ) -> bool:
-        message_text = (
+    @staticmethod
+    def format_donor_day_cancelled_message(donor_name: str, donor_day_date: str) -> str:
+        return (
             f"❌ День донора отменен\n\n"
             f"Уважаемый {donor_name}!\n\n"
             f"День донора, запланированный на {donor_day_date}, был отменен организатором.\n\n"
@@ -69,58 +70,43 @@ class NotificationService:
             f"Вы можете записаться на другие дни донора в разделе '📅 Записаться на День донора'."
         )
 
-        await self.bot.send_message(chat_id=telegram_id, text=message_text, parse_mode="Markdown")
-        return True
+    @staticmethod
+    def format_bulk_message(message_text: str, organizer_name: str) -> str:
+        return f"📢 Сообщение от {organizer_name}\n\n{message_text}"
 
     async def send_donor_day_cancelled_bulk(
-        self, notifications_data: list[tuple[int, str, str, int]]
+        self,
+        recipients: list[Recipient],
+        donor_day_date: str,
+        tracker: DeliveryTracker | None = None,
     ) -> dict[str, int]:
-        success_count = 0
-        failed_count = 0
-
-        for telegram_id, donor_name, donor_day_date, _ in notifications_data:
-            success = await self.send_donor_day_cancelled_notification(telegram_id, donor_name, donor_day_date)
-            if success:
-                success_count += 1
-            else:
-                failed_count += 1
-
-        return {"success": success_count, "failed": failed_count}
-
-    async def send_bulk_message(self, donors: list, message_text: str, organizer_name: str) -> dict[str, int]:
-        """Отправить массовое сообщение списку доноров"""
-        success_count = 0
-        failed_count = 0
-
-        for donor in donors:
-            if not donor.telegram_id:
-                failed_count += 1
-                continue
-
-            formatted_message = f"📢 Сообщение от {organizer_name}\n\n{message_text}"
-            await self.bot.send_message(chat_id=donor.telegram_id, text=formatted_message, parse_mode="Markdown")
-            success_count += 1
-
-        return {"success": success_count, "failed": failed_count}
+        return await self.broadcast_service.broadcast(
+            recipients,
+            lambda recipient: self.format_donor_day_cancelled_message(recipient.full_name, donor_day_date),
+            tracker=tracker,
+            parse_mode="Markdown",
+        )
 
-    async def send_mailing_to_category(
+    async def send_bulk_message(
         self,
-        category: str,
+        recipients: Iterable[Recipient] | AsyncIterable[Recipient],
         message_text: str,
-        organizer_id: int,
         organizer_name: str,
-        donor_repository: DonorRepository,
+        tracker: DeliveryTracker | None = None,
     ) -> dict[str, int]:
-        """Отправить рассылку по выбранной категории доноров"""
-        donors = []
-
-        if category == "upcoming_registered":
-            donors = await donor_repository.get_donors_registered_for_upcoming_donor_day(organizer_id)
-        elif category == "not_registered":
-            donors = await donor_repository.get_donors_not_registered_for_upcoming_dates(organizer_id)
-        elif category == "registered_not_confirmed":
-            donors = await donor_repository.get_donors_registered_but_not_confirmed(organizer_id)
-        elif category == "bone_marrow":
-            donors = await donor_repository.get_bone_marrow_donors()
-
-        return await self.send_bulk_message(donors, message_text, organizer_name)
+        """Отправить массовое сообщение списку получателей"""
+        formatted_message = self.format_bulk_message(message_text, organizer_name)
+        return await self.broadcast_service.broadcast(
+            recipients, lambda _: formatted_message, tracker=tracker, parse_mode="Markdown"
+        )
+
+    async def iter_mailing_recipients(
+        self,
+        category: MailingCategory,
+        organizer_id: int,
+        mailing_audience_repository: MailingAudienceRepository,
+        after_telegram_id: int | None = None,
+    ) -> AsyncIterator[list[Recipient]]:
+        """Потоково получить получателей рассылки по категории пачками, упорядоченными по telegram_id"""
+        async for batch in mailing_audience_repository.stream_recipients(category, organizer_id, after_telegram_id):
+            yield [Recipient(telegram_id, full_name) for telegram_id, full_name in batch]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import IO, TYPE_CHECKING, Any
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import InputFile
+from aiogram.types.input_file import DEFAULT_CHUNK_SIZE
+
+from src.cache.report_cache import CachedReport
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Awaitable, Callable
+
+    from aiogram import Bot
+    from aiogram.types import Message
+
+    from src.cache.report_cache import ReportCache
+
+
+class ReportInputFile(InputFile):
+    """Файл отчета, отправляемый в Telegram частями прямо из файлового объекта, без копии в памяти"""
+
+    def __init__(self, file: IO[bytes], filename: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        super().__init__(filename=filename, chunk_size=chunk_size)
+        self.file = file
+
+    async def read(self, bot: Bot) -> AsyncGenerator[bytes, None]:  # noqa: ARG002
+        # При повторной отправке файл читается с начала
+        self.file.seek(0)
+        while chunk := self.file.read(self.chunk_size):
+            yield chunk
+
+
+class ReportDeliveryService:
+    """Отправка сгенерированных отчетов пользователю"""
+
+    def __init__(self, bot: Bot, report_cache: ReportCache | None = None) -> None:
+        self.bot = bot
+        self.report_cache = report_cache
+
+    async def send_report(self, chat_id: int, file_content: IO[bytes], filename: str, caption: str) -> Message:
+        """Отправить отчет документом и освободить занятый им временный файл"""
+        try:
+            return await self.bot.send_document(
+                chat_id=chat_id, document=ReportInputFile(file_content, filename), caption=caption
+            )
+        finally:
+            file_content.close()
+
+    async def send_organizer_report(
+        self,
+        chat_id: int,
+        organizer_id: int,
+        kind: str,
+        generate: Callable[[], Awaitable[dict[str, Any]]],
+        caption: Callable[[int], str],
+    ) -> dict[str, Any]:
+        """Отправить отчет организатора: по file_id, если его данные не менялись, иначе сгенерировать заново"""
+        if not self.report_cache:
+            return await self._generate_and_send(chat_id, generate, caption)
+
+        # Версия читается до генерации: изменения во время генерации попадут уже в следующую версию
+        version = await self.report_cache.get_version(organizer_id)
+        cached = await self.report_cache.get(organizer_id, kind, version)
+        if cached:
+            try:
+                await self.bot.send_document(
+                    chat_id=chat_id, document=cached.file_id, caption=caption(cached.records_count)
+                )
+            except TelegramBadRequest:
+                # file_id стал недействительным, отчет будет сгенерирован заново
+                pass
+            else:
+                return {"success": True, "records_count": cached.records_count, "filename": cached.filename}
+
+        result = await self._generate_and_send(chat_id, generate, caption)
+        if result["success"] and result.get("file_id"):
+            await self.report_cache.set(
+                organizer_id,
+                kind,
+                version,
+                CachedReport(
+                    file_id=result["file_id"], filename=result["filename"], records_count=result["records_count"]
+                ),
+            )
+        return result
+
+    async def _generate_and_send(
+        self, chat_id: int, generate: Callable[[], Awaitable[dict[str, Any]]], caption: Callable[[int], str]
+    ) -> dict[str, Any]:
+        result = await generate()
+        if not result["success"]:
+            return result
+
+        message = await self.send_report(
+            chat_id, result["file_content"], result["filename"], caption(result["records_count"])
+        )
+        return {
+            "success": True,
+            "records_count": result["records_count"],
+            "filename": result["filename"],
+            "file_id": message.document.file_id if message.document else None,
+        }
@@ -0,0 +1,22 @@
+import os
+
+# Модули бота читают настройки при импорте. Тесты не подключаются по этим адресам,
+# поэтому без .env и переменных окружения подставляются заглушки
+TEST_SETTINGS = {
+    "POSTGRES__USER": "donorbot",
+    "POSTGRES__PASSWORD": "donorbot",
+    "POSTGRES__HOST": "localhost",
+    "POSTGRES__PORT": "5432",
+    "POSTGRES__DB": "donorbot",
+    "REDIS__HOST": "localhost",
+    "REDIS__PORT": "6379",
+    "REDIS__DB": "0",
+    "TELEGRAM_BOT__TOKEN": "123456:test",
+    "MODE": "test",
+}
+for name, value in TEST_SETTINGS.items():
+    os.environ.setdefault(name, value)
+
+# Тесты в tests/postgres идут на настоящей БД: задайте TEST_POSTGRES_URL (postgresql+asyncpg://...)
+if not os.environ.get("TEST_POSTGRES_URL"):
+    collect_ignore = ["postgres"]
@@ -0,0 +1,34 @@
+import os
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from alembic.config import Config
+from sqlalchemy import NullPool
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from alembic import command
+
+BOT_DIR = Path(__file__).parents[2]
+
+
+@pytest.fixture(scope="session")
+def postgres_url() -> str:
+    """Адрес тестовой БД со схемой, примененной миграциями"""
+    url = os.environ["TEST_POSTGRES_URL"]
+    config = Config(BOT_DIR / "alembic.ini")
+    config.set_main_option("script_location", str(BOT_DIR / "alembic"))
+    config.attributes["url"] = url
+    command.upgrade(config, "head")
+    return url
+
+
+@pytest.fixture
+async def session(postgres_url: str) -> AsyncIterator[AsyncSession]:
+    """Сессия внутри транзакции, которая откатывается после теста"""
+    engine = create_async_engine(postgres_url, poolclass=NullPool)
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        yield AsyncSession(bind=connection)
+        await transaction.rollback()
+    await engine.dispose()
@@ -0,0 +1,29 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import Executable, event, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState
+
+
+async def explain(session: AsyncSession, query: Executable) -> str:
+    """План запроса с запрещенным последовательным сканированием: индекс выбирается, если он применим"""
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    compiled = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    return "\n".join(await session.scalars(text(f"EXPLAIN {compiled}")))
+
+
+@contextmanager
+def captured_statements(session: AsyncSession) -> Iterator[list[Executable]]:
+    """Собрать запросы, которые репозиторий выполняет через сессию, чтобы проверить их планы"""
+    statements: list[Executable] = []
+
+    def capture(orm_execute_state: ORMExecuteState) -> None:
+        statements.append(orm_execute_state.statement)
+
+    event.listen(session.sync_session, "do_orm_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(session.sync_session, "do_orm_execute", capture)
@@ -0,0 +1,147 @@
+import re
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.donor_day import DonorDay
+from src.models.organizer import Organizer
+from src.repositories.donation import DonationRepository
+from tests.postgres.plans import captured_statements, explain
+
+# Дни донора вплотную к границам суток 10 и 11 марта
+EVENT_DATETIMES = [
+    datetime(2025, 3, 9, 23, 59, 59, 999999),
+    datetime(2025, 3, 10),
+    datetime(2025, 3, 10, 12),
+    datetime(2025, 3, 10, 23, 59, 59, 999999),
+    datetime(2025, 3, 11),
+    datetime(2025, 3, 11, 23, 59, 59, 999999),
+    datetime(2025, 3, 12),
+]
+
+RANGES = [
+    (date(2025, 3, 10), date(2025, 3, 10)),
+    (date(2025, 3, 10), date(2025, 3, 11)),
+    (datetime(2025, 3, 10, 15), datetime(2025, 3, 11, 1)),
+    # Дата берется из локального времени аргумента, даже если в UTC это уже другие сутки
+    (datetime(2025, 3, 10, 20, tzinfo=timezone(timedelta(hours=-10))), date(2025, 3, 10)),
+    (datetime(2025, 3, 11, 1, tzinfo=timezone(timedelta(hours=14))), date(2025, 3, 11)),
+]
+
+# Часовой пояс сессии не должен влиять на выборку: event_datetime хранится без часового пояса
+TIME_ZONES = ["UTC", "Pacific/Kiritimati", "Pacific/Pago_Pago"]
+
+# Обе границы суток должны попасть в условие поиска по индексу, а не в фильтр поверх него
+DAY_RANGE_INDEX_COND = re.compile(
+    r"Index Cond: .*\(organizer_id = \d+\)"
+    r" AND \(event_datetime >= '2025-03-10 00:00:00'::timestamp without time zone\)"
+    r" AND \(event_datetime < '(?P<end>[\d-]+) 00:00:00'::timestamp without time zone\)"
+)
+
+
+def _assert_day_range_index_scan(plan: str, end: str) -> None:
+    assert "ix_donor_days_organizer_id_event_datetime" in plan
+    match = DAY_RANGE_INDEX_COND.search(plan)
+    assert match, plan
+    assert match["end"] == end
+
+
+@pytest.fixture
+async def organizer_id(session: AsyncSession) -> int:
+    organizer_id = await session.scalar(insert(Organizer).values(name="Центр крови").returning(Organizer.id))
+    await session.execute(
+        insert(DonorDay),
+        [{"organizer_id": organizer_id, "event_datetime": event_datetime} for event_datetime in EVENT_DATETIMES],
+    )
+    return organizer_id
+
+
+def _as_date(value: date | datetime) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+async def _ids_by_calendar_date(
+    session: AsyncSession, organizer_id: int, start_date: date | datetime, end_date: date | datetime
+) -> list[int]:
+    """Прежний фильтр по func.date(event_datetime), с которым сравнивается полуоткрытый диапазон"""
+    result = await session.scalars(
+        select(DonorDay.id)
+        .where(
+            DonorDay.organizer_id == organizer_id,
+            func.date(DonorDay.event_datetime) >= _as_date(start_date),
+            func.date(DonorDay.event_datetime) <= _as_date(end_date),
+        )
+        .order_by(DonorDay.event_datetime)
+    )
+    return list(result.all())
+
+
+@pytest.mark.parametrize("time_zone", TIME_ZONES)
+@pytest.mark.parametrize(("start_date", "end_date"), RANGES)
+async def test_statistics_range_matches_calendar_dates(
+    session: AsyncSession,
+    organizer_id: int,
+    time_zone: str,
+    start_date: date | datetime,
+    end_date: date | datetime,
+) -> None:
+    await session.execute(text(f"SET LOCAL TIME ZONE '{time_zone}'"))
+    repository = DonationRepository(session)
+
+    statistics = await repository.get_organizer_statistics_by_date_range(organizer_id, start_date, end_date)
+
+    assert statistics
+    assert [row["donor_day_id"] for row in statistics] == await _ids_by_calendar_date(
+        session, organizer_id, start_date, end_date
+    )
+    assert all(_as_date(start_date) <= row["event_date"].date() <= _as_date(end_date) for row in statistics)
+
+
+@pytest.mark.parametrize("time_zone", TIME_ZONES)
+@pytest.mark.parametrize(
+    "event_datetime",
+    [
+        datetime(2025, 3, 10),
+        datetime(2025, 3, 10, 23, 59, 59, 999999),
+        datetime(2025, 3, 10, 20, tzinfo=timezone(timedelta(hours=-10))),
+    ],
+)
+async def test_find_donor_day_by_date_at_day_boundaries(
+    session: AsyncSession, time_zone: str, event_datetime: datetime
+) -> None:
+    await session.execute(text(f"SET LOCAL TIME ZONE '{time_zone}'"))
+    organizer_id = await session.scalar(insert(Organizer).values(name="Центр крови").returning(Organizer.id))
+    # Соседние сутки заняты днями донора, которые не должны попасть в выборку
+    donor_day_ids = await session.scalars(
+        insert(DonorDay)
+        .values(
+            [
+                {"organizer_id": organizer_id, "event_datetime": datetime(2025, 3, 9, 23, 59, 59, 999999)},
+                {"organizer_id": organizer_id, "event_datetime": datetime(2025, 3, 10, 23, 59, 59, 999999)},
+                {"organizer_id": organizer_id, "event_datetime": datetime(2025, 3, 11)},
+            ]
+        )
+        .returning(DonorDay.id)
+    )
+    _, expected_id, _ = donor_day_ids.all()
+    repository = DonationRepository(session)
+
+    assert await repository.find_donor_day_by_date_and_organizer(event_datetime, organizer_id) == expected_id
+
+
+async def test_statistics_range_uses_index_range_scan(session: AsyncSession, organizer_id: int) -> None:
+    with captured_statements(session) as statements:
+        await DonationRepository(session).get_organizer_statistics_by_date_range(
+            organizer_id, date(2025, 3, 10), date(2025, 3, 11)
+        )
+
+    _assert_day_range_index_scan(await explain(session, statements[0]), "2025-03-12")
+
+
+async def test_find_donor_day_by_date_uses_index_range_scan(session: AsyncSession, organizer_id: int) -> None:
+    with captured_statements(session) as statements:
+        await DonationRepository(session).find_donor_day_by_date_and_organizer(datetime(2025, 3, 10, 15), organizer_id)
+
+    _assert_day_range_index_scan(await explain(session, statements[0]), "2025-03-11")
@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.enums.donor_type import DonorType
+from src.models.donation import Donation
+from src.models.donor import Donor
+from src.models.donor_day import DonorDay
+from src.models.organizer import Organizer
+from src.repositories.donation import DonationRepository
+from src.repositories.donor import DonorRepository
+from tests.postgres.plans import captured_statements, explain
+
+DONORS_COUNT = 2000
+DONOR_DAYS_COUNT = 50
+
+
+@pytest.fixture
+async def donors(session: AsyncSession) -> list[int]:
+    # Каждый четвертый донор не привязан к Telegram: частичный индекс по telegram_id их не содержит
+    donor_ids = await session.scalars(
+        insert(Donor)
+        .values(
+            [
+                {
+                    "full_name": f"Иванов Иван {number}" if number % 100 == 0 else f"Петров Петр {number}",
+                    "phone_number": f"+7900{number:07d}",
+                    "donor_type": DonorType.STUDENT,
+                    "telegram_id": None if number % 4 == 0 else 100_000 + number,
+                }
+                for number in range(DONORS_COUNT)
+            ]
+        )
+        .returning(Donor.id)
+    )
+    await session.execute(text("ANALYZE donors"))
+    return list(donor_ids.all())
+
+
+@pytest.fixture
+async def organizer_id(session: AsyncSession) -> int:
+    return await session.scalar(insert(Organizer).values(name="Центр крови").returning(Organizer.id))
+
+
+@pytest.fixture
+async def donor_days(session: AsyncSession, organizer_id: int) -> list[int]:
+    # Половина дней донора уже прошла
+    now = datetime.now()
+    donor_day_ids = await session.scalars(
+        insert(DonorDay)
+        .values(
+            [
+                {"organizer_id": organizer_id, "event_datetime": now + timedelta(days=number - DONOR_DAYS_COUNT // 2)}
+                for number in range(DONOR_DAYS_COUNT)
+            ]
+        )
+        .returning(DonorDay.id)
+    )
+    await session.execute(text("ANALYZE donor_days"))
+    return list(donor_day_ids.all())
+
+
+@pytest.fixture
+async def donations(session: AsyncSession, organizer_id: int, donors: list[int], donor_days: list[int]) -> None:
+    # Каждый донор записан на три дня донора
+    await session.execute(
+        insert(Donation),
+        [
+            {
+                "donor_id": donor_id,
+                "organizer_id": organizer_id,
+                "donor_day_id": donor_days[(number + shift) % len(donor_days)],
+            }
+            for number, donor_id in enumerate(donors)
+            for shift in range(3)
+        ],
+    )
+    await session.execute(text("ANALYZE donations"))
+
+
+@pytest.mark.usefixtures("donors")
+async def test_lookup_by_telegram_id_uses_partial_index(session: AsyncSession) -> None:
+    plan = await explain(session, select(Donor).where(Donor.telegram_id == 100_001))
+
+    assert "ix_donors_telegram_id" in plan
+
+
+@pytest.mark.usefixtures("donors")
+async def test_search_by_full_name_substring_uses_trigram_index(session: AsyncSession) -> None:
+    query = select(Donor).where(Donor.full_name.ilike("%ванов%"), Donor.telegram_id.is_not(None))
+
+    plan = await explain(session, query)
+
+    assert "ix_donors_full_name_trgm" in plan
+
+
+@pytest.mark.usefixtures("donors")
+async def test_lookup_by_phone_number_uses_index(session: AsyncSession) -> None:
+    with captured_statements(session) as statements:
+        await DonorRepository(session).get_by_phone_number("+79000000001")
+
+    plan = await explain(session, statements[0])
+
+    assert "ix_donors_phone_number" in plan
+
+
+@pytest.mark.usefixtures("donations")
+async def test_donor_registration_lookup_uses_composite_index(
+    session: AsyncSession, donors: list[int], donor_days: list[int]
+) -> None:
+    with captured_statements(session) as statements:
+        await DonationRepository(session).get_donor_registration(donors[0], donor_days[0])
+
+    plan = await explain(session, statements[0])
+
+    assert "ix_donations_donor_id_donor_day_id" in plan
+
+
+@pytest.mark.usefixtures("donations")
+async def test_donor_day_participants_use_donor_day_index(session: AsyncSession, donor_days: list[int]) -> None:
+    with captured_statements(session) as statements:
+        await DonationRepository(session).get_participants_page(donor_days[0])
+
+    plan = await explain(session, statements[0])
+
+    assert "ix_donations_donor_day_id" in plan
+
+
+@pytest.mark.usefixtures("donor_days")
+async def test_organizer_upcoming_donor_days_use_composite_index(session: AsyncSession, organizer_id: int) -> None:
+    query = (
+        select(DonorDay)
+        .where(DonorDay.organizer_id == organizer_id, DonorDay.event_datetime >= datetime.now())
+        .order_by(DonorDay.event_datetime)
+    )
+
+    plan = await explain(session, query)
+
+    assert "ix_donor_days_organizer_id_event_datetime" in plan
@@ -0,0 +1,51 @@
+import asyncio
+import os
+from collections.abc import AsyncIterator
+
+import pytest
+from sqlalchemy import bindparam, make_url, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from src.core.config import PostgresConfig
+from src.di.providers.database import _create_engine
+
+# Адрес PgBouncer в режиме transaction: docker compose -f docker-compose.dev.yml --profile pgbouncer up
+PGBOUNCER_URL = os.environ.get("TEST_PGBOUNCER_URL")
+
+requires_pgbouncer = pytest.mark.skipif(not PGBOUNCER_URL, reason="TEST_PGBOUNCER_URL не задан")
+
+
+def _pooler_config(url: str, **kwargs: object) -> PostgresConfig:
+    parsed = make_url(url)
+    return PostgresConfig(
+        user=parsed.username,
+        password=parsed.password,
+        host=parsed.host,
+        port=parsed.port,
+        db=parsed.database,
+        external_pooler=True,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+async def pooler_engine() -> AsyncIterator[AsyncEngine]:
+    postgres = _pooler_config(PGBOUNCER_URL, statement_timeout=0)
+    engine = _create_engine(postgres, postgres.url.get_secret_value(), "primary")
+    yield engine
+    await engine.dispose()
+
+
+@requires_pgbouncer
+async def test_prepared_statements_work_through_transaction_pooling(pooler_engine: AsyncEngine) -> None:
+    sessionmaker = async_sessionmaker(pooler_engine)
+
+    async def run(number: int) -> None:
+        # Клиентов больше, чем серверных соединений пулера: выражения разных клиентов попадают в одно соединение
+        async with sessionmaker() as session, session.begin():
+            for _ in range(5):
+                assert await session.scalar(select(bindparam("number", number) + 1)) == number + 1
+                count = await session.scalar(text("SELECT count(*) FROM generate_series(1, :limit)"), {"limit": number})
+                assert count == number
+
+    await asyncio.gather(*(run(number) for number in range(100)))
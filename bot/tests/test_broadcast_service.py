@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
+from aiogram.methods import SendMessage
+
+from src.services.broadcast_service import BroadcastService, Recipient, TokenBucket
+
+RECIPIENTS = [Recipient(telegram_id, f"Донор {telegram_id}") for telegram_id in range(1, 7)]
+
+
+class FakeBot:
+    """Бот, отвечающий на send_message заданными ошибками по chat_id"""
+
+    def __init__(self, errors: dict[int, list[Exception]] | None = None) -> None:
+        self.errors = errors or {}
+        self.sent: list[int] = []
+        self.calls: list[int] = []
+
+    async def send_message(self, chat_id: int, text: str, **kwargs: object) -> None:
+        self.calls.append(chat_id)
+        if self.errors.get(chat_id):
+            raise self.errors[chat_id].pop(0)
+        self.sent.append(chat_id)
+
+
+def _method(chat_id: int) -> SendMessage:
+    return SendMessage(chat_id=chat_id, text="test")
+
+
+def _service(bot: FakeBot, **kwargs: object) -> BroadcastService:
+    return BroadcastService(bot, TokenBucket(rate=1000), per_chat_interval=0, **kwargs)
+
+
+async def test_retry_after_pauses_sending_and_retries() -> None:
+    bot = FakeBot({1: [TelegramRetryAfter(_method(1), "Too Many Requests", retry_after=1)]})
+    service = _service(bot, max_concurrency=2)
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    stats = await service.broadcast(RECIPIENTS, lambda recipient: "text")
+
+    assert stats == {"success": len(RECIPIENTS), "failed": 0, "blocked": 0}
+    assert sorted(bot.sent) == [recipient.telegram_id for recipient in RECIPIENTS]
+    assert bot.calls.count(1) == 2
+    assert loop.time() - started >= 1
+
+
+async def test_retry_after_gives_up_after_max_retries() -> None:
+    bot = FakeBot({1: [TelegramRetryAfter(_method(1), "Too Many Requests", retry_after=0) for _ in range(5)]})
+    service = _service(bot, max_concurrency=1, max_retries=2)
+
+    stats = await service.broadcast(RECIPIENTS[:1], lambda recipient: "text")
+
+    assert stats == {"success": 0, "failed": 1, "blocked": 0}
+    assert bot.calls == [1, 1, 1]
+
+
+async def test_blocked_and_failed_are_counted_separately() -> None:
+    bot = FakeBot(
+        {
+            2: [TelegramForbiddenError(_method(2), "Forbidden: bot was blocked by the user")],
+            3: [TelegramForbiddenError(_method(3), "Forbidden: user is deactivated")],
+            4: [TelegramBadRequest(_method(4), "Bad Request: chat not found")],
+        }
+    )
+    service = _service(bot)
+
+    stats = await service.broadcast(RECIPIENTS, lambda recipient: "text")
+
+    assert stats == {"success": 3, "failed": 1, "blocked": 2}
+    assert sorted(bot.sent) == [1, 5, 6]
+
+
+async def test_tracker_records_statuses_and_skips_claimed() -> None:
+    class Tracker:
+        def __init__(self) -> None:
+            self.recorded: dict[int, str] = {}
+
+        async def claim(self, recipient: Recipient) -> bool:
+            return recipient.telegram_id != 1
+
+        async def record(self, recipient: Recipient, status: str) -> None:
+            self.recorded[recipient.telegram_id] = status
+
+    bot = FakeBot({2: [TelegramForbiddenError(_method(2), "Forbidden: bot was blocked by the user")]})
+    tracker = Tracker()
+
+    stats = await _service(bot).broadcast(RECIPIENTS, lambda recipient: "text", tracker)
+
+    assert stats == {"success": 4, "failed": 0, "blocked": 1}
+    assert 1 not in bot.calls
+    assert tracker.recorded[2] == "blocked"
+    assert len(tracker.recorded) == len(RECIPIENTS) - 1
+
+
+async def test_worker_failure_stops_broadcast_instead_of_hanging() -> None:
+    class FailingTracker:
+        async def claim(self, recipient: Recipient) -> bool:
+            msg = "Redis недоступен"
+            raise ConnectionError(msg)
+
+        async def record(self, recipient: Recipient, status: str) -> None:
+            pass
+
+    recipients = [Recipient(telegram_id, "Донор") for telegram_id in range(100)]
+    service = _service(FakeBot(), max_concurrency=2)
+
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(service.broadcast(recipients, lambda recipient: "text", FailingTracker()), timeout=5)
+
+
+async def test_token_bucket_waiters_sleep_concurrently() -> None:
+    bucket = TokenBucket(rate=100, capacity=1)
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    await asyncio.gather(*(bucket.acquire() for _ in range(11)))
+
+    # 10 токенов сверх емкости при 100 токенах в секунду выдаются примерно за 0,1 с
+    assert 0.08 <= loop.time() - started < 0.5
+
+
+async def test_token_bucket_pause_delays_pending_waiters() -> None:
+    bucket = TokenBucket(rate=1000, capacity=1)
+    loop = asyncio.get_running_loop()
+    await bucket.acquire()
+
+    started = loop.time()
+    waiter = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0)
+    bucket.pause(0.2)
+    await waiter
+
+    assert loop.time() - started >= 0.2
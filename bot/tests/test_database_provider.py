@@ -0,0 +1,36 @@
+import logging
+
+import pytest
+
+from src.core.config import PostgresConfig
+from src.di.providers.database import _create_engine
+
+
+def _pooler_config(statement_timeout: int) -> PostgresConfig:
+    return PostgresConfig(
+        user="user",
+        password="password",  # noqa: S106
+        host="pgbouncer",
+        port=5432,
+        db="db",
+        external_pooler=True,
+        statement_timeout=statement_timeout,
+    )
+
+
+def test_statement_timeout_with_external_pooler_logs_warning(caplog: pytest.LogCaptureFixture) -> None:
+    postgres = _pooler_config(statement_timeout=30000)
+
+    with caplog.at_level(logging.WARNING, logger="src.di.providers.database"):
+        _create_engine(postgres, postgres.url.get_secret_value(), "primary")
+
+    assert "statement_timeout=30000" in caplog.text
+
+
+def test_external_pooler_without_statement_timeout_does_not_warn(caplog: pytest.LogCaptureFixture) -> None:
+    postgres = _pooler_config(statement_timeout=0)
+
+    with caplog.at_level(logging.WARNING, logger="src.di.providers.database"):
+        _create_engine(postgres, postgres.url.get_secret_value(), "primary")
+
+    assert not caplog.text
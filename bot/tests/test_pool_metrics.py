@@ -0,0 +1,57 @@
+import sqlite3
+from collections.abc import Iterator
+
+import pytest
+
+from src.core.metrics import Metric, db_pool_checkout_seconds, db_pool_connections_in_use, db_pool_overflow
+from src.db.pool import InstrumentedAsyncPool, instrument_pool
+
+POOL_NAME = "test_pool_metrics"
+
+
+def _sample(metric: Metric, name: str | None = None) -> float | None:
+    """Значение метрики с меткой тестового пула"""
+    for sample_name, labels, value in metric.samples():
+        if sample_name == (name or metric.name) and ("pool", POOL_NAME) in labels and len(labels) == 1:
+            return value
+    return None
+
+
+@pytest.fixture
+def pool() -> Iterator[InstrumentedAsyncPool]:
+    # Пока есть свободное место, пул выдает соединения без ожидания и работает без движка и цикла событий
+    pool = InstrumentedAsyncPool(
+        lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=1, logging_name=POOL_NAME
+    )
+    instrument_pool(pool, POOL_NAME)
+    yield pool
+    pool.dispose()
+
+
+def test_checkout_and_checkin_publish_usage_and_overflow(pool: InstrumentedAsyncPool) -> None:
+    first = pool.connect()
+    assert _sample(db_pool_connections_in_use) == 1
+    assert _sample(db_pool_overflow) == 0
+
+    second = pool.connect()
+    assert _sample(db_pool_connections_in_use) == 2
+    assert _sample(db_pool_overflow) == 1
+
+    # Первое вернувшееся соединение остается в пуле и по-прежнему открыто сверх pool_size
+    first.close()
+    assert _sample(db_pool_connections_in_use) == 1
+    assert _sample(db_pool_overflow) == 1
+
+    # Второе пулу уже некуда положить, и оно закрывается
+    second.close()
+    assert _sample(db_pool_connections_in_use) == 0
+    assert _sample(db_pool_overflow) == 0
+
+
+def test_checkout_observes_wait_time(pool: InstrumentedAsyncPool) -> None:
+    count_before = _sample(db_pool_checkout_seconds, f"{db_pool_checkout_seconds.name}_count") or 0
+
+    pool.connect().close()
+
+    assert _sample(db_pool_checkout_seconds, f"{db_pool_checkout_seconds.name}_count") == count_before + 1
+    assert _sample(db_pool_checkout_seconds, f"{db_pool_checkout_seconds.name}_sum") >= 0